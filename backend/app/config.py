@@ -12,3 +12,109 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
 
+# Gemini call pool: max concurrent in-flight calls and per-call deadline (seconds)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "30"))
+
+# Generated-argument cache: on-disk store (empty to keep in memory only), TTL and size bound
+DEBATE_CACHE_PATH = os.getenv("DEBATE_CACHE_PATH", "data/debate_cache.json")
+DEBATE_CACHE_TTL_SECONDS = float(os.getenv("DEBATE_CACHE_TTL_SECONDS", "86400"))
+DEBATE_CACHE_MAX_ENTRIES = int(os.getenv("DEBATE_CACHE_MAX_ENTRIES", "1000"))
+# Writes within this many seconds are batched into one rewrite of the cache file
+DEBATE_CACHE_SAVE_DELAY_SECONDS = float(os.getenv("DEBATE_CACHE_SAVE_DELAY_SECONDS", "2"))
+
+# Background debate generation: worker count and max queued jobs
+DEBATE_GENERATION_WORKERS = int(os.getenv("DEBATE_GENERATION_WORKERS", "4"))
+DEBATE_GENERATION_QUEUE_SIZE = int(os.getenv("DEBATE_GENERATION_QUEUE_SIZE", "100"))
+
+# Stream Gemini output to debate rooms; optionally forward raw partial text as well
+GEMINI_STREAMING = os.getenv("GEMINI_STREAMING", "true").lower() == "true"
+GEMINI_STREAM_PARTIAL_TEXT = os.getenv("GEMINI_STREAM_PARTIAL_TEXT", "false").lower() == "true"
+
+# Update an existing summary from the delta when at most this many arguments are new
+SUMMARY_MAX_DELTA_ARGUMENTS = int(os.getenv("SUMMARY_MAX_DELTA_ARGUMENTS", "20"))
+
+# Map-reduce summarization: token budget per chunk and parallel chunk summaries per request
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "6000"))
+SUMMARY_MAP_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4"))
+
+# Storage engine ("memory", "mongo" or "sqlite") and MongoDB connection pool settings
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "memory").lower()
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000"))
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "10000"))
+
+# SQLite database file shared by all workers when STORAGE_BACKEND=sqlite
+SQLITE_PATH = os.getenv("SQLITE_PATH", "data/ai_debate.db")
+
+# Durable log + snapshots for the in-memory store (empty directory disables persistence)
+STORAGE_JOURNAL_DIR = os.getenv("STORAGE_JOURNAL_DIR", "")
+STORAGE_JOURNAL_FSYNC = os.getenv("STORAGE_JOURNAL_FSYNC", "interval").lower()  # always | interval | never
+STORAGE_JOURNAL_FLUSH_MS = int(os.getenv("STORAGE_JOURNAL_FLUSH_MS", "50"))
+STORAGE_JOURNAL_SNAPSHOT_EVERY = int(os.getenv("STORAGE_JOURNAL_SNAPSHOT_EVERY", "100000"))
+
+# Tiered debate storage for the in-memory store: debates beyond the memory budget
+# are moved to this directory and loaded on demand (empty directory keeps all in memory)
+DEBATE_TIER_DIR = os.getenv("DEBATE_TIER_DIR", "")
+DEBATE_TIER_MEMORY_MB = int(os.getenv("DEBATE_TIER_MEMORY_MB", "256"))
+
+# WebSocket fan-out: frames queued per client, send deadline, and what to do when
+# a client's queue is full ("disconnect" or "drop_oldest")
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+WS_SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "10"))
+WS_SLOW_CLIENT_POLICY = os.getenv("WS_SLOW_CLIENT_POLICY", "disconnect").lower()
+
+# Versioned room events: events kept per debate for replay on reconnect, and
+# how many debates keep a log (least recently active evicted first)
+DEBATE_EVENT_HISTORY = int(os.getenv("DEBATE_EVENT_HISTORY", "128"))
+DEBATE_EVENT_MAX_DEBATES = int(os.getenv("DEBATE_EVENT_MAX_DEBATES", "10000"))
+
+# Coalesce room updates into one frame per tick (0 disables) for rooms with at
+# least this many viewers, and cap the bytes per second a batching room sends each viewer (0 = no cap)
+WS_BATCH_TICK_MS = int(os.getenv("WS_BATCH_TICK_MS", "0"))
+WS_BATCH_MIN_CONNECTIONS = int(os.getenv("WS_BATCH_MIN_CONNECTIONS", "50"))
+WS_ROOM_MAX_BYTES_PER_SECOND = int(os.getenv("WS_ROOM_MAX_BYTES_PER_SECOND", "0"))
+
+# Cross-worker WebSocket fan-out: pub/sub bus ("local" or "redis"), its URL and
+# key prefix, and how often each worker re-announces its room presence (seconds)
+WS_BUS = os.getenv("WS_BUS", "local").lower()
+WS_BUS_URL = os.getenv("WS_BUS_URL", "redis://localhost:6379/0")
+WS_BUS_PREFIX = os.getenv("WS_BUS_PREFIX", "ai_debate:ws:")
+WS_PRESENCE_INTERVAL_SECONDS = float(os.getenv("WS_PRESENCE_INTERVAL_SECONDS", "10"))
+
+# Password hashing: bcrypt cost (existing hashes are upgraded on login when it
+# changes), hashing threads, and how many more hashes may wait before 503
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "32"))
+
+# Verified-token cache for authenticated requests: size bound, and how long a
+# resolved user may be reused (entries never outlive the token's exp)
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+
+# Encoded response bodies for hot reads: size bounds, and how long a body is kept
+# (bodies are keyed by storage revision, so writes by other workers show up at once)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_MAX_MB = int(os.getenv("RESPONSE_CACHE_MAX_MB", "64"))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "5"))
+
+# Conditional GETs of debates and topics: how long browsers and CDNs may reuse
+# a body before revalidating its ETag (0 = revalidate on every use)
+HTTP_CACHE_MAX_AGE_SECONDS = int(os.getenv("HTTP_CACHE_MAX_AGE_SECONDS", "0"))
+
+# Admission control for the endpoints that call Gemini: token buckets per user and
+# for the whole deployment (requests per minute, 0 = unlimited, and burst size), how
+# many requests may wait for the global bucket and for how long before 429, and
+# where bucket state lives ("local" per worker, "redis" shared by every worker)
+GEMINI_USER_RATE_PER_MINUTE = float(os.getenv("GEMINI_USER_RATE_PER_MINUTE", "6"))
+GEMINI_USER_BURST = int(os.getenv("GEMINI_USER_BURST", "3"))
+GEMINI_GLOBAL_RATE_PER_MINUTE = float(os.getenv("GEMINI_GLOBAL_RATE_PER_MINUTE", "30"))
+GEMINI_GLOBAL_BURST = int(os.getenv("GEMINI_GLOBAL_BURST", "10"))
+GEMINI_ADMISSION_QUEUE_SIZE = int(os.getenv("GEMINI_ADMISSION_QUEUE_SIZE", "20"))
+GEMINI_ADMISSION_MAX_WAIT_SECONDS = float(os.getenv("GEMINI_ADMISSION_MAX_WAIT_SECONDS", "10"))
+GEMINI_LIMITER = os.getenv("GEMINI_LIMITER", "local").lower()
+GEMINI_LIMITER_URL = os.getenv("GEMINI_LIMITER_URL", "redis://localhost:6379/0")
+GEMINI_LIMITER_PREFIX = os.getenv("GEMINI_LIMITER_PREFIX", "ai_debate:limit:")
@@ -1,5 +1,13 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import MONGODB_URI, DATABASE_NAME
+from app.config import (
+    MONGODB_URI,
+    DATABASE_NAME,
+    MONGODB_MAX_POOL_SIZE,
+    MONGODB_MIN_POOL_SIZE,
+    MONGODB_CONNECT_TIMEOUT_MS,
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+    MONGODB_SOCKET_TIMEOUT_MS,
+)
 import logging
 
 client: AsyncIOMotorClient = None
@@ -8,7 +16,14 @@ db = None
 
 async def connect_to_mongo():
     global client, db
-    client = AsyncIOMotorClient(MONGODB_URI)
+    client = AsyncIOMotorClient(
+        MONGODB_URI,
+        maxPoolSize=MONGODB_MAX_POOL_SIZE,
+        minPoolSize=MONGODB_MIN_POOL_SIZE,
+        connectTimeoutMS=MONGODB_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        socketTimeoutMS=MONGODB_SOCKET_TIMEOUT_MS,
+    )
     db = client[DATABASE_NAME]
     logging.info("Connected to MongoDB")
 
@@ -19,4 +34,7 @@ async def close_mongo_connection():
         client.close()
         logging.info("Closed MongoDB connection")
 
-# TODO: Add helper functions for common DB operations
+
+def get_database():
+    """Return the connected database handle (None before startup)."""
+    return db
@@ -1,13 +1,18 @@
 """AI Debate Bot FastAPI Application."""
 import logging
+from typing import Optional
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, status, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import auth_routes, debate_routes, topic_routes, admin_routes
 from app.database import connect_to_mongo, close_mongo_connection
-from app.services.storage_service import get_user_by_email, create_user
+from app.services.storage_backend import get_storage, EmailAlreadyRegistered
 from app.utils.auth_utils import hash_password
 from app.config import ADMIN_EMAIL, ADMIN_PASSWORD
 from app.websocket import manager
+from app.services.generation_service import generation_workers
+from app.services.debate_events import debate_events
+from app.services.gemini_admission import gemini_admission
+from app.services.debate_cache import debate_cache
 from app.utils.auth_utils import verify_token
 
 # Configure logging
@@ -30,14 +35,23 @@ app.add_middleware(
 async def startup_event():
     """Initialize database connection on startup."""
     await connect_to_mongo()
+    storage = get_storage()
+    await storage.start()
+    logger.info(f"Using {storage.name} storage backend")
+    await generation_workers.start()
+    await manager.start()
+    await gemini_admission.start()
+    await debate_cache.start()
     # Seed an admin user when ADMIN_EMAIL and ADMIN_PASSWORD are provided in env
     try:
         if ADMIN_EMAIL and ADMIN_PASSWORD:
-            existing = get_user_by_email(ADMIN_EMAIL)
+            existing = await storage.get_user_by_email(ADMIN_EMAIL)
             if not existing:
-                hashed = hash_password(ADMIN_PASSWORD)
-                create_user(email=ADMIN_EMAIL, hashed_password=hashed, name="admin", role="admin")
+                hashed = await hash_password(ADMIN_PASSWORD)
+                await storage.create_user(email=ADMIN_EMAIL, hashed_password=hashed, name="admin", role="admin")
                 logger.info("Seeded admin user from environment")
+    except EmailAlreadyRegistered:
+        pass  # Seeded by another worker meanwhile
     except Exception:
         logger.exception("Failed to seed admin user")
     logger.info("Application startup complete")
@@ -46,6 +60,11 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Close database connection on shutdown."""
+    await generation_workers.stop()
+    await manager.close()
+    await gemini_admission.close()
+    await debate_cache.close()
+    await get_storage().close()
     await close_mongo_connection()
     logger.info("Application shutdown complete")
 
@@ -66,15 +85,26 @@ async def root():
 
 # WebSocket endpoint for real-time debate updates
 @app.websocket("/ws/debate/{debate_id}")
-async def websocket_endpoint(websocket: WebSocket, debate_id: str):
+async def websocket_endpoint(websocket: WebSocket, debate_id: str, epoch: Optional[str] = None, since: Optional[int] = None):
     """
     WebSocket endpoint for real-time debate updates.
     
     Maintains persistent connection and broadcasts events to all connected clients.
+    A new client first receives a ``sync`` message with the room's epoch and
+    version; a reconnecting client passes ``?epoch=...&since=<version>`` and
+    is replayed the delta events it missed (or told ``resync_required``).
     """
     try:
         await manager.connect(debate_id, websocket)
         
+        # Events broadcast meanwhile are already queued for this client; its
+        # version check skips or re-applies them safely
+        if since is None:
+            manager.send(debate_id, websocket, await debate_events.position(debate_id))
+        else:
+            for event in await debate_events.since(debate_id, epoch, since):
+                manager.send(debate_id, websocket, event)
+        
         # Broadcast connection event
         await manager.broadcast(
             debate_id,
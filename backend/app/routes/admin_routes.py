@@ -1,14 +1,17 @@
 """Admin endpoints: register/login and analytics/debate management."""
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.utils.auth_utils import get_current_admin, hash_password, verify_password, create_token
-from app.services.storage_service import (
-    get_debate_stats,
-    get_user_by_id,
-    get_all_debates,
-    delete_debate,
-    get_user_by_email,
-    create_user,
-)
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from app.utils.auth_utils import get_current_admin, hash_password, verify_password, upgrade_password_hash, create_token
+from app.services.storage_backend import get_storage, EmailAlreadyRegistered
+from app.services.gemini_pool import gemini_pool
+from app.services.debate_cache import debate_cache
+from app.services.gemini_service import debate_flight, summary_flight
+from app.services.generation_service import generation_workers
+from app.websocket import manager
+from app.services.debate_events import debate_events
+from app.services.password_hasher import password_hasher
+from app.services.principal_cache import principal_cache
+from app.services.response_cache import response_cache
+from app.services.gemini_admission import gemini_admission
 from app.schemas.user_schema import UserRegister, UserLogin, UserOut, Token
 
 router = APIRouter()
@@ -17,12 +20,15 @@ router = APIRouter()
 @router.post("/register", response_model=Token)
 async def admin_register(payload: UserRegister):
     """Create an admin account (can be used once to seed admin)."""
-    existing = get_user_by_email(payload.email)
+    existing = await get_storage().get_user_by_email(payload.email)
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
-    hashed = hash_password(payload.password)
-    user = create_user(email=payload.email, hashed_password=hashed, name=payload.name, role="admin")
+    hashed = await hash_password(payload.password)
+    try:
+        user = await get_storage().create_user(email=payload.email, hashed_password=hashed, name=payload.name, role="admin")
+    except EmailAlreadyRegistered:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
     token = create_token({"sub": user["id"]})
 
     user_out = UserOut(id=user["id"], email=user["email"], name=user["name"], role=user["role"]) 
@@ -32,12 +38,13 @@ async def admin_register(payload: UserRegister):
 @router.post("/login", response_model=Token)
 async def admin_login(credentials: UserLogin):
     """Admin login endpoint."""
-    user = get_user_by_email(credentials.email)
+    user = await get_storage().get_user_by_email(credentials.email)
     if not user or user.get("role") != "admin":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    if not verify_password(credentials.password, user["hashed_password"]):
+    if not await verify_password(credentials.password, user["hashed_password"]):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    await upgrade_password_hash(user, credentials.password)
 
     token = create_token({"sub": user["id"]})
     user_out = UserOut(id=user["id"], email=user["email"], name=user["name"], role=user["role"]) 
@@ -47,11 +54,11 @@ async def admin_login(credentials: UserLogin):
 @router.get("/analytics")
 async def get_analytics(admin: dict = Depends(get_current_admin)):
     """Get platform analytics (admin only)."""
-    stats = get_debate_stats()
+    stats = await get_storage().get_debate_stats()
 
     most_active_user = None
     if stats.get("most_active_user_id"):
-        user = get_user_by_id(stats["most_active_user_id"])
+        user = await get_storage().get_user_by_id(stats["most_active_user_id"])
         if user:
             most_active_user = {"id": user["id"], "name": user["name"], "email": user["email"]}
 
@@ -65,16 +72,50 @@ async def get_analytics(admin: dict = Depends(get_current_admin)):
     }
 
 
+@router.get("/leaderboard")
+async def get_leaderboard(
+    limit: int = Query(10, ge=1, le=100),
+    admin: dict = Depends(get_current_admin),
+):
+    """Get top-N most voted debates and most active users (admin only)."""
+    return await get_storage().get_leaderboards(limit)
+
+
+@router.get("/metrics")
+async def get_metrics(admin: dict = Depends(get_current_admin)):
+    """Get runtime metrics for the Gemini pool, caches, storage and WebSocket fan-out (admin only)."""
+    storage = get_storage()
+    return {
+        "gemini": gemini_pool.stats(),
+        "gemini_admission": gemini_admission.stats(),
+        "debate_cache": debate_cache.stats(),
+        "single_flight": {
+            "generate_debate": debate_flight.stats(),
+            "generate_summary": summary_flight.stats(),
+        },
+        "generation_workers": generation_workers.stats(),
+        "storage": {"backend": storage.name, **storage.stats()},
+        "websocket": manager.stats(),
+        "debate_events": debate_events.stats(),
+        "password_hasher": password_hasher.stats(),
+        "principal_cache": principal_cache.stats(),
+        "response_cache": response_cache.stats(),
+    }
+
+
 @router.get("/debates")
 async def admin_list_debates(admin: dict = Depends(get_current_admin)):
     """List all debates (admin only)."""
-    return {"debates": get_all_debates()}
+    return {"debates": await get_storage().get_all_debates()}
 
 
 @router.delete("/debates/{debate_id}")
 async def admin_delete_debate(debate_id: str, admin: dict = Depends(get_current_admin)):
     """Delete any debate by id (admin only)."""
-    success = delete_debate(debate_id)
+    success = await get_storage().delete_debate(debate_id)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Debate not found")
+    response_cache.invalidate_debate(debate_id)
+    await debate_events.publish(debate_id, "debate_deleted")
+    await debate_events.forget(debate_id)
     return {"message": "Debate deleted"}
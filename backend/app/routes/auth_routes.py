@@ -1,8 +1,8 @@
 """Authentication endpoints: register and login."""
 from fastapi import APIRouter, HTTPException, status
 from app.schemas.user_schema import UserRegister, UserLogin, UserOut, Token
-from app.utils.auth_utils import hash_password, verify_password, create_token
-from app.services.storage_service import create_user, get_user_by_email
+from app.utils.auth_utils import hash_password, verify_password, upgrade_password_hash, create_token
+from app.services.storage_backend import get_storage, EmailAlreadyRegistered
 
 router = APIRouter()
 
@@ -14,24 +14,29 @@ async def register(user_data: UserRegister):
     
     Returns JWT token on success.
     """
-    # Check if user already exists
-    existing = get_user_by_email(user_data.email)
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
+    email_taken = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Email already registered",
+    )
+    
+    # Cheap early answer for the common case; not relied on for uniqueness
+    if await get_storage().get_user_by_email(user_data.email):
+        raise email_taken
     
     # Hash password
-    hashed_pw = hash_password(user_data.password)
+    hashed_pw = await hash_password(user_data.password)
     
-    # Create user in storage
-    user = create_user(
-        email=user_data.email,
-        hashed_password=hashed_pw,
-        name=user_data.name,
-        role="user",
-    )
+    # Create user in storage (the engine rejects a duplicate atomically, e.g.
+    # when a concurrent registration won the race while we were hashing)
+    try:
+        user = await get_storage().create_user(
+            email=user_data.email,
+            hashed_password=hashed_pw,
+            name=user_data.name,
+            role="user",
+        )
+    except EmailAlreadyRegistered:
+        raise email_taken
     
     # Generate token
     token = create_token({"sub": user["id"]})
@@ -59,7 +64,7 @@ async def login(credentials: UserLogin):
     Returns JWT token on success.
     """
     # Find user
-    user = get_user_by_email(credentials.email)
+    user = await get_storage().get_user_by_email(credentials.email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -67,11 +72,12 @@ async def login(credentials: UserLogin):
         )
     
     # Verify password
-    if not verify_password(credentials.password, user["hashed_password"]):
+    if not await verify_password(credentials.password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
+    await upgrade_password_hash(user, credentials.password)
     
     # Generate token
     token = create_token({"sub": user["id"]})
@@ -1,56 +1,178 @@
 """Debate management endpoints."""
-from fastapi import APIRouter, HTTPException, status, Depends, Query
-from typing import List
+import asyncio
+import math
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Header, Response
+from typing import List, Optional
 from app.schemas.debate_schema import (
     DebateOut,
+    DebateListOut,
+    DebateStatusOut,
     DebateCreate,
     ArgumentOut,
+    ArgumentPageOut,
     VoteRequest,
     SummaryRequest,
     ParticipateRequest,
 )
 from app.utils.auth_utils import get_current_user, get_current_admin
-from app.services.gemini_service import generate_debate, generate_summary
-from app.services.storage_service import (
-    create_debate,
-    get_debate_by_id,
-    get_all_debates,
-    list_debates_paginated,
-    add_argument_to_debate,
-    get_argument_by_id,
-    add_vote,
-    has_voted,
-    update_debate_summary,
-    get_topic_by_id,
-)
+from app.websocket import manager
+from app.config import GEMINI_STREAMING
+from app.services.summary_service import summarize_debate, is_summary_current
+from app.services.gemini_admission import gemini_admission, AdmissionRejected
+from app.services.generation_service import generation_workers, populate_debate_arguments
+from app.services.storage_backend import get_storage
+from app.services.debate_events import debate_events
+from app.services.response_cache import response_cache, debate_group, DEBATE_LIST_GROUP
+from app.utils.http_cache import make_etag, etag_matches, cache_headers, not_modified
 
 router = APIRouter()
 
 
-@router.get("/debates", response_model=dict)
+async def _admit_gemini_request(user: dict, priority: str):
+    """Meter a request that will call Gemini; 429 with Retry-After when over the limits."""
+    try:
+        await gemini_admission.admit(user["id"], priority)
+    except AdmissionRejected as e:
+        if e.reason == "user":
+            detail = "Too many AI requests, try again later"
+        else:
+            detail = "AI generation is at capacity, try again shortly"
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
+
+
+@router.get("/debates", response_model=DebateListOut)
 async def list_debates(
-    page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
+    if_none_match: Optional[str] = Header(None),
 ):
-    """Get paginated list of debates."""
-    return list_debates_paginated(page, limit)
+    """
+    Get debates newest first, as lightweight projections with keyset pagination.
+    
+    The ETag follows the revision of the debate collection; a matching
+    If-None-Match is answered with 304.
+    """
+    storage = get_storage()
+    revision = await storage.get_collection_revision("debates")
+    etag = make_etag(storage.revision_epoch, revision)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    async def build():
+        return DebateListOut(**await storage.list_debates_page(limit, cursor)).dict()
+    
+    try:
+        body = await response_cache.get_or_build(DEBATE_LIST_GROUP, (revision, limit, cursor), build)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return Response(content=body, media_type="application/json", headers=cache_headers(etag))
 
 
 @router.get("/debates/{debate_id}", response_model=DebateOut)
-async def get_debate(debate_id: str):
-    """Get a specific debate by ID."""
-    debate = get_debate_by_id(debate_id)
-    if not debate:
+async def get_debate(
+    debate_id: str,
+    arguments_limit: Optional[int] = Query(None, ge=1, le=100, description="Return only the first page of arguments"),
+    sort: str = Query("recent", regex="^(recent|votes)$"),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Get a specific debate by ID.
+    
+    With ``arguments_limit`` only the debate header and the first page of
+    arguments are returned, along with argumentCount and the nextCursor for
+    GET /debates/{id}/arguments.
+    
+    The ETag follows the debate's revision; a matching If-None-Match is
+    answered with 304 before anything is loaded. The encoded body is cached
+    until the debate changes.
+    """
+    storage = get_storage()
+    revision = await storage.get_debate_revision(debate_id)
+    if revision is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Debate not found",
+        )
+    etag = make_etag(storage.revision_epoch, revision)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    async def build():
+        if arguments_limit is None:
+            debate = await storage.get_debate_by_id(debate_id)
+        else:
+            debate = await storage.get_debate_header(debate_id)
+        if not debate:
+            return None
+        if arguments_limit is not None:
+            page = await storage.list_arguments(debate_id, arguments_limit, sort)
+            debate = {**debate, **page} if page else {**debate, "arguments": []}
+        return DebateOut(**debate).dict()
+    
+    # Keyed by revision so a cached body is never older than the ETag sent with it
+    variant = (revision, arguments_limit, sort if arguments_limit is not None else None)
+    body = await response_cache.get_or_build(debate_group(debate_id), variant, build)
+    if body is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Debate not found",
+        )
+    return Response(content=body, media_type="application/json", headers=cache_headers(etag))
+
+
+@router.get("/debates/{debate_id}/arguments", response_model=ArgumentPageOut)
+async def list_debate_arguments(
+    debate_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    sort: str = Query("recent", regex="^(recent|votes)$", description="recent (newest first) or votes (most voted first)"),
+    side: Optional[str] = Query(None, regex="^(FOR|AGAINST|USER)$"),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
+):
+    """Get a page of a debate's arguments, optionally filtered by side."""
+    try:
+        page = await get_storage().list_arguments(debate_id, limit, sort, side, cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    if page is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Debate not found",
+        )
+    return page
+
+
+@router.get("/debates/{debate_id}/status", response_model=DebateStatusOut)
+async def get_debate_status(debate_id: str):
+    """Get the argument generation status of a debate (for polling clients)."""
+    # The header carries argumentCount, so polling never loads the arguments
+    header = await get_storage().get_debate_header(debate_id)
+    if not header:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Debate not found",
         )
-    return debate
+    return {
+        "id": header["id"],
+        "status": header.get("status", "ready"),
+        "argumentCount": header["argumentCount"],
+    }
 
 
 @router.post("/debates", response_model=DebateOut)
 async def create_new_debate(
     payload: DebateCreate,
+    response: Response,
+    background: bool = Query(False, description="Return immediately and generate arguments in the background"),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -60,6 +182,12 @@ async def create_new_debate(
     1. Validate topic
     2. Call Gemini API to generate FOR/AGAINST arguments
     3. Store debate with arguments in memory
+    
+    With ``background=true`` the debate is returned at once (202) with status
+    "generating"; arguments are pushed to /ws/debate/{id} as they are stored
+    and GET /debates/{id}/status can be polled instead.
+    
+    Creations are rate limited per user and globally (429 with Retry-After).
     """
     if not payload.topic or len(payload.topic.strip()) < 3:
         raise HTTPException(
@@ -67,38 +195,48 @@ async def create_new_debate(
             detail="Topic must be at least 3 characters",
         )
     
+    # Admission may wait, so the generation queue is checked only afterwards
+    await _admit_gemini_request(current_user, "admin" if current_user.get("role") == "admin" else "user")
+    
+    if background:
+        queue_full = HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Debate generation queue is full, try again later",
+        )
+        if generation_workers.is_full():
+            await gemini_admission.refund(current_user["id"])
+            raise queue_full
+        debate = await get_storage().create_debate(
+            topic=payload.topic,
+            created_by=current_user["id"],
+            status="generating",
+        )
+        # The queue may have filled while the debate was stored
+        try:
+            generation_workers.submit(debate["id"], payload.topic)
+        except asyncio.QueueFull:
+            await get_storage().delete_debate(debate["id"])
+            await gemini_admission.refund(current_user["id"])
+            raise queue_full
+        response_cache.invalidate(DEBATE_LIST_GROUP)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return debate
+    
     # Create debate in storage
-    debate = create_debate(
+    debate = await get_storage().create_debate(
         topic=payload.topic,
         created_by=current_user["id"],
     )
+    response_cache.invalidate(DEBATE_LIST_GROUP)
     
     # Generate arguments from Gemini
     try:
-        generated = await generate_debate(payload.topic)
-        
-        # Add FOR arguments
-        for arg in generated.get("for", []):
-            add_argument_to_debate(
-                debate_id=debate["id"],
-                side="FOR",
-                content=arg,
-                created_by=None,  # AI-generated
-            )
-        
-        # Add AGAINST arguments
-        for arg in generated.get("against", []):
-            add_argument_to_debate(
-                debate_id=debate["id"],
-                side="AGAINST",
-                content=arg,
-                created_by=None,  # AI-generated
-            )
+        await populate_debate_arguments(debate["id"], payload.topic)
     except Exception as e:
         # If Gemini fails, still return debate but with empty arguments
         pass
     
-    return get_debate_by_id(debate["id"])
+    return await get_storage().get_debate_by_id(debate["id"])
 
 
 @router.post("/debates/{debate_id}/participate")
@@ -112,8 +250,8 @@ async def participate_in_debate(
     
     User can add arguments supporting FOR or AGAINST the topic.
     """
-    debate = get_debate_by_id(debate_id)
-    if not debate:
+    # Existence check only: the header does not load the arguments
+    if not await get_storage().get_debate_header(debate_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Debate not found",
@@ -132,12 +270,19 @@ async def participate_in_debate(
         )
     
     # Add user argument
-    argument = add_argument_to_debate(
+    argument = await get_storage().add_argument_to_debate(
         debate_id=debate_id,
         side="USER",  # User-submitted argument
         content=payload.content,
         created_by=current_user["id"],
     )
+    if not argument:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Debate not found",
+        )
+    response_cache.invalidate_debate(debate_id)
+    await debate_events.publish(debate_id, "argument_added", argument=argument)
     
     return ArgumentOut(
         id=argument["id"],
@@ -162,14 +307,14 @@ async def vote_on_argument(
     - One vote per user per argument
     - Prevents duplicate voting
     """
-    debate = get_debate_by_id(debate_id)
-    if not debate:
+    # Existence check only: the header does not load the arguments
+    if not await get_storage().get_debate_header(debate_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Debate not found",
         )
     
-    argument = get_argument_by_id(debate_id, argument_id)
+    argument = await get_storage().get_argument_by_id(debate_id, argument_id)
     if not argument:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -177,20 +322,25 @@ async def vote_on_argument(
         )
     
     # Check if already voted
-    if has_voted(argument_id, current_user["id"]):
+    if await get_storage().has_voted(argument_id, current_user["id"]):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You have already voted on this argument",
         )
     
     # Add vote
-    success = add_vote(debate_id, argument_id, current_user["id"])
+    success = await get_storage().add_vote(debate_id, argument_id, current_user["id"])
     if not success:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to add vote",
         )
     
+    # Re-read the count: persistent engines do not hand out live records
+    argument = await get_storage().get_argument_by_id(debate_id, argument_id) or argument
+    response_cache.invalidate_debate(debate_id)
+    await debate_events.publish(debate_id, "vote", argumentId=argument_id, votes=argument["votes"])
+    
     return {
         "argumentId": argument_id,
         "votes": argument["votes"],
@@ -206,31 +356,52 @@ async def generate_debate_summary(
     """
     Generate a summary of the debate.
     
-    Calls Gemini API to create a neutral summary of all arguments.
+    Calls Gemini API to create a neutral summary of all arguments. The stored
+    summary is reused when no arguments were added, and updated from the new
+    arguments only when a few were added. Requests that need Gemini go
+    through admission control ahead of user debate creations (429 with
+    Retry-After when over the limits).
     """
-    debate = get_debate_by_id(debate_id)
-    if not debate:
+    header = await get_storage().get_debate_header(debate_id)
+    if not header:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Debate not found",
         )
     
-    if not debate.get("arguments"):
+    if not header["argumentCount"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Debate has no arguments to summarize",
         )
     
-    # Collect all argument content
-    arg_texts = [arg["content"] for arg in debate["arguments"]]
+    if not is_summary_current(header):
+        await _admit_gemini_request(current_admin, "admin")
     
-    # Generate summary from Gemini
+    # Summarizing needs every argument; load them only once admitted
+    debate = await get_storage().get_debate_by_id(debate_id)
+    if not debate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Debate not found",
+        )
+    
+    async def on_text(text: str):
+        await manager.broadcast(debate_id, {"type": "summary_delta", "text": text})
+    
+    async def on_progress(progress: dict):
+        await manager.broadcast(debate_id, {"type": "summary_progress", **progress})
+    
+    # Generate summary from Gemini (partial text and progress are pushed to the debate room)
     try:
-        summary = await generate_summary(arg_texts)
-        update_debate_summary(debate_id, summary)
-        return {"summary": summary}
+        result = await summarize_debate(debate, on_text if GEMINI_STREAMING else None, on_progress)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate summary",
         )
+    
+    if result["mode"] != "cached":
+        response_cache.invalidate_debate(debate_id)
+        await debate_events.publish(debate_id, "summary", summary=result["summary"])
+    return result
@@ -1,28 +1,35 @@
 """Topic management endpoints."""
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Response
+from typing import List, Optional
 from app.schemas.debate_schema import TopicCreate, TopicOut
 from app.utils.auth_utils import get_current_admin
-from app.services.storage_service import (
-    create_topic,
-    get_all_topics,
-    get_topic_by_id,
-    delete_topic,
-)
+from app.services.storage_backend import get_storage
+from app.services.response_cache import response_cache, TOPICS_GROUP
+from app.utils.http_cache import make_etag, etag_matches, cache_headers, not_modified
 
 router = APIRouter()
 
 
 @router.get("/topics", response_model=List[TopicOut])
-async def list_topics():
-    """Get all debate topics."""
-    return get_all_topics()
+async def list_topics(if_none_match: Optional[str] = Header(None)):
+    """Get all debate topics (ETag follows the topics revision; body cached until topics change)."""
+    storage = get_storage()
+    revision = await storage.get_collection_revision("topics")
+    etag = make_etag(storage.revision_epoch, revision)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    async def build():
+        return [TopicOut(**topic).dict() for topic in await storage.get_all_topics()]
+    
+    body = await response_cache.get_or_build(TOPICS_GROUP, revision, build)
+    return Response(content=body, media_type="application/json", headers=cache_headers(etag))
 
 
 @router.get("/topics/{topic_id}", response_model=TopicOut)
 async def get_topic(topic_id: str):
     """Get a specific topic by ID."""
-    topic = get_topic_by_id(topic_id)
+    topic = await get_storage().get_topic_by_id(topic_id)
     if not topic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -37,10 +44,11 @@ async def create_new_topic(
     admin: dict = Depends(get_current_admin),
 ):
     """Create a new debate topic (admin only)."""
-    topic = create_topic(
+    topic = await get_storage().create_topic(
         title=topic_data.title,
         description=topic_data.description,
     )
+    response_cache.invalidate(TOPICS_GROUP)
     return topic
 
 
@@ -50,9 +58,10 @@ async def delete_topic_endpoint(
     admin: dict = Depends(get_current_admin),
 ):
     """Delete a topic (admin only)."""
-    if not delete_topic(topic_id):
+    if not await get_storage().delete_topic(topic_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Topic not found",
         )
+    response_cache.invalidate(TOPICS_GROUP)
     return {"message": f"Topic {topic_id} deleted"}
@@ -39,7 +39,40 @@ class DebateOut(BaseModel):
     createdBy: str
     arguments: List[ArgumentOut]
     summary: Optional[str] = None
+    status: str = "ready"
     createdAt: str
+    # Set when only the first page of arguments is returned
+    argumentCount: Optional[int] = None
+    nextCursor: Optional[str] = None
+
+
+class ArgumentPageOut(BaseModel):
+    """Page of a debate's arguments with a cursor for the next page."""
+    arguments: List[ArgumentOut]
+    nextCursor: Optional[str] = None
+
+
+class DebateListItem(BaseModel):
+    """Lightweight debate projection for listings."""
+    id: str
+    topic: str
+    createdAt: str
+    argumentCount: int
+    totalVotes: int
+    hasSummary: bool
+
+
+class DebateListOut(BaseModel):
+    """Newest-first page of debates with a cursor for the next page."""
+    debates: List[DebateListItem]
+    nextCursor: Optional[str] = None
+
+
+class DebateStatusOut(BaseModel):
+    """Debate generation status response."""
+    id: str
+    status: str
+    argumentCount: int
 
 
 class VoteRequest(BaseModel):
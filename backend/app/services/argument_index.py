@@ -0,0 +1,72 @@
+"""Per-debate ordered argument indexes for paginated retrieval.
+
+Arguments are identified by their position in the debate's ``arguments``
+list (they are only ever appended). For every side filter (all, FOR,
+AGAINST, USER) the index keeps:
+
+- positions in insertion order, for newest-first paging
+- (-votes, position) pairs in sorted order, for most-voted-first paging
+
+Both are updated on insert and vote. Pages start from a cursor found by
+binary search, so deep pages cost the same as the first one.
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+SORTS = ("recent", "votes")
+SIDES = ("FOR", "AGAINST", "USER")
+
+
+class ArgumentIndex:
+    """Recency and vote orderings of one debate's arguments, per side."""
+
+    def __init__(self, arguments: List[Dict[str, Any]]):
+        self._arguments = arguments
+        self._position: Dict[str, int] = {}
+        self._recent: Dict[Optional[str], List[int]] = {None: []}
+        self._ranked: Dict[Optional[str], List[Tuple[int, int]]] = {None: []}
+        for position, argument in enumerate(arguments):
+            self._link(position, argument)
+
+    def add(self, argument: Dict[str, Any]):
+        """Index an argument just appended to the debate's list."""
+        self._link(len(self._position), argument)
+
+    def vote(self, argument_id: str, votes: int):
+        """Move an argument whose vote count went from votes - 1 to votes."""
+        position = self._position.get(argument_id)
+        if position is None:
+            return
+        side = self._arguments[position]["side"]
+        for ranked in (self._ranked[None], self._ranked[side]):
+            del ranked[bisect_left(ranked, (-(votes - 1), position))]
+            insort(ranked, (-votes, position))
+
+    def page(self, sort: str, side: Optional[str], limit: int, after: Optional[List[int]] = None) -> Tuple[List[Dict[str, Any]], Optional[List[int]]]:
+        """Up to limit arguments in the given order, starting after a cursor key.
+
+        Returns the arguments and the cursor key of the next page (None on the
+        last page). Keys are [position] for "recent" and [votes, position]
+        for "votes".
+        """
+        if sort == "recent":
+            positions = self._recent.get(side, [])
+            end = len(positions) if after is None else bisect_left(positions, after[0])
+            chosen = positions[max(0, end - limit):end][::-1]
+            next_key = [chosen[-1]] if end > limit else None
+        else:
+            ranked = self._ranked.get(side, [])
+            start = 0 if after is None else bisect_right(ranked, (-after[0], after[1]))
+            window = ranked[start:start + limit]
+            chosen = [position for _, position in window]
+            next_key = [-window[-1][0], window[-1][1]] if start + limit < len(ranked) else None
+        return [self._arguments[position] for position in chosen], next_key
+
+    def _link(self, position: int, argument: Dict[str, Any]):
+        self._position[argument["id"]] = position
+        side = argument["side"]
+        self._recent.setdefault(side, [])
+        self._ranked.setdefault(side, [])
+        for key in (None, side):
+            self._recent[key].append(position)
+            insort(self._ranked[key], (-argument["votes"], position))
@@ -0,0 +1,220 @@
+"""Pub/sub bus carrying WebSocket room traffic between workers.
+
+``ConnectionManager`` publishes every room message to the bus and delivers
+to its own sockets only; other workers receive the message from the bus and
+deliver to theirs. A worker subscribes to a room's channel only while it has
+clients in that room, so it never sees traffic for rooms it does not serve.
+The bus also hands out per-room event versions so delta events stay in one
+sequence no matter which worker published them.
+
+The bus is chosen with WS_BUS:
+
+- ``local``: an in-process broker; enough for a single worker, and several
+  managers attached to one ``MemoryBroker`` behave like separate workers
+- ``redis``: Redis (or any Redis-compatible server) pub/sub at WS_BUS_URL,
+  shared by every worker and node
+"""
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+from app.config import WS_BUS, WS_BUS_URL, WS_BUS_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# handler(room, envelope) called for every envelope received on a subscribed room
+Handler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class BroadcastBus:
+    """Room-scoped publish/subscribe shared by every worker."""
+
+    name = "base"
+
+    def __init__(self):
+        self._handler: Optional[Handler] = None
+        self.published = 0
+        self.received = 0
+
+    async def start(self, handler: Handler):
+        """Connect and start delivering envelopes for subscribed rooms to ``handler``."""
+        self._handler = handler
+
+    async def close(self):
+        """Stop receiving and release connections."""
+
+    async def subscribe(self, room: str):
+        raise NotImplementedError
+
+    async def unsubscribe(self, room: str):
+        raise NotImplementedError
+
+    async def publish(self, room: str, envelope: Dict[str, Any]):
+        raise NotImplementedError
+
+    async def next_version(self, room: str) -> Tuple[str, int]:
+        """Allocate the next event version of a room, with the room's epoch."""
+        raise NotImplementedError
+
+    async def current_version(self, room: str) -> Tuple[str, int]:
+        """Latest allocated event version of a room, with the room's epoch."""
+        raise NotImplementedError
+
+    async def forget(self, room: str):
+        """Drop a deleted room's version counter."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {"published": self.published, "received": self.received}
+
+
+class MemoryBroker:
+    """In-process stand-in for a pub/sub server."""
+
+    def __init__(self):
+        self.subscribers: Dict[str, Set["MemoryBus"]] = {}
+        self.versions: Dict[str, Tuple[str, int]] = {}
+
+
+class MemoryBus(BroadcastBus):
+    """Bus over a ``MemoryBroker``; every attached bus acts as one worker."""
+
+    name = "local"
+
+    def __init__(self, broker: Optional[MemoryBroker] = None):
+        super().__init__()
+        self.broker = broker or MemoryBroker()
+        self._rooms: Set[str] = set()
+
+    async def close(self):
+        for room in list(self._rooms):
+            await self.unsubscribe(room)
+
+    async def subscribe(self, room: str):
+        self._rooms.add(room)
+        self.broker.subscribers.setdefault(room, set()).add(self)
+
+    async def unsubscribe(self, room: str):
+        self._rooms.discard(room)
+        subscribers = self.broker.subscribers.get(room)
+        if subscribers is not None:
+            subscribers.discard(self)
+            if not subscribers:
+                del self.broker.subscribers[room]
+
+    async def publish(self, room: str, envelope: Dict[str, Any]):
+        self.published += 1
+        # Round-trip through JSON like a real server would
+        data = json.dumps(envelope)
+        for bus in list(self.broker.subscribers.get(room, ())):
+            if bus is not self and bus._handler is not None:
+                bus.received += 1
+                await bus._handler(room, json.loads(data))
+
+    async def next_version(self, room: str) -> Tuple[str, int]:
+        epoch, version = await self.current_version(room)
+        self.broker.versions[room] = (epoch, version + 1)
+        return epoch, version + 1
+
+    async def current_version(self, room: str) -> Tuple[str, int]:
+        if room not in self.broker.versions:
+            self.broker.versions[room] = (uuid.uuid4().hex[:12], 0)
+        return self.broker.versions[room]
+
+    async def forget(self, room: str):
+        self.broker.versions.pop(room, None)
+
+
+class RedisBus(BroadcastBus):
+    """Bus over Redis pub/sub, one channel per room."""
+
+    name = "redis"
+
+    def __init__(self, url: str = WS_BUS_URL, prefix: str = WS_BUS_PREFIX):
+        super().__init__()
+        self.url = url
+        self.prefix = prefix
+        self._redis = None
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+
+    def _channel(self, room: str) -> str:
+        return f"{self.prefix}room:{room}"
+
+    async def start(self, handler: Handler):
+        # Imported here so the redis package is only needed when WS_BUS=redis
+        from redis import asyncio as aioredis
+
+        await super().start(handler)
+        self._redis = aioredis.from_url(self.url, decode_responses=True)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._reader = asyncio.create_task(self._read_loop())
+        logger.info(f"WebSocket bus connected to {self.url}")
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+        if self._pubsub is not None:
+            await self._pubsub.close()
+        if self._redis is not None:
+            await self._redis.close()
+
+    async def subscribe(self, room: str):
+        await self._pubsub.subscribe(self._channel(room))
+
+    async def unsubscribe(self, room: str):
+        await self._pubsub.unsubscribe(self._channel(room))
+
+    async def publish(self, room: str, envelope: Dict[str, Any]):
+        self.published += 1
+        await self._redis.publish(self._channel(room), json.dumps(envelope))
+
+    async def _read_loop(self):
+        prefix = self._channel("")
+        while True:
+            try:
+                if not self._pubsub.subscribed:
+                    await asyncio.sleep(0.05)
+                    continue
+                message = await self._pubsub.get_message(timeout=1.0)
+                if message is None or message["type"] != "message":
+                    continue
+                self.received += 1
+                await self._handler(message["channel"][len(prefix):], json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WebSocket bus read failed: {e}")
+                await asyncio.sleep(1)
+
+    async def next_version(self, room: str) -> Tuple[str, int]:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.setnx(f"{self.prefix}epoch:{room}", uuid.uuid4().hex[:12])
+            pipe.incr(f"{self.prefix}version:{room}")
+            pipe.get(f"{self.prefix}epoch:{room}")
+            _, version, epoch = await pipe.execute()
+        return epoch, int(version)
+
+    async def current_version(self, room: str) -> Tuple[str, int]:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.setnx(f"{self.prefix}epoch:{room}", uuid.uuid4().hex[:12])
+            pipe.get(f"{self.prefix}version:{room}")
+            pipe.get(f"{self.prefix}epoch:{room}")
+            _, version, epoch = await pipe.execute()
+        return epoch, int(version or 0)
+
+    async def forget(self, room: str):
+        await self._redis.delete(f"{self.prefix}epoch:{room}", f"{self.prefix}version:{room}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "url": self.url}
+
+
+def create_bus(name: str = WS_BUS) -> BroadcastBus:
+    """Build a broadcast bus by name."""
+    if name == "local":
+        return MemoryBus()
+    if name == "redis":
+        return RedisBus()
+    raise ValueError(f"Unknown WS_BUS: {name}")
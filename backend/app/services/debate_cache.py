@@ -0,0 +1,225 @@
+"""Persistent cache of generated debate arguments keyed by normalized topic.
+
+Repeat topics ("Should AI replace teachers?" vs "should ai replace teachers")
+are served from memory instead of a Gemini round-trip. Entries expire after a
+TTL, the cache is bounded with LRU eviction, and the contents are written to
+disk so they survive restarts. Writes mark the cache dirty; the file is
+rewritten at most once per DEBATE_CACHE_SAVE_DELAY_SECONDS on a worker
+thread, so request handlers never do file I/O. Writes never overlap: each
+waits for the previous one, and a change made during a write schedules the
+next save.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from app.config import (
+    DEBATE_CACHE_PATH,
+    DEBATE_CACHE_TTL_SECONDS,
+    DEBATE_CACHE_MAX_ENTRIES,
+    DEBATE_CACHE_SAVE_DELAY_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_topic(topic: str) -> str:
+    """Fold case, punctuation and whitespace so equivalent topics share a key."""
+    text = unicodedata.normalize("NFKC", topic).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class DebateArgumentCache:
+    """TTL + LRU cache of generated arguments backed by a JSON file."""
+
+    def __init__(self, path: Optional[str], ttl_seconds: float, max_entries: int, save_delay: float = 0.0):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.save_delay = save_delay
+        # normalized topic -> {"arguments": {...}, "storedAt": epoch seconds}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._loaded = False
+        self._dirty = False
+        self._saver: Optional[asyncio.Task] = None
+        self._writing: Optional[asyncio.Future] = None  # write running on a worker thread
+        self.saves = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, topic: str) -> Optional[Dict[str, List[str]]]:
+        """Return cached arguments for a topic, or None on miss/expiry."""
+        self._ensure_loaded()
+        key = normalize_topic(topic)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if self._is_expired(entry):
+            # Not persisted: expired entries are skipped when the file is loaded
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return _copy_arguments(entry["arguments"])
+
+    def put(self, topic: str, arguments: Dict[str, List[str]]):
+        """Store arguments for a topic, evicting the least recently used entries."""
+        self._ensure_loaded()
+        key = normalize_topic(topic)
+        self._entries[key] = {"arguments": _copy_arguments(arguments), "storedAt": time.time()}
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+        self._schedule_save()
+
+    def clear(self):
+        """Drop every cached entry (memory and disk)."""
+        self._entries.clear()
+        self._loaded = True
+        self._schedule_save()
+
+    async def start(self):
+        """Load the on-disk store off the event loop."""
+        await asyncio.get_running_loop().run_in_executor(None, self._ensure_loaded)
+
+    async def close(self):
+        """Write pending changes before shutdown."""
+        if self._saver is not None:
+            # Safe mid-write: the write itself is shielded and awaited below
+            self._saver.cancel()
+            await asyncio.gather(self._saver, return_exceptions=True)
+        if self._dirty:
+            await self._flush()
+        elif self._writing is not None:
+            await self._writing
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "saves": self.saves,
+        }
+
+    def _is_expired(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["storedAt"] > self.ttl_seconds
+
+    def _ensure_loaded(self):
+        """Load the on-disk store once, dropping entries that expired while down."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load debate cache from {self.path}: {e}")
+            return
+
+        # File is written in LRU order (oldest first)
+        for key, entry in stored.items():
+            if not self._is_expired(entry):
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        logger.info(f"Loaded {len(self._entries)} cached debates from {self.path}")
+
+    def _schedule_save(self):
+        """Mark the cache dirty and make sure a batched save is pending."""
+        if not self.path:
+            return
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts): write right away
+            self._dirty = False
+            self._write(list(self._entries.items()))
+            return
+        if self._saver is None:
+            self._saver = loop.create_task(self._save_later())
+
+    async def _save_later(self):
+        try:
+            await asyncio.sleep(self.save_delay)
+            await self._flush()
+        finally:
+            self._saver = None
+        # Changes made while the file was being written need another save
+        if self._dirty:
+            self._schedule_save()
+
+    async def _flush(self):
+        # One write at a time: they share the temporary file
+        while self._writing is not None:
+            writing = self._writing
+            await asyncio.shield(writing)
+            self._write_done(writing)
+        # Snapshot on the loop; serializing and writing happen on a thread
+        self._dirty = False
+        snapshot = list(self._entries.items())
+        writing = self._writing = asyncio.get_running_loop().run_in_executor(None, self._write, snapshot)
+        writing.add_done_callback(self._write_done)
+        # A cancelled caller must not leave the thread writing unnoticed
+        await asyncio.shield(writing)
+
+    def _write_done(self, writing: asyncio.Future):
+        if self._writing is writing:
+            self._writing = None
+
+    def _write(self, items):
+        """Atomically rewrite the on-disk store (LRU order, oldest first)."""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(dict(items), f)
+            os.replace(tmp_path, self.path)
+            self.saves += 1
+        except OSError as e:
+            logger.error(f"Failed to persist debate cache to {self.path}: {e}")
+
+
+def _copy_arguments(arguments: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    return {"for": list(arguments.get("for", [])), "against": list(arguments.get("against", []))}
+
+
+# Global cache instance
+debate_cache = DebateArgumentCache(
+    DEBATE_CACHE_PATH,
+    DEBATE_CACHE_TTL_SECONDS,
+    DEBATE_CACHE_MAX_ENTRIES,
+    DEBATE_CACHE_SAVE_DELAY_SECONDS,
+)
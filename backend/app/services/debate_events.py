@@ -0,0 +1,164 @@
+"""Versioned delta events published to debate rooms.
+
+Writes (votes, new arguments, summaries, status changes, deletion) publish a
+small typed event to ``/ws/debate/{id}`` instead of making every viewer
+refetch the debate. Each event carries the room's ``epoch`` and a
+``version`` that increases by one per event, so a client can apply deltas
+in order and spot gaps.
+
+Versions are allocated by the broadcast bus, so events published by any
+worker form one sequence per debate. Each worker keeps the last
+DEBATE_EVENT_HISTORY events of the debates it serves, including those
+received from other workers. A client reconnecting with
+``?epoch=...&since=<version>`` is replayed what it missed; when that is no
+longer possible (the history was trimmed or has gaps, the log was evicted,
+or the epoch changed) it receives ``resync_required`` and should refetch the
+debate once.
+
+Version calls go through the connection manager's guarded bus call, so a bus
+outage never fails the write that published the event. While versions
+cannot be allocated, the room is sent ``resync_required`` (and new clients a
+``sync``) with a null epoch and version 0 instead, so clients refetch and
+adopt the next versioned event.
+"""
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+from app.config import DEBATE_EVENT_HISTORY, DEBATE_EVENT_MAX_DEBATES
+from app.websocket import manager
+
+
+def _unversioned(message_type: str, debate_id: str) -> Dict[str, Any]:
+    """Message for when the room's version is unknown; clients refetch and start over."""
+    return {"type": message_type, "debateId": debate_id, "epoch": None, "version": 0}
+
+
+class _DebateLog:
+    """Version counter and recent events of one debate."""
+
+    __slots__ = ("epoch", "version", "events")
+
+    def __init__(self, history: int):
+        self.epoch: Optional[str] = None
+        self.version = 0
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=history)
+
+    def record(self, event: Dict[str, Any]):
+        """Add an event, keeping the history in version order."""
+        if event["epoch"] != self.epoch:
+            self.epoch = event["epoch"]
+            self.events.clear()
+        version = event["version"]
+        if not self.events or self.events[-1]["version"] < version:
+            self.events.append(event)
+        elif all(existing["version"] != version for existing in self.events):
+            # Published concurrently by another worker and received out of order
+            ordered = sorted([*self.events, event], key=lambda existing: existing["version"])
+            self.events.clear()
+            self.events.extend(ordered)
+        self.version = max(self.version, version)
+
+
+class DebateEventLog:
+    """Per-debate event logs, least recently published evicted first."""
+
+    def __init__(self, history: int = DEBATE_EVENT_HISTORY, max_debates: int = DEBATE_EVENT_MAX_DEBATES):
+        self.history = max(1, history)
+        self.max_debates = max(1, max_debates)
+        self._logs: "OrderedDict[str, _DebateLog]" = OrderedDict()
+        self.published = 0
+        self.replayed = 0
+        self.resyncs = 0
+        manager.add_listener(self._on_remote)
+
+    async def publish(self, debate_id: str, event_type: str, **data: Any) -> Dict[str, Any]:
+        """Record an event for a debate and broadcast it to the room on every worker.
+
+        Without a version (the bus is unavailable) the room is told to resync instead.
+        """
+        allocated = await manager._bus_call(manager.bus.next_version(debate_id))
+        if allocated is None:
+            self.resyncs += 1
+            event = _unversioned("resync_required", debate_id)
+            await manager.broadcast(debate_id, event)
+            return event
+
+        epoch, version = allocated
+        event = {
+            "type": event_type,
+            "debateId": debate_id,
+            "epoch": epoch,
+            "version": version,
+            "ts": time.time(),
+            **data,
+        }
+        self._log(debate_id).record(event)
+        self.published += 1
+        await manager.broadcast(debate_id, event)
+        return event
+
+    async def position(self, debate_id: str) -> Dict[str, Any]:
+        """Current epoch and version of a debate."""
+        position = await manager._bus_call(manager.bus.current_version(debate_id))
+        if position is None:
+            return _unversioned("sync", debate_id)
+        epoch, version = position
+        return {"type": "sync", "debateId": debate_id, "epoch": epoch, "version": version}
+
+    async def since(self, debate_id: str, epoch: Optional[str], version: int) -> List[Dict[str, Any]]:
+        """
+        Events a client at (epoch, version) missed, oldest first.
+
+        Returns a single ``resync_required`` message when the gap cannot be
+        filled from the retained history.
+        """
+        position = await manager._bus_call(manager.bus.current_version(debate_id))
+        if position is None:
+            self.resyncs += 1
+            return [_unversioned("resync_required", debate_id)]
+        current_epoch, current_version = position
+        log = self._logs.get(debate_id)
+        missed = []
+        if log is not None and log.epoch == epoch:
+            missed = [event for event in log.events if version < event["version"] <= current_version]
+        # Every version in between must be retained, with no gaps
+        if epoch != current_epoch or version > current_version or len(missed) != current_version - version:
+            self.resyncs += 1
+            return [{"type": "resync_required", "debateId": debate_id, "epoch": current_epoch, "version": current_version}]
+
+        self.replayed += len(missed)
+        return missed
+
+    async def forget(self, debate_id: str):
+        """Drop a deleted debate's log and version counter."""
+        self._logs.pop(debate_id, None)
+        await manager._bus_call(manager.bus.forget(debate_id))
+
+    async def _on_remote(self, debate_id: str, message: Dict[str, Any]):
+        """Keep events published by other workers for replay."""
+        if message.get("version") and message.get("epoch"):
+            self._log(debate_id).record(message)
+
+    def _log(self, debate_id: str) -> _DebateLog:
+        log = self._logs.get(debate_id)
+        if log is None:
+            log = self._logs[debate_id] = _DebateLog(self.history)
+            while len(self._logs) > self.max_debates:
+                self._logs.popitem(last=False)
+        else:
+            self._logs.move_to_end(debate_id)
+        return log
+
+    def stats(self) -> Dict[str, Any]:
+        """Tracked debates and event counts."""
+        return {
+            "debates": len(self._logs),
+            "history": self.history,
+            "published": self.published,
+            "replayed": self.replayed,
+            "resyncs": self.resyncs,
+        }
+
+
+# Global event log instance
+debate_events = DebateEventLog()
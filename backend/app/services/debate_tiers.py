@@ -0,0 +1,336 @@
+"""Tiered debate store: hot debates in memory, cold debates on disk.
+
+Recently used debates stay resident under an LRU bounded by an approximate
+memory budget. When the budget is exceeded the least recently used debates
+are serialized (zlib-compressed JSON, one file each) and dropped from memory;
+the next ``get`` loads them back. Listing order is kept in a separate id
+index, so counting and paging never touch cold debates.
+
+Once ``start`` has run, disk work stays off the event loop: evicted debates
+are written (and deleted ones removed) in order by a background writer on a
+worker thread, and stay readable from memory until their file is in place;
+``load`` reads a cold debate on a worker thread. Before ``start`` (recovery
+at startup) and after ``close`` the store does its file I/O inline.
+
+Without a directory the store never evicts and behaves like a plain dict.
+"""
+import asyncio
+import json
+import logging
+import os
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rough CPython footprint of a debate record and of each argument dict
+DEBATE_OVERHEAD_BYTES = 800
+ARGUMENT_OVERHEAD_BYTES = 500
+COLD_SUFFIX = ".json.z"
+
+Debate = Dict[str, Any]
+
+
+def estimate_bytes(debate: Debate) -> int:
+    """Approximate resident size of a debate and its arguments."""
+    size = DEBATE_OVERHEAD_BYTES + len(debate["topic"]) + len(debate.get("summary") or "")
+    for arg in debate["arguments"]:
+        size += ARGUMENT_OVERHEAD_BYTES + len(arg["content"])
+    return size
+
+
+def _copy(debate: Debate) -> Debate:
+    """Copy of a debate whose fields and argument list can change independently."""
+    return {**debate, "arguments": list(debate["arguments"])}
+
+
+class TieredDebateStore:
+    """Debates by id with an LRU memory budget and lazy loading from disk."""
+
+    def __init__(
+        self,
+        directory: Optional[str],
+        memory_budget_bytes: int,
+        on_admit: Optional[Callable[[Debate], None]] = None,
+        on_evict: Optional[Callable[[Debate], None]] = None,
+        on_read: Optional[Callable[[Debate], None]] = None,
+    ):
+        self.directory = directory
+        self.memory_budget_bytes = memory_budget_bytes
+        # Hooks: debate becomes resident / leaves memory / was read back from disk
+        self.on_admit = on_admit
+        self.on_evict = on_evict
+        self.on_read = on_read
+
+        self._ids: Dict[str, None] = {}  # every debate id, creation order
+        self._hot: "OrderedDict[str, Debate]" = OrderedDict()  # LRU: oldest first
+        self._sizes: Dict[str, int] = {}
+        self._pending: Dict[str, Debate] = {}  # evicted, copy whose cold file is not written yet
+        self._writes: Optional["asyncio.Queue[Tuple[str, Optional[Debate]]]"] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._dir_ready = False
+        self.resident_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.write_failures = 0
+
+    async def start(self):
+        """Move cold-tier writes to a background writer from now on."""
+        if not self.directory or self._writer is not None:
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._ensure_dir)
+        self._writes = asyncio.Queue()
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def close(self):
+        """Finish queued writes and go back to inline file I/O."""
+        if self._writer is None:
+            return
+        await self._writes.join()
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        self._writer = None
+        self._writes = None
+
+    # ------------------------------------------------------------------
+    # Mapping-style access
+    # ------------------------------------------------------------------
+
+    def __contains__(self, debate_id: str) -> bool:
+        return debate_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def ids(self) -> Iterator[str]:
+        """All debate ids in creation order."""
+        return iter(self._ids)
+
+    def add(self, debate: Debate):
+        """Store a new debate as hot."""
+        self._ids[debate["id"]] = None
+        self._admit(debate)
+        self._evict(keep=debate["id"])
+
+    def get(self, debate_id: str, promote: bool = True) -> Optional[Debate]:
+        """Return a debate, loading it from disk if cold.
+
+        With ``promote=False`` a cold debate is returned without being made
+        resident; such a copy is read-only (changes to it are not kept).
+        """
+        debate = self._hot.get(debate_id)
+        if debate is not None:
+            self.hits += 1
+            if promote:
+                self._hot.move_to_end(debate_id)
+            return debate
+        if debate_id not in self._ids:
+            return None
+
+        pending = self._pending.get(debate_id)
+        if pending is not None:
+            self.hits += 1
+            # The writer thread is still serializing this copy; a resident one gets its own
+            debate = _copy(pending) if promote else pending
+        else:
+            self.misses += 1
+            debate = self.read_cold(debate_id)
+            if debate is None:
+                logger.error(f"Cold debate {debate_id} is missing from {self.directory}")
+                return None
+        if promote:
+            self._promote(debate)
+        return debate
+
+    async def load(self, debate_id: str, promote: bool = True) -> Optional[Debate]:
+        """Like ``get``, but a cold debate is read on a worker thread."""
+        if debate_id in self._hot or debate_id in self._pending or debate_id not in self._ids:
+            return self.get(debate_id, promote)
+
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        debate = await loop.run_in_executor(None, self.read_cold, debate_id)
+        if debate_id not in self._ids:
+            return None  # deleted while it was being read
+        if debate_id in self._hot or debate_id in self._pending:
+            # A concurrent load or write got there first; its copy is current
+            return self.get(debate_id, promote)
+        if debate is None:
+            logger.error(f"Cold debate {debate_id} is missing from {self.directory}")
+            return None
+        if promote:
+            self._promote(debate)
+        return debate
+
+    def pop(self, debate_id: str) -> Optional[Debate]:
+        """Remove a debate from both tiers and return it."""
+        debate = self.get(debate_id, promote=False)
+        if debate is None:
+            return None
+        del self._ids[debate_id]
+        self._pending.pop(debate_id, None)
+        if debate_id in self._hot:
+            del self._hot[debate_id]
+            self.resident_bytes -= self._sizes.pop(debate_id)
+        if self.directory:
+            if self._writes is not None:
+                # Queued behind any pending write of the same debate
+                self._writes.put_nowait((debate_id, None))
+            else:
+                self._remove_cold(debate_id)
+        return debate
+
+    def resize(self, debate_id: str, delta: Optional[int] = None):
+        """Account for a resident debate growing by delta bytes (re-estimated if None)."""
+        debate = self._hot.get(debate_id)
+        if debate is None:
+            return
+        size = self._sizes[debate_id] + delta if delta is not None else estimate_bytes(debate)
+        self.resident_bytes += size - self._sizes[debate_id]
+        self._sizes[debate_id] = size
+        self._evict(keep=debate_id)
+
+    def hot_items(self):
+        """In-memory (id, debate) pairs: resident ones, then evicted ones still being written."""
+        return [*self._hot.items(), *self._pending.items()]
+
+    def clear(self):
+        if self.directory and self._dir_ready:
+            self._remove_cold_files()
+        self._ids.clear()
+        self._hot.clear()
+        self._sizes.clear()
+        self._pending.clear()
+        self.resident_bytes = 0
+        self.hits = self.misses = self.evictions = self.write_failures = 0
+
+    # ------------------------------------------------------------------
+    # Tiering
+    # ------------------------------------------------------------------
+
+    def read_cold(self, debate_id: str) -> Optional[Debate]:
+        """Read a debate's cold copy from disk (safe to call from other threads)."""
+        if not self.directory:
+            return None
+        try:
+            with open(self._cold_path(debate_id), "rb") as f:
+                debate = json.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        if self.on_read:
+            self.on_read(debate)
+        return debate
+
+    def _promote(self, debate: Debate):
+        # A newer copy is resident now; an in-flight write of the old one is harmless
+        self._pending.pop(debate["id"], None)
+        self._admit(debate)
+        self._evict(keep=debate["id"])
+
+    def _admit(self, debate: Debate):
+        self._hot[debate["id"]] = debate
+        size = estimate_bytes(debate)
+        self._sizes[debate["id"]] = size
+        self.resident_bytes += size
+        if self.on_admit:
+            self.on_admit(debate)
+
+    def _evict(self, keep: Optional[str] = None):
+        """Move least recently used debates to disk until within the budget."""
+        if not self.directory:
+            return
+        while self.resident_bytes > self.memory_budget_bytes and self._hot:
+            debate_id, debate = next(iter(self._hot.items()))
+            if debate_id == keep:
+                if len(self._hot) == 1:
+                    break
+                self._hot.move_to_end(debate_id)
+                continue
+            if self._writes is not None:
+                snapshot = _copy(debate)
+                self._pending[debate_id] = snapshot
+                self._writes.put_nowait((debate_id, snapshot))
+            else:
+                self._write_cold(debate)
+            del self._hot[debate_id]
+            self.resident_bytes -= self._sizes.pop(debate_id)
+            self.evictions += 1
+            if self.on_evict:
+                self.on_evict(debate)
+
+    async def _write_loop(self):
+        """Apply queued cold-tier writes and removals one at a time, in order."""
+        loop = asyncio.get_running_loop()
+        while True:
+            debate_id, snapshot = await self._writes.get()
+            try:
+                if snapshot is None:
+                    await loop.run_in_executor(None, self._remove_cold, debate_id)
+                else:
+                    await loop.run_in_executor(None, self._write_cold, snapshot)
+            except Exception:
+                self.write_failures += 1
+                logger.exception(f"Writing cold debate {debate_id} failed")
+                if snapshot is not None and self._pending.get(debate_id) is snapshot:
+                    # Keep it resident rather than lose it
+                    del self._pending[debate_id]
+                    self._admit(_copy(snapshot))
+            else:
+                if snapshot is not None and self._pending.get(debate_id) is snapshot:
+                    del self._pending[debate_id]
+            finally:
+                self._writes.task_done()
+
+    def _write_cold(self, debate: Debate):
+        self._ensure_dir()
+        path = self._cold_path(debate["id"])
+        tmp_path = f"{path}.tmp"
+        data = zlib.compress(json.dumps(debate, separators=(",", ":")).encode("utf-8"), 1)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _remove_cold(self, debate_id: str):
+        try:
+            os.remove(self._cold_path(debate_id))
+        except FileNotFoundError:
+            pass
+
+    def _cold_path(self, debate_id: str) -> str:
+        return os.path.join(self.directory, debate_id + COLD_SUFFIX)
+
+    def _ensure_dir(self):
+        if self._dir_ready:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        # Cold files from a previous process are stale: the store starts empty
+        self._remove_cold_files()
+        self._dir_ready = True
+
+    def _remove_cold_files(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(COLD_SUFFIX) or name.endswith(COLD_SUFFIX + ".tmp"):
+                os.remove(os.path.join(self.directory, name))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "debates": len(self._ids),
+            "hot": len(self._hot),
+            "cold": len(self._ids) - len(self._hot),
+            "resident_bytes": self.resident_bytes,
+            "memory_budget_bytes": self.memory_budget_bytes if self.directory else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "pending_writes": len(self._pending),
+            "write_failures": self.write_failures,
+        }
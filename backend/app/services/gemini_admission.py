@@ -0,0 +1,390 @@
+"""Admission control for the endpoints that call Gemini.
+
+``POST /debates`` and ``POST /debates/{id}/summary`` each start multi-second
+Gemini calls against a shared quota. ``gemini_admission`` meters them with
+two token buckets: one per user (GEMINI_USER_RATE_PER_MINUTE, burst
+GEMINI_USER_BURST) and one for the whole deployment
+(GEMINI_GLOBAL_RATE_PER_MINUTE, burst GEMINI_GLOBAL_BURST).
+
+A user over their own rate is rejected at once. A request the global bucket
+cannot serve yet waits in a bounded queue (GEMINI_ADMISSION_QUEUE_SIZE, at
+most GEMINI_ADMISSION_MAX_WAIT_SECONDS) ordered by priority class: admin
+requests are admitted before user debate creations, and when the queue is
+full an admin request displaces the newest user waiter. Every rejection
+raises ``AdmissionRejected`` with the delay to send back as Retry-After.
+
+Bucket state lives in a pluggable limiter backend chosen with GEMINI_LIMITER:
+
+- ``local``: in-process buckets; each worker meters on its own
+- ``redis``: buckets in Redis (or any Redis-compatible server) at
+  GEMINI_LIMITER_URL, updated by an atomic script and shared by every worker
+
+The wait queue is per worker; only the buckets are shared.
+"""
+import asyncio
+import bisect
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import (
+    GEMINI_USER_RATE_PER_MINUTE,
+    GEMINI_USER_BURST,
+    GEMINI_GLOBAL_RATE_PER_MINUTE,
+    GEMINI_GLOBAL_BURST,
+    GEMINI_ADMISSION_QUEUE_SIZE,
+    GEMINI_ADMISSION_MAX_WAIT_SECONDS,
+    GEMINI_LIMITER,
+    GEMINI_LIMITER_URL,
+    GEMINI_LIMITER_PREFIX,
+)
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, most urgent first
+PRIORITIES = {"admin": 0, "user": 1}
+
+# Buckets kept by the local backend; the least recently used are dropped
+# beyond this (a dropped bucket starts over full)
+MAX_LOCAL_BUCKETS = 100_000
+
+GLOBAL_BUCKET = "global"
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is over its limits; retry_after is in seconds."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason  # "user", "global", "queue_full", "displaced" or "timeout"
+        self.retry_after = retry_after
+
+
+class LimiterBackend:
+    """Token bucket state shared by the workers that use it."""
+
+    name = "base"
+
+    async def start(self):
+        """Connect to the backing store."""
+
+    async def close(self):
+        """Release connections."""
+
+    async def take(self, key: str, rate: float, capacity: int) -> float:
+        """
+        Take one token from a bucket refilling at ``rate`` tokens per second
+        up to ``capacity``.
+
+        Returns 0 when a token was taken, otherwise the seconds until one
+        will be available (nothing is taken).
+        """
+        raise NotImplementedError
+
+    async def refund(self, key: str, rate: float, capacity: int):
+        """Give back a token taken for a request that was not admitted after all."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class MemoryLimiterBackend(LimiterBackend):
+    """Buckets in this process, bounded with LRU eviction."""
+
+    name = "local"
+
+    def __init__(self, max_buckets: int = MAX_LOCAL_BUCKETS):
+        self.max_buckets = max_buckets
+        # key -> (tokens, updated at (monotonic))
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def _level(self, key: str, rate: float, capacity: int, now: float) -> float:
+        entry = self._buckets.get(key)
+        if entry is None:
+            return float(capacity)
+        tokens, updated = entry
+        return min(float(capacity), tokens + (now - updated) * rate)
+
+    def _set(self, key: str, tokens: float, now: float):
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_buckets:
+            self._buckets.popitem(last=False)
+
+    async def take(self, key, rate, capacity):
+        now = time.monotonic()
+        tokens = self._level(key, rate, capacity, now)
+        if tokens < 1:
+            return (1 - tokens) / rate
+        self._set(key, tokens - 1, now)
+        return 0.0
+
+    async def refund(self, key, rate, capacity):
+        now = time.monotonic()
+        self._set(key, min(float(capacity), self._level(key, rate, capacity, now) + 1), now)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"buckets": len(self._buckets)}
+
+
+# KEYS[1] = bucket; ARGV = rate (tokens/s), capacity, cost (negative refunds).
+# Uses the server clock so every worker refills buckets the same way. Returns
+# the wait in seconds as a string ("0" when the cost was taken).
+_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+if cost > 0 and tokens < cost then
+    return tostring((cost - tokens) / rate)
+end
+tokens = math.min(capacity, tokens - cost)
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return '0'
+"""
+
+
+class RedisLimiterBackend(LimiterBackend):
+    """Buckets as Redis hashes, expiring once they would be full again."""
+
+    name = "redis"
+
+    def __init__(self, url: str = GEMINI_LIMITER_URL, prefix: str = GEMINI_LIMITER_PREFIX):
+        self.url = url
+        self.prefix = prefix
+        self._redis = None
+        self._script = None
+
+    async def start(self):
+        # Imported here so the redis package is only needed when GEMINI_LIMITER=redis
+        from redis import asyncio as aioredis
+
+        self._redis = aioredis.from_url(self.url, decode_responses=True)
+        self._script = self._redis.register_script(_BUCKET_SCRIPT)
+        logger.info(f"Gemini rate limiter connected to {self.url}")
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.close()
+
+    async def _apply(self, key: str, rate: float, capacity: int, cost: int) -> float:
+        wait = await self._script(keys=[f"{self.prefix}{key}"], args=[rate, capacity, cost])
+        return float(wait)
+
+    async def take(self, key, rate, capacity):
+        return await self._apply(key, rate, capacity, 1)
+
+    async def refund(self, key, rate, capacity):
+        await self._apply(key, rate, capacity, -1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"url": self.url}
+
+
+def create_limiter_backend(name: str = GEMINI_LIMITER) -> LimiterBackend:
+    """Build a limiter backend by name."""
+    if name == "local":
+        return MemoryLimiterBackend()
+    if name == "redis":
+        return RedisLimiterBackend()
+    raise ValueError(f"Unknown GEMINI_LIMITER: {name}")
+
+
+class _Waiter:
+    """A request queued for the global bucket; ordered by (priority, arrival)."""
+
+    __slots__ = ("rank", "seq", "future")
+
+    def __init__(self, rank: int, seq: int, future: asyncio.Future):
+        self.rank = rank
+        self.seq = seq
+        self.future = future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+
+class GeminiAdmission:
+    """Per-user and global token buckets with a bounded priority wait queue."""
+
+    def __init__(
+        self,
+        backend: LimiterBackend,
+        user_rate_per_minute: float,
+        user_burst: int,
+        global_rate_per_minute: float,
+        global_burst: int,
+        queue_size: int,
+        max_wait: float,
+    ):
+        self.backend = backend
+        self.user_rate = user_rate_per_minute / 60
+        self.user_burst = max(1, user_burst)
+        self.global_rate = global_rate_per_minute / 60
+        self.global_burst = max(1, global_burst)
+        self.queue_size = max(0, queue_size)
+        self.max_wait = max_wait
+        self._waiters: List[_Waiter] = []  # sorted, most urgent first
+        self._seq = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        # Counters exposed through stats()
+        self.admitted = {priority: 0 for priority in PRIORITIES}
+        self.rejected = {reason: 0 for reason in ("user", "global", "queue_full", "displaced", "timeout")}
+        self.queued = 0
+        self.dequeued = 0  # queued requests that were admitted
+        self.refunded = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    async def start(self):
+        await self.backend.start()
+
+    async def close(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        for waiter in self._waiters:
+            if not waiter.future.done():
+                waiter.future.set_exception(AdmissionRejected("timeout", 1.0))
+        self._waiters.clear()
+        await self.backend.close()
+
+    async def admit(self, user_id: str, priority: str = "user"):
+        """
+        Wait until a request of ``user_id`` may call Gemini.
+
+        Raises AdmissionRejected when the user is over their rate, or when
+        the global bucket cannot admit the request within the wait budget.
+        """
+        user_key = f"user:{user_id}"
+        if self.user_rate:
+            wait = await self.backend.take(user_key, self.user_rate, self.user_burst)
+            if wait:
+                self.rejected["user"] += 1
+                raise AdmissionRejected("user", wait)
+        try:
+            if self.global_rate:
+                await self._admit_global(PRIORITIES[priority])
+        except BaseException:
+            # Not admitted (or the client went away): the user keeps their token
+            if self.user_rate:
+                await self.backend.refund(user_key, self.user_rate, self.user_burst)
+            raise
+        self.admitted[priority] += 1
+
+    async def refund(self, user_id: str):
+        """Give back the tokens of an admitted request that did not reach Gemini after all."""
+        if self.user_rate:
+            await self.backend.refund(f"user:{user_id}", self.user_rate, self.user_burst)
+        if self.global_rate:
+            await self.backend.refund(GLOBAL_BUCKET, self.global_rate, self.global_burst)
+        self.refunded += 1
+
+    async def _admit_global(self, rank: int):
+        # Arrivals only bypass the queue when nobody is waiting
+        if not self._waiters:
+            wait = await self.backend.take(GLOBAL_BUCKET, self.global_rate, self.global_burst)
+            if not wait:
+                return
+        else:
+            ahead = sum(1 for waiter in self._waiters if waiter.rank <= rank)
+            wait = (ahead + 1) / self.global_rate
+        if wait > self.max_wait:
+            self.rejected["global"] += 1
+            raise AdmissionRejected("global", wait)
+
+        if len(self._waiters) >= self.queue_size:
+            newest = self._waiters[-1] if self._waiters else None
+            if newest is None or newest.rank <= rank:
+                self.rejected["queue_full"] += 1
+                raise AdmissionRejected("queue_full", wait)
+            # Make room by turning away the newest waiter of the lowest class
+            self._waiters.pop()
+            self.rejected["displaced"] += 1
+            newest.future.set_exception(AdmissionRejected("displaced", wait))
+
+        waiter = _Waiter(rank, next(self._seq), asyncio.get_running_loop().create_future())
+        bisect.insort(self._waiters, waiter)
+        self.queued += 1
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter.future, self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected["timeout"] += 1
+            raise AdmissionRejected("timeout", (len(self._waiters) + 1) / self.global_rate)
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        waited = time.monotonic() - started
+        self.dequeued += 1
+        self.total_wait += waited
+        self.max_wait_seen = max(self.max_wait_seen, waited)
+
+    async def _dispatch(self):
+        """Hand global tokens to waiters, most urgent first, as they refill."""
+        try:
+            while self._waiters:
+                wait = await self.backend.take(GLOBAL_BUCKET, self.global_rate, self.global_burst)
+                if wait:
+                    await asyncio.sleep(wait)
+                    continue
+                while self._waiters:
+                    waiter = self._waiters.pop(0)
+                    if not waiter.future.done():
+                        waiter.future.set_result(None)
+                        break
+                else:
+                    # Every waiter left meanwhile
+                    await self.backend.refund(GLOBAL_BUCKET, self.global_rate, self.global_burst)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Gemini admission dispatch failed: {e}")
+            for waiter in self._waiters:
+                if not waiter.future.done():
+                    waiter.future.set_exception(AdmissionRejected("global", 1.0))
+            self._waiters.clear()
+        finally:
+            self._dispatcher = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Admissions per priority class, rejections per reason and queue waits."""
+        return {
+            "backend": self.backend.name,
+            **self.backend.stats(),
+            "user_rate_per_minute": self.user_rate * 60,
+            "global_rate_per_minute": self.global_rate * 60,
+            "queue_size": self.queue_size,
+            "waiting": len(self._waiters),
+            "queued": self.queued,
+            "admitted": dict(self.admitted),
+            "rejected": dict(self.rejected),
+            "refunded": self.refunded,
+            "avg_wait_ms": round(self.total_wait / self.dequeued * 1000, 2) if self.dequeued else 0.0,
+            "max_wait_ms": round(self.max_wait_seen * 1000, 2),
+        }
+
+
+# Global admission controller
+gemini_admission = GeminiAdmission(
+    create_limiter_backend(),
+    GEMINI_USER_RATE_PER_MINUTE,
+    GEMINI_USER_BURST,
+    GEMINI_GLOBAL_RATE_PER_MINUTE,
+    GEMINI_GLOBAL_BURST,
+    GEMINI_ADMISSION_QUEUE_SIZE,
+    GEMINI_ADMISSION_MAX_WAIT_SECONDS,
+)
@@ -0,0 +1,97 @@
+"""Bounded async execution pool for Gemini API calls.
+
+Every Gemini request goes through ``gemini_pool`` so that the event loop is
+never blocked, the number of in-flight calls is capped, and each call is
+subject to a deadline. Queue depth and wait times are tracked for metrics.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.config import GEMINI_MAX_CONCURRENCY, GEMINI_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class GeminiCallPool:
+    """Cap concurrent Gemini calls and enforce a per-call deadline."""
+
+    def __init__(self, max_concurrency: int, timeout: float):
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Counters exposed through stats()
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for a free slot in the pool and hold it for the block."""
+        start = time.monotonic()
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def run(self, call: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """
+        Run an async Gemini call inside the pool.
+
+        The deadline covers both the time spent queued and the call itself,
+        so a saturated pool cannot hold a request open indefinitely.
+        Raises asyncio.TimeoutError when the deadline is exceeded.
+        """
+        async def _run():
+            async with self.slot():
+                return await call()
+
+        try:
+            result = await asyncio.wait_for(_run(), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            logger.warning(f"Gemini call exceeded deadline of {timeout or self.timeout}s")
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+
+        self.completed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool load and wait times."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": round(self.total_wait / self.acquired * 1000, 2) if self.acquired else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+        }
+
+
+# Global pool instance
+gemini_pool = GeminiCallPool(GEMINI_MAX_CONCURRENCY, GEMINI_TIMEOUT_SECONDS)
@@ -1,9 +1,15 @@
 """Gemini API integration for generating debate arguments and summaries."""
+import asyncio
+import hashlib
 import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Awaitable
 import google.generativeai as genai
 from app.config import GOOGLE_API_KEY
+from app.services.gemini_pool import gemini_pool
+from app.services.debate_cache import debate_cache, normalize_topic
+from app.services.single_flight import SingleFlight
+from app.services.stream_parser import StreamingArgumentParser, ARGUMENT_KEYS
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +19,64 @@ if GOOGLE_API_KEY:
 # Using Gemini 2.5 Flash - free tier model
 MODEL_NAME = "gemini-2.5-flash"
 
+# Summaries returned when Gemini is unavailable; never used as a base for updates
+SUMMARY_PLACEHOLDER = "Summary: This debate presents multiple perspectives on the topic at hand."
+SUMMARY_UNAVAILABLE = "Summary unavailable."
+SUMMARY_FAILED = "Summary could not be generated."
+FALLBACK_SUMMARIES = {SUMMARY_PLACEHOLDER, SUMMARY_UNAVAILABLE, SUMMARY_FAILED}
+
+# Concurrent identical requests share a single Gemini call
+debate_flight = SingleFlight("generate_debate")
+summary_flight = SingleFlight("generate_summary")
+
+
+async def _generate_text(prompt: str) -> str:
+    """Run a prompt through the bounded Gemini pool using the SDK's async API."""
+    model = genai.GenerativeModel(MODEL_NAME)
+    response = await gemini_pool.run(lambda: model.generate_content_async(prompt))
+    return response.text
+
+
+async def _stream_text(prompt: str, on_chunk: Callable[[str], Awaitable[None]]) -> str:
+    """
+    Stream a prompt through the Gemini pool, passing each text chunk to on_chunk.
+
+    Only pulling chunks holds the pool slot and counts against the deadline;
+    on_chunk (storage writes, room broadcasts) runs outside it, fed through a
+    queue, so slow callbacks cannot starve the pool or time out the call.
+    """
+    model = genai.GenerativeModel(MODEL_NAME)
+    chunks: asyncio.Queue = asyncio.Queue()
+
+    async def _consume() -> str:
+        parts = []
+        response = await model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. the final finish-reason chunk)
+                continue
+            if text:
+                parts.append(text)
+                chunks.put_nowait(text)
+        return "".join(parts)
+
+    producer = asyncio.create_task(gemini_pool.run(_consume))
+    # Queued after every chunk, however the call ends
+    producer.add_done_callback(lambda _: chunks.put_nowait(None))
+    try:
+        while True:
+            text = await chunks.get()
+            if text is None:
+                break
+            await on_chunk(text)
+    except BaseException:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        raise
+    return await producer
+
 
 async def generate_debate(topic: str) -> Dict[str, List[str]]:
     """
@@ -23,14 +87,86 @@ async def generate_debate(topic: str) -> Dict[str, List[str]]:
             "for": ["argument1", "argument2", "argument3"],
             "against": ["argument1", "argument2", "argument3"]
         }
+    
+    Results are cached by normalized topic; placeholder fallbacks are never cached.
+    """
+    cached = debate_cache.get(topic)
+    if cached:
+        return cached
+    
+    return await debate_flight.do(normalize_topic(topic), lambda: _request_debate(topic))
+
+
+async def stream_debate(
+    topic: str,
+    on_argument: Callable[[str, str], Awaitable[None]],
+    on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> Dict[str, List[str]]:
     """
+    Generate debate arguments with a streaming response.
+    
+    on_argument("for" | "against", text) is awaited as soon as each argument
+    is complete in the stream; on_text receives raw partial text. Cache hits
+    and callers that joined another caller's in-flight request get every
+    argument replayed through on_argument once the result is known.
+    
+    Callbacks run inside the request shared with joined callers, so an error
+    they raise is held back and re-raised to this caller only once the
+    shared result is in; it never turns everyone's result into a fallback.
+    """
+    emitted = {key: 0 for key in ARGUMENT_KEYS}
+    failures: List[Exception] = []
+    
+    async def emit(key: str, content: str):
+        emitted[key] += 1
+        await on_argument(key, content)
+    
+    def isolated(callback: Callable[..., Awaitable[None]]) -> Callable[..., Awaitable[None]]:
+        async def call(*args: Any):
+            if failures:
+                return
+            try:
+                await callback(*args)
+            except Exception as e:
+                failures.append(e)
+        return call
+    
+    result = debate_cache.get(topic)
+    if not result:
+        result = await debate_flight.do(
+            normalize_topic(topic),
+            lambda: _request_debate(topic, isolated(emit), isolated(on_text) if on_text else None),
+        )
+        if failures:
+            raise failures[0]
+    
+    for key in ARGUMENT_KEYS:
+        for content in result.get(key, [])[emitted[key]:]:
+            await emit(key, content)
+    
+    return result
+
+
+async def _request_debate(
+    topic: str,
+    on_argument: Optional[Callable[[str, str], Awaitable[None]]] = None,
+    on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> Dict[str, List[str]]:
+    """Call Gemini for debate arguments, falling back to placeholders on failure."""
     if not GOOGLE_API_KEY:
         logger.warning("GOOGLE_API_KEY not set, returning placeholder arguments")
         return _get_placeholder_arguments(topic)
     
+    parser = StreamingArgumentParser()
+    
+    async def on_chunk(text: str):
+        if on_text:
+            await on_text(text)
+        for key, content in parser.feed(text):
+            if on_argument:
+                await on_argument(key, content)
+    
     try:
-        model = genai.GenerativeModel(MODEL_NAME)
-        
         prompt = f"""Generate a structured debate on: "{topic}"
 
 Return ONLY valid JSON in this exact format (no markdown, no code blocks):
@@ -41,8 +177,10 @@ Return ONLY valid JSON in this exact format (no markdown, no code blocks):
 
 Make arguments concise, distinct, and logical."""
         
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        if on_argument or on_text:
+            response_text = (await _stream_text(prompt, on_chunk)).strip()
+        else:
+            response_text = (await _generate_text(prompt)).strip()
         
         # Remove markdown code blocks if present
         if response_text.startswith("```"):
@@ -57,57 +195,195 @@ Make arguments concise, distinct, and logical."""
         # Validate structure
         if not isinstance(result, dict) or "for" not in result or "against" not in result:
             logger.error(f"Invalid response structure: {result}")
-            return _get_placeholder_arguments(topic)
+            return _get_fallback_arguments(topic, parser)
         
         # Ensure lists are strings
         result["for"] = [str(arg) for arg in result["for"]]
         result["against"] = [str(arg) for arg in result["against"]]
         
+        debate_cache.put(topic, result)
         return result
     
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse Gemini response as JSON: {e}")
-        return _get_placeholder_arguments(topic)
+        return _get_fallback_arguments(topic, parser)
+    except asyncio.TimeoutError:
+        logger.error("Gemini debate generation timed out")
+        return _get_fallback_arguments(topic, parser)
     except Exception as e:
         logger.error(f"Error calling Gemini API: {e}")
-        return _get_placeholder_arguments(topic)
+        return _get_fallback_arguments(topic, parser)
 
 
-async def generate_summary(arguments: List[str]) -> str:
+async def generate_summary(arguments: List[str], previous_summary: Optional[str] = None) -> str:
     """
     Generate a neutral summary of debate arguments using Gemini 2.5 Flash.
     
     Args:
         arguments: List of argument strings
+        previous_summary: Existing summary to update; when given, ``arguments``
+            only needs to contain the arguments added since it was written
     
     Returns:
         Summary string
     """
+    key = _summary_key(arguments, previous_summary)
+    return await summary_flight.do(key, lambda: _request_summary(arguments, previous_summary=previous_summary))
+
+
+async def stream_summary(
+    arguments: List[str],
+    on_text: Callable[[str], Awaitable[None]],
+    previous_summary: Optional[str] = None,
+) -> str:
+    """
+    Generate a summary with a streaming response, awaiting on_text per chunk.
+    
+    Callers that joined another caller's in-flight request only receive the
+    final summary.
+    """
+    key = _summary_key(arguments, previous_summary)
+    return await summary_flight.do(key, lambda: _request_summary(arguments, on_text, previous_summary))
+
+
+def is_fallback_summary(summary: Optional[str]) -> bool:
+    """True when a summary is a placeholder rather than a Gemini result."""
+    return not summary or summary in FALLBACK_SUMMARIES
+
+
+def _summary_key(arguments: List[str], previous_summary: Optional[str]) -> str:
+    digest = hashlib.sha256((previous_summary or "").encode("utf-8"))
+    digest.update(b"\0")
+    digest.update("\n".join(arguments).encode("utf-8"))
+    return digest.hexdigest()
+
+
+async def _request_summary(
+    arguments: List[str],
+    on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+    previous_summary: Optional[str] = None,
+) -> str:
+    """Call Gemini for a summary, falling back to a placeholder on failure."""
     if not GOOGLE_API_KEY:
         logger.warning("GOOGLE_API_KEY not set, returning placeholder summary")
-        return "Summary: This debate presents multiple perspectives on the topic at hand."
+        return SUMMARY_PLACEHOLDER
     
     try:
         if not arguments:
-            return "No arguments provided for summary."
-        
-        model = genai.GenerativeModel(MODEL_NAME)
+            return previous_summary or "No arguments provided for summary."
         
         args_text = "\n".join([f"- {arg}" for arg in arguments])
-        prompt = f"""Summarize the following debate arguments in a neutral, concise manner (2-3 sentences):
+        if previous_summary:
+            prompt = f"""Here is the current neutral summary of a debate:
+
+{previous_summary}
+
+Update it to account for these newly added arguments, keeping it neutral and concise (2-3 sentences):
+
+{args_text}
+
+Provide only the updated summary, no additional text."""
+        else:
+            prompt = f"""Summarize the following debate arguments in a neutral, concise manner (2-3 sentences):
 
 {args_text}
 
 Provide only the summary, no additional text."""
         
-        response = model.generate_content(prompt)
-        summary = response.text.strip()
+        if on_text:
+            summary = (await _stream_text(prompt, on_text)).strip()
+        else:
+            summary = (await _generate_text(prompt)).strip()
         
-        return summary if summary else "Summary unavailable."
+        return summary if summary else SUMMARY_UNAVAILABLE
     
+    except asyncio.TimeoutError:
+        logger.error("Gemini summary generation timed out")
+        return SUMMARY_FAILED
     except Exception as e:
         logger.error(f"Error generating summary: {e}")
-        return "Summary could not be generated."
+        return SUMMARY_FAILED
+
+
+async def summarize_chunk(texts: List[str], label: str) -> Optional[str]:
+    """
+    Summarize one chunk of a large debate (map/intermediate reduce step).
+    
+    Args:
+        texts: Argument or partial-summary strings in the chunk
+        label: What the texts are, e.g. "arguments supporting the topic"
+    
+    Returns:
+        Summary string, or None when Gemini is unavailable or fails
+    """
+    if not GOOGLE_API_KEY or not texts:
+        return None
+    
+    try:
+        chunk_text = "\n".join([f"- {text}" for text in texts])
+        prompt = f"""Summarize the following {label} in a neutral, concise manner (3-4 sentences), keeping every distinct key point:
+
+{chunk_text}
+
+Provide only the summary, no additional text."""
+        
+        summary = (await _generate_text(prompt)).strip()
+        return summary or None
+    
+    except Exception as e:
+        logger.error(f"Error summarizing debate chunk: {e}")
+        return None
+
+
+async def merge_summaries(
+    partials: List[str],
+    on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> str:
+    """
+    Merge partial summaries of a large debate into the final summary.
+    
+    Args:
+        partials: Partial summaries, each prefixed with the side it covers
+        on_text: Optional callback receiving streamed partial text
+    
+    Returns:
+        Summary string
+    """
+    if not GOOGLE_API_KEY:
+        logger.warning("GOOGLE_API_KEY not set, returning placeholder summary")
+        return SUMMARY_PLACEHOLDER
+    
+    if not partials:
+        return SUMMARY_FAILED
+    
+    try:
+        partials_text = "\n".join([f"- {partial}" for partial in partials])
+        prompt = f"""Combine the following partial summaries of one debate into a single neutral, concise summary (2-3 sentences):
+
+{partials_text}
+
+Provide only the summary, no additional text."""
+        
+        if on_text:
+            summary = (await _stream_text(prompt, on_text)).strip()
+        else:
+            summary = (await _generate_text(prompt)).strip()
+        
+        return summary if summary else SUMMARY_UNAVAILABLE
+    
+    except asyncio.TimeoutError:
+        logger.error("Gemini summary merge timed out")
+        return SUMMARY_FAILED
+    except Exception as e:
+        logger.error(f"Error merging summaries: {e}")
+        return SUMMARY_FAILED
+
+
+def _get_fallback_arguments(topic: str, parser: StreamingArgumentParser) -> Dict[str, List[str]]:
+    """Keep arguments already streamed before a failure, otherwise use placeholders."""
+    if any(parser.arguments.values()):
+        return {key: list(parser.arguments[key]) for key in ARGUMENT_KEYS}
+    return _get_placeholder_arguments(topic)
 
 
 def _get_placeholder_arguments(topic: str) -> Dict[str, List[str]]:
@@ -0,0 +1,127 @@
+"""Debate argument generation, inline or through a background worker pool.
+
+In background mode ``POST /debates`` returns immediately with a
+``generating`` debate; a worker then fills in the FOR/AGAINST arguments and
+publishes each one to the debate's WebSocket room as it lands (streamed from
+Gemini when GEMINI_STREAMING is enabled).
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from app.config import (
+    DEBATE_GENERATION_WORKERS,
+    DEBATE_GENERATION_QUEUE_SIZE,
+    GEMINI_STREAMING,
+    GEMINI_STREAM_PARTIAL_TEXT,
+)
+from app.services.gemini_service import generate_debate, stream_debate
+from app.services.storage_backend import get_storage
+from app.services.debate_events import debate_events
+from app.services.response_cache import response_cache
+from app.websocket import manager
+
+logger = logging.getLogger(__name__)
+
+
+async def populate_debate_arguments(debate_id: str, topic: str) -> List[Dict[str, Any]]:
+    """Generate arguments for a debate, store them and broadcast each to the room.
+
+    With GEMINI_STREAMING each argument is stored and broadcast as soon as it
+    is complete in the Gemini stream rather than after the full response.
+    """
+    added = []
+
+    async def on_argument(key: str, content: str):
+        argument = await get_storage().add_argument_to_debate(
+            debate_id=debate_id,
+            side=key.upper(),
+            content=content,
+            created_by=None,  # AI-generated
+        )
+        if not argument:
+            # Debate was deleted while generating
+            return
+        added.append(argument)
+        response_cache.invalidate_debate(debate_id)
+        await debate_events.publish(debate_id, "argument_added", argument=argument)
+
+    async def on_text(text: str):
+        await manager.broadcast(debate_id, {"type": "generation_delta", "text": text})
+
+    if GEMINI_STREAMING:
+        await stream_debate(topic, on_argument, on_text if GEMINI_STREAM_PARTIAL_TEXT else None)
+        return added
+
+    generated = await generate_debate(topic)
+    for key in ("for", "against"):
+        for content in generated.get(key, []):
+            await on_argument(key, content)
+    return added
+
+
+class DebateGenerationWorkers:
+    """Fixed-size pool of tasks draining a bounded queue of generation jobs."""
+
+    def __init__(self, workers: int, queue_size: int):
+        self.worker_count = max(1, workers)
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self.completed = 0
+        self.failed = 0
+
+    async def start(self):
+        """Start worker tasks on the running event loop."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.worker_count)]
+        logger.info(f"Started {self.worker_count} debate generation workers")
+
+    async def stop(self):
+        """Cancel worker tasks; queued jobs are dropped."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def is_full(self) -> bool:
+        return self._queue is None or self._queue.full()
+
+    def submit(self, debate_id: str, topic: str):
+        """Queue a generation job. Raises asyncio.QueueFull when saturated."""
+        if self._queue is None:
+            raise asyncio.QueueFull()
+        self._queue.put_nowait((debate_id, topic))
+
+    async def _worker(self, index: int):
+        while True:
+            debate_id, topic = await self._queue.get()
+            try:
+                await populate_debate_arguments(debate_id, topic)
+                await get_storage().update_debate_status(debate_id, "ready")
+                response_cache.invalidate_debate(debate_id)
+                await debate_events.publish(debate_id, "debate_status", status="ready")
+                self.completed += 1
+            except Exception as e:
+                logger.error(f"Background generation failed for debate {debate_id}: {e}")
+                await get_storage().update_debate_status(debate_id, "failed")
+                response_cache.invalidate_debate(debate_id)
+                await debate_events.publish(debate_id, "debate_status", status="failed")
+                self.failed += 1
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        """Worker count, queue depth and job outcomes."""
+        return {
+            "workers": len(self._tasks),
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.queue_size,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+# Global worker pool instance
+generation_workers = DebateGenerationWorkers(DEBATE_GENERATION_WORKERS, DEBATE_GENERATION_QUEUE_SIZE)
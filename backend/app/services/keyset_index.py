@@ -0,0 +1,75 @@
+"""Append-ordered index for keyset (cursor) pagination.
+
+Keys get increasing sequence numbers as they are appended. Pages are read
+newest-first starting just below a sequence number, found by binary search,
+so a deep page costs the same as the first one. Removed keys leave a
+tombstone that is compacted away once tombstones make up half the index;
+sequence numbers never change, so outstanding cursors stay valid.
+"""
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+COMPACT_MIN_TOMBSTONES = 1024
+
+
+class KeysetIndex:
+    """Keys in insertion order with O(log n + page) newest-first paging."""
+
+    def __init__(self):
+        self._seqs: List[int] = []
+        self._keys: List[Optional[str]] = []
+        self._seq_of: Dict[str, int] = {}
+        self._next_seq = 1
+        self._tombstones = 0
+
+    def __len__(self) -> int:
+        return len(self._seq_of)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._seq_of
+
+    def append(self, key: str) -> int:
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seqs.append(seq)
+        self._keys.append(key)
+        self._seq_of[key] = seq
+        return seq
+
+    def remove(self, key: str):
+        seq = self._seq_of.pop(key, None)
+        if seq is None:
+            return
+        self._keys[bisect_left(self._seqs, seq)] = None
+        self._tombstones += 1
+        if self._tombstones >= COMPACT_MIN_TOMBSTONES and self._tombstones * 2 >= len(self._keys):
+            self._compact()
+
+    def page(self, limit: int, before: Optional[int] = None) -> Tuple[List[Tuple[int, str]], bool]:
+        """Up to limit (seq, key) pairs, newest first, with seq < before.
+
+        Returns the page and whether older keys remain.
+        """
+        index = len(self._seqs) if before is None else bisect_left(self._seqs, before)
+        page: List[Tuple[int, str]] = []
+        while index > 0:
+            index -= 1
+            key = self._keys[index]
+            if key is None:
+                continue
+            if len(page) == limit:
+                return page, True
+            page.append((self._seqs[index], key))
+        return page, False
+
+    def clear(self):
+        self._seqs.clear()
+        self._keys.clear()
+        self._seq_of.clear()
+        self._tombstones = 0
+
+    def _compact(self):
+        live = [(seq, key) for seq, key in zip(self._seqs, self._keys) if key is not None]
+        self._seqs = [seq for seq, _ in live]
+        self._keys = [key for _, key in live]
+        self._tombstones = 0
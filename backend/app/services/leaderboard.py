@@ -0,0 +1,76 @@
+"""Incrementally maintained integer rankings.
+
+Keys are grouped into buckets by score, with the distinct scores kept
+sorted. Votes and argument counts change by one at a time, so an update is
+a bucket move and the sorted score list stays short (distinct scores grow
+with the square root of the total). Reading the leader or the top N never
+scans all keys.
+"""
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+
+class Leaderboard:
+    """Scores per key with O(1) updates and cheap top-N reads."""
+
+    def __init__(self):
+        self._scores: Dict[str, int] = {}
+        # score -> keys with that score (dict as an insertion-ordered set)
+        self._buckets: Dict[int, Dict[str, None]] = {}
+        self._sorted_scores: List[int] = []
+
+    def increment(self, key: str, delta: int = 1):
+        """Add delta to a key's score; keys dropping to zero are forgotten."""
+        old = self._scores.get(key, 0)
+        new = old + delta
+        if old:
+            self._unlink(key, old)
+        if new > 0:
+            self._scores[key] = new
+            self._link(key, new)
+        else:
+            self._scores.pop(key, None)
+
+    def remove(self, key: str):
+        """Drop a key from the ranking."""
+        old = self._scores.pop(key, 0)
+        if old:
+            self._unlink(key, old)
+
+    def score(self, key: str) -> int:
+        return self._scores.get(key, 0)
+
+    def leader(self) -> Optional[str]:
+        """Key with the highest score (earliest to reach it on ties), or None."""
+        if not self._sorted_scores:
+            return None
+        return next(iter(self._buckets[self._sorted_scores[-1]]))
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        """Up to n (key, score) pairs, highest score first."""
+        result: List[Tuple[str, int]] = []
+        for score in reversed(self._sorted_scores):
+            for key in self._buckets[score]:
+                result.append((key, score))
+                if len(result) >= n:
+                    return result
+        return result
+
+    def clear(self):
+        self._scores.clear()
+        self._buckets.clear()
+        self._sorted_scores.clear()
+
+    def _link(self, key: str, score: int):
+        bucket = self._buckets.get(score)
+        if bucket is None:
+            bucket = self._buckets[score] = {}
+            insort(self._sorted_scores, score)
+        bucket[key] = None
+
+    def _unlink(self, key: str, score: int):
+        bucket = self._buckets[score]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[score]
+            del self._sorted_scores[bisect_left(self._sorted_scores, score)]
@@ -0,0 +1,506 @@
+"""MongoDB storage engine built on the shared Motor client.
+
+Async counterpart of ``storage_service`` with the same function names and
+record shapes. Arguments live in their own collection, keyed by id, with a
+per-debate ``seq`` and indexes matching each listing order, so argument pages
+are keyset range scans. Votes live in their own collection with a unique
+(argumentId, userId) index, and vote counters are updated with atomic
+``$inc``. Call ``ensure_indexes()`` once at startup; it also moves arguments
+out of debates written by earlier versions, which embedded them.
+
+Each debate document carries a ``revision`` bumped in the same update as the
+change; collection revisions and the revision epoch live in ``revisions``.
+
+Any Motor-compatible database handle can be injected with ``use_database``
+(e.g. an in-process stand-in for tests and benchmarks).
+"""
+from uuid import uuid4
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING, ReplaceOne, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app import database
+from app.utils.pagination import encode_cursor, decode_cursor, ARGUMENT_CURSOR_TYPES
+
+_db = None
+
+# Internal fields never returned to callers
+_HIDDEN_FIELDS = ("_id", "emailLower", "totalVotes", "argumentCount", "hasSummary", "revision", "debateId", "seq")
+
+
+def use_database(db):
+    """Use a specific database handle instead of the app's Motor client."""
+    global _db
+    _db = db
+
+
+def _get_db():
+    db = _db if _db is not None else database.get_database()
+    if db is None:
+        raise RuntimeError("MongoDB is not connected")
+    return db
+
+
+def _out(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Convert a stored document to the storage_service record shape."""
+    if doc is None:
+        return None
+    record = {"id": doc["_id"]}
+    record.update({k: v for k, v in doc.items() if k not in _HIDDEN_FIELDS})
+    return record
+
+
+async def ensure_indexes():
+    """Create the indexes every lookup and listing relies on."""
+    db = _get_db()
+    await db.users.create_index("emailLower", unique=True)
+    await db.users.create_index([("argumentCount", DESCENDING), ("createdAt", ASCENDING)])
+    await db.debates.create_index([("createdAt", ASCENDING), ("_id", ASCENDING)])
+    await db.debates.create_index([("totalVotes", DESCENDING), ("createdAt", ASCENDING)])
+    await db.arguments.create_index([("debateId", ASCENDING), ("seq", ASCENDING)])
+    await db.arguments.create_index([("debateId", ASCENDING), ("side", ASCENDING), ("seq", ASCENDING)])
+    await db.arguments.create_index([("debateId", ASCENDING), ("votes", DESCENDING), ("seq", ASCENDING)])
+    await db.arguments.create_index(
+        [("debateId", ASCENDING), ("side", ASCENDING), ("votes", DESCENDING), ("seq", ASCENDING)]
+    )
+    await db.topics.create_index("createdAt")
+    await db.votes.create_index([("argumentId", ASCENDING), ("userId", ASCENDING)], unique=True)
+    await db.votes.create_index("debateId")
+    await _migrate_embedded_arguments()
+
+
+async def _migrate_embedded_arguments():
+    """Move arguments embedded in debate documents into the arguments collection.
+
+    Upserts by argument id, so a migration interrupted part way is finished
+    by the next startup.
+    """
+    db = _get_db()
+    async for debate in db.debates.find({"arguments": {"$exists": True}}, {"arguments": 1}):
+        arguments = debate["arguments"]
+        if arguments:
+            await db.arguments.bulk_write([
+                ReplaceOne({"_id": arg["id"]}, _argument_doc(debate["_id"], seq, arg), upsert=True)
+                for seq, arg in enumerate(arguments, start=1)
+            ])
+        await db.debates.update_one(
+            {"_id": debate["_id"]},
+            {"$unset": {"arguments": ""}, "$set": {"argumentCount": len(arguments)}},
+        )
+
+
+def _argument_doc(debate_id: str, seq: int, argument: Dict[str, Any]) -> Dict[str, Any]:
+    doc = {"_id": argument["id"], "debateId": debate_id, "seq": seq}
+    doc.update({k: v for k, v in argument.items() if k != "id"})
+    return doc
+
+
+async def _with_arguments(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Debate record with its arguments in creation order."""
+    if doc is None:
+        return None
+    debate = _out(doc)
+    cursor = _get_db().arguments.find({"debateId": doc["_id"]}).sort("seq", ASCENDING)
+    debate["arguments"] = [_out(arg) async for arg in cursor]
+    return debate
+
+
+async def _bump_collection(name: str):
+    await _get_db().revisions.update_one({"_id": name}, {"$inc": {"revision": 1}}, upsert=True)
+
+
+# ============================================================================
+# USER OPERATIONS
+# ============================================================================
+
+async def create_user(email: str, hashed_password: str, name: Optional[str] = None, role: str = "user") -> Dict[str, Any]:
+    """Create and store a new user. Raises DuplicateKeyError if the email exists."""
+    user = {
+        "_id": str(uuid4()),
+        "email": email,
+        "emailLower": email.lower(),
+        "hashed_password": hashed_password,
+        "name": name or email.split("@")[0],
+        "role": role,
+        "argumentCount": 0,
+        "createdAt": datetime.utcnow().isoformat(),
+    }
+    await _get_db().users.insert_one(user)
+    return _out(user)
+
+
+async def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
+    """Retrieve user by email (case-insensitive)."""
+    return _out(await _get_db().users.find_one({"emailLower": email.lower()}))
+
+
+async def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
+    """Retrieve user by ID."""
+    return _out(await _get_db().users.find_one({"_id": user_id}))
+
+
+async def get_all_users() -> List[Dict[str, Any]]:
+    """Get all users."""
+    cursor = _get_db().users.find().sort("createdAt", ASCENDING)
+    return [_out(doc) async for doc in cursor]
+
+
+async def update_user_password(user_id: str, hashed_password: str) -> bool:
+    """Replace a user's password hash."""
+    result = await _get_db().users.update_one({"_id": user_id}, {"$set": {"hashed_password": hashed_password}})
+    return result.matched_count > 0
+
+
+# ============================================================================
+# TOPIC OPERATIONS
+# ============================================================================
+
+async def create_topic(title: str, description: Optional[str] = None) -> Dict[str, Any]:
+    """Create a new debate topic."""
+    topic = {
+        "_id": str(uuid4()),
+        "title": title,
+        "description": description or "",
+        "createdAt": datetime.utcnow().isoformat(),
+    }
+    await _get_db().topics.insert_one(topic)
+    await _bump_collection("topics")
+    return _out(topic)
+
+
+async def get_topic_by_id(topic_id: str) -> Optional[Dict[str, Any]]:
+    """Retrieve topic by ID."""
+    return _out(await _get_db().topics.find_one({"_id": topic_id}))
+
+
+async def get_all_topics() -> List[Dict[str, Any]]:
+    """Get all topics."""
+    cursor = _get_db().topics.find().sort("createdAt", ASCENDING)
+    return [_out(doc) async for doc in cursor]
+
+
+async def delete_topic(topic_id: str) -> bool:
+    """Delete a topic by ID."""
+    result = await _get_db().topics.delete_one({"_id": topic_id})
+    if result.deleted_count == 0:
+        return False
+    await _bump_collection("topics")
+    return True
+
+
+# ============================================================================
+# DEBATE OPERATIONS
+# ============================================================================
+
+async def create_debate(topic: str, created_by: str, status: str = "ready") -> Dict[str, Any]:
+    """Create a new debate with AI-generated arguments."""
+    debate = {
+        "_id": str(uuid4()),
+        "topic": topic,
+        "createdBy": created_by,
+        "summary": None,
+        "status": status,
+        "totalVotes": 0,
+        "argumentCount": 0,
+        "hasSummary": False,
+        "revision": 1,
+        "createdAt": datetime.utcnow().isoformat(),
+    }
+    await _get_db().debates.insert_one(debate)
+    await _bump_collection("debates")
+    return {**_out(debate), "arguments": []}
+
+
+async def get_debate_by_id(debate_id: str) -> Optional[Dict[str, Any]]:
+    """Retrieve debate by ID."""
+    return await _with_arguments(await _get_db().debates.find_one({"_id": debate_id}))
+
+
+async def delete_debate(debate_id: str) -> bool:
+    """Delete a debate by ID, along with its votes and activity counts."""
+    db = _get_db()
+    debate = await db.debates.find_one_and_delete({"_id": debate_id}, {"_id": 1})
+    if not debate:
+        return False
+    await _bump_collection("debates")
+    await db.votes.delete_many({"debateId": debate_id})
+
+    activity = db.arguments.aggregate([
+        {"$match": {"debateId": debate_id, "createdBy": {"$ne": None}}},
+        {"$group": {"_id": "$createdBy", "count": {"$sum": 1}}},
+    ])
+    async for row in activity:
+        await db.users.update_one({"_id": row["_id"]}, {"$inc": {"argumentCount": -row["count"]}})
+    await db.arguments.delete_many({"debateId": debate_id})
+    return True
+
+
+async def get_all_debates() -> List[Dict[str, Any]]:
+    """Get all debates."""
+    db = _get_db()
+    arguments: Dict[str, List[Dict[str, Any]]] = {}
+    async for arg in db.arguments.find().sort([("debateId", ASCENDING), ("seq", ASCENDING)]):
+        arguments.setdefault(arg["debateId"], []).append(_out(arg))
+    cursor = db.debates.find().sort([("createdAt", ASCENDING), ("_id", ASCENDING)])
+    return [{**_out(doc), "arguments": arguments.get(doc["_id"], [])} async for doc in cursor]
+
+
+async def list_debates_page(limit: int = 10, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Newest-first page of debate listing projections (keyset on createdAt, _id).
+
+    Raises ValueError for a malformed cursor.
+    """
+    query: Dict[str, Any] = {}
+    if cursor:
+        created_at, debate_id = decode_cursor(cursor, str, str)
+        query = {"$or": [
+            {"createdAt": {"$lt": created_at}},
+            {"createdAt": created_at, "_id": {"$lt": debate_id}},
+        ]}
+    docs = (
+        _get_db().debates.find(query, {"topic": 1, "createdAt": 1, "argumentCount": 1, "totalVotes": 1, "hasSummary": 1})
+        .sort([("createdAt", DESCENDING), ("_id", DESCENDING)])
+        .limit(limit + 1)
+    )
+    page = [
+        {
+            "id": doc["_id"],
+            "topic": doc["topic"],
+            "createdAt": doc["createdAt"],
+            "argumentCount": doc.get("argumentCount", 0),
+            "totalVotes": doc.get("totalVotes", 0),
+            "hasSummary": doc.get("hasSummary", False),
+        }
+        async for doc in docs
+    ]
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1]["createdAt"], page[-1]["id"])
+    return {"debates": page, "nextCursor": next_cursor}
+
+
+async def add_argument_to_debate(
+    debate_id: str,
+    side: str,  # "FOR", "AGAINST", or "USER"
+    content: str,
+    created_by: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Add an argument to a debate."""
+    db = _get_db()
+    argument = {
+        "id": str(uuid4()),
+        "side": side,
+        "content": content,
+        "votes": 0,
+        "createdBy": created_by,
+        "createdAt": datetime.utcnow().isoformat(),
+    }
+    # Arguments are never removed one by one, so the new count is also the next seq
+    debate = await db.debates.find_one_and_update(
+        {"_id": debate_id},
+        {"$inc": {"argumentCount": 1, "revision": 1}},
+        projection={"argumentCount": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if debate is None:
+        return None
+    await db.arguments.insert_one(_argument_doc(debate_id, debate["argumentCount"], argument))
+    if await db.debates.count_documents({"_id": debate_id}, limit=1) == 0:
+        # Debate deleted in between: drop the orphaned argument
+        await db.arguments.delete_one({"_id": argument["id"]})
+        return None
+    await _bump_collection("debates")
+    if created_by:
+        await db.users.update_one({"_id": created_by}, {"$inc": {"argumentCount": 1}})
+    return argument
+
+
+async def get_debate_header(debate_id: str) -> Optional[Dict[str, Any]]:
+    """Debate fields without the arguments list, plus argumentCount."""
+    doc = await _get_db().debates.find_one({"_id": debate_id})
+    if not doc:
+        return None
+    header = _out(doc)
+    header["argumentCount"] = doc.get("argumentCount", 0)
+    return header
+
+
+async def list_arguments(
+    debate_id: str,
+    limit: int = 20,
+    sort: str = "recent",
+    side: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Page of a debate's arguments (keyset on seq, one index range scan); None if the debate does not exist.
+
+    Raises ValueError for a malformed cursor.
+    """
+    after = decode_cursor(cursor, *ARGUMENT_CURSOR_TYPES[sort]) if cursor else None
+    db = _get_db()
+    if await db.debates.count_documents({"_id": debate_id}, limit=1) == 0:
+        return None
+
+    query: Dict[str, Any] = {"debateId": debate_id}
+    if side:
+        query["side"] = side
+    if sort == "recent":
+        order = [("seq", DESCENDING)]
+        if after:
+            query["seq"] = {"$lt": after[0]}
+    else:
+        order = [("votes", DESCENDING), ("seq", ASCENDING)]
+        if after:
+            query["$or"] = [
+                {"votes": {"$lt": after[0]}},
+                {"votes": after[0], "seq": {"$gt": after[1]}},
+            ]
+    docs = [doc async for doc in db.arguments.find(query).sort(order).limit(limit + 1)]
+    next_cursor = None
+    if len(docs) > limit:
+        last = docs[limit - 1]
+        next_cursor = encode_cursor(last["seq"]) if sort == "recent" else encode_cursor(last["votes"], last["seq"])
+    return {"arguments": [_out(doc) for doc in docs[:limit]], "nextCursor": next_cursor}
+
+
+async def get_argument_by_id(debate_id: str, argument_id: str) -> Optional[Dict[str, Any]]:
+    """Get a specific argument from a debate."""
+    return _out(await _get_db().arguments.find_one({"_id": argument_id, "debateId": debate_id}))
+
+
+async def update_debate_status(debate_id: str, status: str) -> bool:
+    """Update debate generation status."""
+    result = await _get_db().debates.update_one(
+        {"_id": debate_id},
+        {"$set": {"status": status}, "$inc": {"revision": 1}},
+    )
+    if result.matched_count == 0:
+        return False
+    await _bump_collection("debates")
+    return True
+
+
+async def update_debate_summary(
+    debate_id: str,
+    summary: str,
+    fingerprint: Optional[str] = None,
+    argument_count: int = 0,
+) -> bool:
+    """Update debate summary and the fingerprint of the arguments it covers."""
+    result = await _get_db().debates.update_one(
+        {"_id": debate_id},
+        {"$set": {
+            "summary": summary,
+            "summaryFingerprint": fingerprint,
+            "summaryArgumentCount": argument_count,
+            "hasSummary": summary is not None,
+        }, "$inc": {"revision": 1}},
+    )
+    if result.matched_count == 0:
+        return False
+    await _bump_collection("debates")
+    return True
+
+
+# ============================================================================
+# VOTING OPERATIONS
+# ============================================================================
+
+async def add_vote(debate_id: str, argument_id: str, user_id: str) -> bool:
+    """Add a vote to an argument. Max one vote per user per argument."""
+    db = _get_db()
+    if not await get_argument_by_id(debate_id, argument_id):
+        return False
+
+    # The unique (argumentId, userId) index makes the duplicate check atomic
+    try:
+        await db.votes.insert_one({"argumentId": argument_id, "userId": user_id, "debateId": debate_id})
+    except DuplicateKeyError:
+        return False
+
+    result = await db.debates.update_one(
+        {"_id": debate_id},
+        {"$inc": {"totalVotes": 1, "revision": 1}},
+    )
+    if result.matched_count == 0:
+        # Debate deleted in between: drop the orphaned vote
+        await db.votes.delete_one({"argumentId": argument_id, "userId": user_id})
+        return False
+    await db.arguments.update_one({"_id": argument_id}, {"$inc": {"votes": 1}})
+    await _bump_collection("debates")
+    return True
+
+
+async def has_voted(argument_id: str, user_id: str) -> bool:
+    """Check if user has already voted on an argument."""
+    doc = await _get_db().votes.find_one({"argumentId": argument_id, "userId": user_id}, {"_id": 1})
+    return doc is not None
+
+
+async def get_debate_stats() -> Dict[str, Any]:
+    """Get statistics for analytics (served from indexed counters)."""
+    db = _get_db()
+    most_voted = await db.debates.find_one(
+        {"totalVotes": {"$gt": 0}},
+        sort=[("totalVotes", DESCENDING), ("createdAt", ASCENDING)],
+    )
+    most_active = await db.users.find_one(
+        {"argumentCount": {"$gt": 0}},
+        {"_id": 1},
+        sort=[("argumentCount", DESCENDING), ("createdAt", ASCENDING)],
+    )
+    return {
+        "total_users": await db.users.estimated_document_count(),
+        "total_debates": await db.debates.estimated_document_count(),
+        "most_voted_debate": await _with_arguments(most_voted),
+        "most_active_user_id": most_active["_id"] if most_active else None,
+    }
+
+
+async def get_leaderboards(limit: int = 10) -> Dict[str, Any]:
+    """Top debates by total votes and top users by arguments created."""
+    db = _get_db()
+    debates_cursor = (
+        db.debates.find({"totalVotes": {"$gt": 0}}, {"topic": 1, "totalVotes": 1})
+        .sort([("totalVotes", DESCENDING), ("createdAt", ASCENDING)])
+        .limit(limit)
+    )
+    users_cursor = (
+        db.users.find({"argumentCount": {"$gt": 0}}, {"name": 1, "argumentCount": 1})
+        .sort([("argumentCount", DESCENDING), ("createdAt", ASCENDING)])
+        .limit(limit)
+    )
+    return {
+        "most_voted_debates": [
+            {"id": doc["_id"], "topic": doc["topic"], "votes": doc["totalVotes"]}
+            async for doc in debates_cursor
+        ],
+        "most_active_users": [
+            {"id": doc["_id"], "name": doc.get("name"), "arguments": doc["argumentCount"]}
+            async for doc in users_cursor
+        ],
+    }
+
+
+# ============================================================================
+# REVISIONS
+# ============================================================================
+
+async def get_revision_epoch() -> str:
+    """Epoch of this database's revisions, created on first use."""
+    revisions = _get_db().revisions
+    await revisions.update_one({"_id": "epoch"}, {"$setOnInsert": {"value": uuid4().hex[:8]}}, upsert=True)
+    return (await revisions.find_one({"_id": "epoch"}))["value"]
+
+
+async def get_debate_revision(debate_id: str) -> Optional[int]:
+    """Revision of a debate; None if it does not exist."""
+    doc = await _get_db().debates.find_one({"_id": debate_id}, {"revision": 1})
+    return doc.get("revision", 0) if doc else None
+
+
+async def get_collection_revision(name: str) -> int:
+    """Revision of the "debates" or "topics" collection."""
+    doc = await _get_db().revisions.find_one({"_id": name})
+    return doc["revision"] if doc else 0
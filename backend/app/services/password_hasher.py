@@ -0,0 +1,107 @@
+"""bcrypt hashing on a dedicated thread pool with admission control.
+
+A bcrypt hash at cost 12 takes a few hundred milliseconds of CPU. Running it
+inside an async handler stalls every other request and WebSocket room on the
+worker, so ``password_hasher`` runs hashes on its own threads (bcrypt
+releases the GIL while hashing). At most PASSWORD_HASH_WORKERS hashes run at
+once and PASSWORD_HASH_QUEUE_SIZE more may wait; beyond that calls fail
+immediately with ``PasswordHasherBusy`` so a login burst is shed instead of
+queueing without bound.
+
+The cost factor is PASSWORD_HASH_ROUNDS. Hashes made with a different cost
+still verify, and ``needs_rehash`` tells the login path to upgrade them.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+import bcrypt
+from app.config import PASSWORD_HASH_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool and its queue are full."""
+
+
+class PasswordHasher:
+    """Run bcrypt hash/verify calls on a bounded thread pool."""
+
+    def __init__(self, rounds: int, workers: int, queue_size: int):
+        self.rounds = rounds
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+
+        # Counters exposed through stats()
+        self.pending = 0  # running + queued
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured cost."""
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return await self._submit(lambda: bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8"))
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Check a password against its hash."""
+        return await self._submit(lambda: bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8")))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether a hash was made with a cost other than the configured one."""
+        # $2b$<cost>$<salt+hash>
+        parts = hashed.split("$")
+        try:
+            return int(parts[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    async def _submit(self, fn: Callable[[], T]) -> T:
+        if self.pending >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+
+        submitted = time.monotonic()
+        started = submitted
+
+        def _timed():
+            nonlocal started
+            started = time.monotonic()
+            return fn()
+
+        self.pending += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, _timed)
+        finally:
+            self.pending -= 1
+
+        waited = started - submitted
+        self.completed += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.total_run += time.monotonic() - started
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool load, rejections and queue wait times."""
+        return {
+            "rounds": self.rounds,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "avg_wait_ms": round(self.total_wait / self.completed * 1000, 2) if self.completed else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+            "avg_hash_ms": round(self.total_run / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+
+# Global hasher instance
+password_hasher = PasswordHasher(PASSWORD_HASH_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE)
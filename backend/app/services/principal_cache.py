@@ -0,0 +1,110 @@
+"""Cache of verified bearer tokens and the users they resolve to.
+
+``get_current_user`` decodes an HS256 token and loads the user on every
+authenticated request; during a vote storm that is the same few hundred
+tokens over and over. A hit here skips both: the token maps straight to the
+resolved principal.
+
+An entry never outlives the token's ``exp`` claim, and is also dropped after
+AUTH_CACHE_TTL_SECONDS so changes made by another worker or process show up
+within that window. Changes made through this worker call
+``invalidate_user`` and take effect immediately. The cache is bounded with
+LRU eviction.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+from app.config import AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS
+
+# token -> (principal, expires at (epoch seconds))
+Entry = Tuple[Dict[str, Any], float]
+
+
+class PrincipalCache:
+    """LRU map of verified tokens to principals, bounded by token expiry and a TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+        # user id -> tokens cached for that user, for invalidation
+        self._tokens_by_user: Dict[str, Set[str]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the cached principal for a token, or None on miss/expiry."""
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        principal, expires_at = entry
+        if expires_at <= time.time():
+            self._discard(token)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return principal
+
+    def put(self, token: str, principal: Dict[str, Any], token_exp: Optional[float]):
+        """Cache a principal until the earlier of the token's exp and the TTL."""
+        expires_at = time.time() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        if token in self._entries:
+            self._discard(token)
+        self._entries[token] = (principal, expires_at)
+        self._tokens_by_user.setdefault(principal["id"], set()).add(token)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.evictions += 1
+
+    def invalidate_user(self, user_id: str):
+        """Drop every cached token of a user (deleted, role or password changed)."""
+        for token in self._tokens_by_user.pop(user_id, ()):
+            if self._entries.pop(token, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._tokens_by_user.clear()
+
+    def _discard(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_id = entry[0]["id"]
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counts and occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Global cache instance
+principal_cache = PrincipalCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
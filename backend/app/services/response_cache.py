@@ -0,0 +1,165 @@
+"""Cache of encoded JSON bodies for hot read endpoints.
+
+``GET /debates/{id}``, ``GET /debates`` and ``GET /topics`` validate their
+payload against the response models and JSON-encode it on every request. For
+a popular debate that dominates a worker's CPU. This cache keeps the encoded
+bytes instead: a miss builds the body once (through the response model, so
+the output is unchanged) and encodes it with orjson when installed; a hit is
+returned as a raw response without touching Pydantic.
+
+Entries belong to a group (``debate:<id>``, ``debates``, ``topics``) and
+writes invalidate whole groups. A build that overlaps an invalidation of its
+group is served but not stored. The routes put the storage revision in the
+variant, so writes made by other workers sharing a storage engine are picked
+up by the next request; entries also expire after RESPONSE_CACHE_TTL_SECONDS,
+and the cache is bounded by entry count and total bytes with LRU eviction.
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+from app.config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_MB, RESPONSE_CACHE_TTL_SECONDS
+
+try:
+    import orjson
+
+    def encode_json(payload: Any) -> bytes:
+        return orjson.dumps(payload)
+except ImportError:
+    def encode_json(payload: Any) -> bytes:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+DEBATE_LIST_GROUP = "debates"
+TOPICS_GROUP = "topics"
+
+Key = Tuple[str, Hashable]  # (group, variant)
+
+
+def debate_group(debate_id: str) -> str:
+    return f"debate:{debate_id}"
+
+
+class _Build:
+    """A body being built; marked stale when its group is invalidated meanwhile."""
+
+    __slots__ = ("stale",)
+
+    def __init__(self):
+        self.stale = False
+
+
+class ResponseCache:
+    """LRU cache of encoded response bodies, invalidated by group."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # (group, variant) -> (body, stored at)
+        self._entries: "OrderedDict[Key, Tuple[bytes, float]]" = OrderedDict()
+        self._keys_by_group: Dict[str, Set[Key]] = {}
+        # group -> builds in progress
+        self._building: Dict[str, List[_Build]] = {}
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get_or_build(
+        self,
+        group: str,
+        variant: Hashable,
+        build: Callable[[], Awaitable[Optional[Any]]],
+    ) -> Optional[bytes]:
+        """
+        Return the encoded body for (group, variant), building it on a miss.
+
+        ``build`` returns a JSON-ready payload, or None when there is nothing
+        to serve (not found); None is returned and nothing is cached.
+        """
+        key = (group, variant)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if time.monotonic() - entry[1] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self._discard(key)
+
+        self.misses += 1
+        pending = _Build()
+        self._building.setdefault(group, []).append(pending)
+        try:
+            payload = await build()
+        finally:
+            builds = self._building[group]
+            builds.remove(pending)
+            if not builds:
+                del self._building[group]
+        if payload is None:
+            return None
+
+        body = encode_json(payload)
+        if not pending.stale:
+            self._store(key, body)
+        return body
+
+    def invalidate(self, *groups: str):
+        """Drop every cached body of the given groups."""
+        for group in groups:
+            for pending in self._building.get(group, ()):
+                pending.stale = True
+            for key in self._keys_by_group.pop(group, ()):
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self.bytes -= len(entry[0])
+                    self.invalidations += 1
+
+    def invalidate_debate(self, debate_id: str):
+        """Drop a debate's bodies and the debate list pages that summarize it."""
+        self.invalidate(debate_group(debate_id), DEBATE_LIST_GROUP)
+
+    def _store(self, key: Key, body: bytes):
+        if self.max_bytes and len(body) > self.max_bytes:
+            return
+        self._discard(key)
+        self._entries[key] = (body, time.monotonic())
+        self._keys_by_group.setdefault(key[0], set()).add(key)
+        self.bytes += len(body)
+
+        while len(self._entries) > self.max_entries or (self.max_bytes and self.bytes > self.max_bytes):
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _discard(self, key: Key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= len(entry[0])
+        keys = self._keys_by_group.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_group[key[0]]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counts and occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Global cache instance
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_MB * 1024 * 1024, RESPONSE_CACHE_TTL_SECONDS)
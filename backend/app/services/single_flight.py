@@ -0,0 +1,47 @@
+"""In-process single-flight deduplication of concurrent identical async calls.
+
+Concurrent callers using the same key share one in-flight task and all
+receive its result (or its exception). The shared task is shielded, so a
+caller that disconnects or is cancelled does not cancel the call for the
+others; once it finishes the key is released and the next call starts fresh.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[str, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``call`` once per key among concurrent callers and return its result."""
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, k=key: self._release(k, t))
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(task)
+
+    def _release(self, key: str, task: "asyncio.Task[Any]"):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved when every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Call counts and how many were served by an already in-flight call."""
+        return {
+            "in_flight": len(self._in_flight),
+            "calls": self.calls,
+            "shared": self.shared,
+        }
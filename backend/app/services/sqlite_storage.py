@@ -0,0 +1,608 @@
+"""Embedded SQLite storage engine shared by every uvicorn worker on a host.
+
+The database runs in WAL mode, so readers in one worker never block on a
+writer in another. Each worker owns a single connection that lives on a
+dedicated one-thread executor; every query is dispatched there, so the event
+loop never blocks on disk I/O. Statements are constant parameterized SQL and
+are reused from sqlite3's prepared-statement cache.
+
+Debate rows carry a ``revision`` bumped in the same transaction as each
+change; collection revisions live in ``revisions``, whose "epoch" row holds
+a random id picked when the database is created.
+"""
+import asyncio
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+from app.config import SQLITE_PATH
+from app.services.storage_backend import StorageBackend, EmailAlreadyRegistered
+from app.utils.pagination import encode_cursor, decode_cursor, ARGUMENT_CURSOR_TYPES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    email_lower TEXT NOT NULL UNIQUE,
+    hashed_password TEXT NOT NULL,
+    name TEXT,
+    role TEXT NOT NULL,
+    argument_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_activity ON users (argument_count DESC) WHERE argument_count > 0;
+
+CREATE TABLE IF NOT EXISTS topics (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS debates (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    topic TEXT NOT NULL,
+    created_by TEXT,
+    summary TEXT,
+    summary_fingerprint TEXT,
+    summary_argument_count INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    total_votes INTEGER NOT NULL DEFAULT 0,
+    argument_count INTEGER NOT NULL DEFAULT 0,
+    revision INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS debates_votes ON debates (total_votes DESC) WHERE total_votes > 0;
+
+CREATE TABLE IF NOT EXISTS arguments (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    debate_id TEXT NOT NULL,
+    side TEXT NOT NULL,
+    content TEXT NOT NULL,
+    votes INTEGER NOT NULL DEFAULT 0,
+    created_by TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS arguments_key ON arguments (debate_id, id);
+CREATE INDEX IF NOT EXISTS arguments_by_debate ON arguments (debate_id, seq);
+CREATE INDEX IF NOT EXISTS arguments_by_side ON arguments (debate_id, side, seq);
+CREATE INDEX IF NOT EXISTS arguments_by_votes ON arguments (debate_id, votes DESC, seq);
+CREATE INDEX IF NOT EXISTS arguments_by_side_votes ON arguments (debate_id, side, votes DESC, seq);
+
+CREATE TABLE IF NOT EXISTS votes (
+    argument_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    debate_id TEXT NOT NULL,
+    PRIMARY KEY (argument_id, user_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS votes_by_debate ON votes (debate_id);
+
+CREATE TABLE IF NOT EXISTS revisions (
+    name TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO revisions (name, revision) VALUES ('epoch', abs(random() % 4294967296));
+"""
+
+# Columns added after a table was first created: (table, column, definition, backfill)
+MIGRATIONS = [
+    (
+        "debates",
+        "argument_count",
+        "INTEGER NOT NULL DEFAULT 0",
+        "UPDATE debates SET argument_count = (SELECT COUNT(*) FROM arguments WHERE arguments.debate_id = debates.id)",
+    ),
+    ("debates", "revision", "INTEGER NOT NULL DEFAULT 1", None),
+]
+
+# Oldest SQLite library with every feature used here (upsert: 3.24)
+MIN_SQLITE_VERSION = (3, 24, 0)
+
+BUMP_COLLECTION = (
+    "INSERT INTO revisions (name, revision) VALUES (?, 1) "
+    "ON CONFLICT (name) DO UPDATE SET revision = revision + 1"
+)
+
+USER_COLUMNS = "id, email, hashed_password, name, role, created_at"
+DEBATE_COLUMNS = "id, topic, created_by, summary, summary_fingerprint, summary_argument_count, status, created_at"
+ARGUMENT_COLUMNS = "id, side, content, votes, created_by, created_at"
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def _user(row) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    return {
+        "id": row[0],
+        "email": row[1],
+        "hashed_password": row[2],
+        "name": row[3],
+        "role": row[4],
+        "createdAt": row[5],
+    }
+
+
+def _topic(row) -> Dict[str, Any]:
+    return {"id": row[0], "title": row[1], "description": row[2], "createdAt": row[3]}
+
+
+def _argument(row) -> Dict[str, Any]:
+    return {
+        "id": row[0],
+        "side": row[1],
+        "content": row[2],
+        "votes": row[3],
+        "createdBy": row[4],
+        "createdAt": row[5],
+    }
+
+
+def _debate(row, arguments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "id": row[0],
+        "topic": row[1],
+        "createdBy": row[2],
+        "arguments": arguments,
+        "summary": row[3],
+        "summaryFingerprint": row[4],
+        "summaryArgumentCount": row[5],
+        "status": row[6],
+        "createdAt": row[7],
+    }
+
+
+class SQLiteStorageBackend(StorageBackend):
+    """SQLite (WAL) engine: one connection per worker on a private thread."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = SQLITE_PATH):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._conn: Optional[sqlite3.Connection] = None
+        self.queries = 0
+
+    # ------------------------------------------------------------------
+    # Connection management
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        row = await self._run(lambda conn: conn.execute("SELECT revision FROM revisions WHERE name = 'epoch'").fetchone())
+        self.revision_epoch = format(row[0], "x")
+
+    async def close(self):
+        def _close():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        await asyncio.get_running_loop().run_in_executor(self._executor, _close)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "queries": self.queries}
+
+    def _connect(self) -> sqlite3.Connection:
+        if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+            raise RuntimeError(
+                f"The sqlite storage engine needs SQLite {'.'.join(map(str, MIN_SQLITE_VERSION))} or newer; "
+                f"this Python is linked against {sqlite3.sqlite_version}"
+            )
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit mode: multi-statement writes use explicit BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+        return conn
+
+    @classmethod
+    def _migrate(cls, conn: sqlite3.Connection):
+        """Apply missing MIGRATIONS; safe when several workers start at once."""
+        def _missing():
+            missing = []
+            for table, column, definition, backfill in MIGRATIONS:
+                columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                if column not in columns:
+                    missing.append((table, column, definition, backfill))
+            return missing
+
+        def _apply():
+            # Re-checked under the write lock: another worker may have migrated meanwhile
+            for table, column, definition, backfill in _missing():
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                if backfill:
+                    conn.execute(backfill)
+
+        if _missing():
+            cls._transaction(conn, _apply)
+
+    async def _run(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run fn(connection) on the worker's SQLite thread."""
+        def _call():
+            if self._conn is None:
+                self._conn = self._connect()
+            self.queries += 1
+            return fn(self._conn)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, _call)
+
+    @staticmethod
+    def _transaction(conn: sqlite3.Connection, fn: Callable[[], Any]) -> Any:
+        """Run fn inside BEGIN IMMEDIATE ... COMMIT, rolling back on error."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn()
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    # ------------------------------------------------------------------
+    # Users
+    # ------------------------------------------------------------------
+
+    async def create_user(self, email, hashed_password, name=None, role="user"):
+        user = {
+            "id": str(uuid4()),
+            "email": email,
+            "hashed_password": hashed_password,
+            "name": name or email.split("@")[0],
+            "role": role,
+            "createdAt": _now(),
+        }
+        try:
+            await self._run(lambda conn: conn.execute(
+                "INSERT INTO users (id, email, email_lower, hashed_password, name, role, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (user["id"], email, email.lower(), hashed_password, user["name"], role, user["createdAt"]),
+            ))
+        except sqlite3.IntegrityError:
+            # UNIQUE(email_lower)
+            raise EmailAlreadyRegistered(email)
+        return user
+
+    async def get_user_by_email(self, email):
+        return await self._run(lambda conn: _user(conn.execute(
+            f"SELECT {USER_COLUMNS} FROM users WHERE email_lower = ?", (email.lower(),)
+        ).fetchone()))
+
+    async def get_user_by_id(self, user_id):
+        return await self._run(lambda conn: _user(conn.execute(
+            f"SELECT {USER_COLUMNS} FROM users WHERE id = ?", (user_id,)
+        ).fetchone()))
+
+    async def get_all_users(self):
+        return await self._run(lambda conn: [
+            _user(row) for row in conn.execute(f"SELECT {USER_COLUMNS} FROM users ORDER BY rowid")
+        ])
+
+    async def update_user_password(self, user_id, hashed_password):
+        return await self._run(lambda conn: conn.execute(
+            "UPDATE users SET hashed_password = ? WHERE id = ?", (hashed_password, user_id)
+        ).rowcount > 0)
+
+    # ------------------------------------------------------------------
+    # Topics
+    # ------------------------------------------------------------------
+
+    async def create_topic(self, title, description=None):
+        topic = {"id": str(uuid4()), "title": title, "description": description or "", "createdAt": _now()}
+
+        def _create(conn):
+            def _tx():
+                conn.execute(
+                    "INSERT INTO topics (id, title, description, created_at) VALUES (?, ?, ?, ?)",
+                    (topic["id"], title, topic["description"], topic["createdAt"]),
+                )
+                conn.execute(BUMP_COLLECTION, ("topics",))
+            self._transaction(conn, _tx)
+        await self._run(_create)
+        return topic
+
+    async def get_topic_by_id(self, topic_id):
+        def _get(conn):
+            row = conn.execute("SELECT id, title, description, created_at FROM topics WHERE id = ?", (topic_id,)).fetchone()
+            return _topic(row) if row else None
+        return await self._run(_get)
+
+    async def get_all_topics(self):
+        return await self._run(lambda conn: [
+            _topic(row) for row in conn.execute("SELECT id, title, description, created_at FROM topics ORDER BY seq")
+        ])
+
+    async def delete_topic(self, topic_id):
+        def _delete(conn):
+            def _tx():
+                if conn.execute("DELETE FROM topics WHERE id = ?", (topic_id,)).rowcount == 0:
+                    return False
+                conn.execute(BUMP_COLLECTION, ("topics",))
+                return True
+            return self._transaction(conn, _tx)
+        return await self._run(_delete)
+
+    # ------------------------------------------------------------------
+    # Debates
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _load_debate(conn: sqlite3.Connection, row) -> Dict[str, Any]:
+        arguments = [
+            _argument(arg)
+            for arg in conn.execute(
+                f"SELECT {ARGUMENT_COLUMNS} FROM arguments WHERE debate_id = ? ORDER BY seq", (row[0],)
+            )
+        ]
+        return _debate(row, arguments)
+
+    async def create_debate(self, topic, created_by, status="ready"):
+        debate = {
+            "id": str(uuid4()),
+            "topic": topic,
+            "createdBy": created_by,
+            "arguments": [],
+            "summary": None,
+            "status": status,
+            "createdAt": _now(),
+        }
+
+        def _create(conn):
+            def _tx():
+                conn.execute(
+                    "INSERT INTO debates (id, topic, created_by, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (debate["id"], topic, created_by, status, debate["createdAt"]),
+                )
+                conn.execute(BUMP_COLLECTION, ("debates",))
+            self._transaction(conn, _tx)
+        await self._run(_create)
+        return debate
+
+    async def get_debate_by_id(self, debate_id):
+        def _get(conn):
+            row = conn.execute(f"SELECT {DEBATE_COLUMNS} FROM debates WHERE id = ?", (debate_id,)).fetchone()
+            return self._load_debate(conn, row) if row else None
+        return await self._run(_get)
+
+    async def delete_debate(self, debate_id):
+        def _delete(conn):
+            def _tx():
+                if conn.execute("DELETE FROM debates WHERE id = ?", (debate_id,)).rowcount == 0:
+                    return False
+                # Correlated subquery rather than UPDATE ... FROM, which needs SQLite 3.33
+                conn.execute(
+                    "UPDATE users SET argument_count = argument_count - "
+                    "  (SELECT COUNT(*) FROM arguments WHERE debate_id = ? AND created_by = users.id) "
+                    "WHERE id IN (SELECT created_by FROM arguments WHERE debate_id = ? AND created_by IS NOT NULL)",
+                    (debate_id, debate_id),
+                )
+                conn.execute("DELETE FROM votes WHERE debate_id = ?", (debate_id,))
+                conn.execute("DELETE FROM arguments WHERE debate_id = ?", (debate_id,))
+                conn.execute(BUMP_COLLECTION, ("debates",))
+                return True
+            return self._transaction(conn, _tx)
+        return await self._run(_delete)
+
+    async def get_all_debates(self):
+        def _all(conn):
+            rows = conn.execute(f"SELECT {DEBATE_COLUMNS} FROM debates ORDER BY seq").fetchall()
+            return [self._load_debate(conn, row) for row in rows]
+        return await self._run(_all)
+
+    async def list_debates_page(self, limit=10, cursor=None):
+        before = decode_cursor(cursor, int)[0] if cursor else None
+
+        def _page(conn):
+            # Keyset on the primary key: every page is one index range scan
+            rows = conn.execute(
+                "SELECT seq, id, topic, created_at, argument_count, total_votes, summary IS NOT NULL "
+                "FROM debates WHERE seq < ? ORDER BY seq DESC LIMIT ?",
+                (before if before is not None else 2 ** 62, limit + 1),
+            ).fetchall()
+            page = [
+                {
+                    "id": row[1],
+                    "topic": row[2],
+                    "createdAt": row[3],
+                    "argumentCount": row[4],
+                    "totalVotes": row[5],
+                    "hasSummary": bool(row[6]),
+                }
+                for row in rows[:limit]
+            ]
+            next_cursor = encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+            return {"debates": page, "nextCursor": next_cursor}
+        return await self._run(_page)
+
+    async def add_argument_to_debate(self, debate_id, side, content, created_by=None):
+        argument = {
+            "id": str(uuid4()),
+            "side": side,
+            "content": content,
+            "votes": 0,
+            "createdBy": created_by,
+            "createdAt": _now(),
+        }
+
+        def _add(conn):
+            def _tx():
+                if conn.execute("SELECT 1 FROM debates WHERE id = ?", (debate_id,)).fetchone() is None:
+                    return None
+                conn.execute(
+                    "INSERT INTO arguments (id, debate_id, side, content, created_by, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (argument["id"], debate_id, side, content, created_by, argument["createdAt"]),
+                )
+                conn.execute(
+                    "UPDATE debates SET argument_count = argument_count + 1, revision = revision + 1 WHERE id = ?",
+                    (debate_id,),
+                )
+                conn.execute(BUMP_COLLECTION, ("debates",))
+                if created_by:
+                    conn.execute("UPDATE users SET argument_count = argument_count + 1 WHERE id = ?", (created_by,))
+                return argument
+            return self._transaction(conn, _tx)
+        return await self._run(_add)
+
+    async def get_debate_header(self, debate_id):
+        def _get(conn):
+            row = conn.execute(
+                f"SELECT {DEBATE_COLUMNS}, argument_count FROM debates WHERE id = ?", (debate_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            header = _debate(row, [])
+            del header["arguments"]
+            header["argumentCount"] = row[8]
+            return header
+        return await self._run(_get)
+
+    async def list_arguments(self, debate_id, limit=20, sort="recent", side=None, cursor=None):
+        after = decode_cursor(cursor, *ARGUMENT_CURSOR_TYPES[sort]) if cursor else None
+        where, params = "debate_id = ?", [debate_id]
+        if side:
+            where += " AND side = ?"
+            params.append(side)
+        if sort == "recent":
+            order = "seq DESC"
+            if after:
+                where += " AND seq < ?"
+                params.append(after[0])
+        else:
+            order = "votes DESC, seq"
+            if after:
+                where += " AND (votes < ? OR (votes = ? AND seq > ?))"
+                params.extend([after[0], after[0], after[1]])
+
+        def _page(conn):
+            if conn.execute("SELECT 1 FROM debates WHERE id = ?", (debate_id,)).fetchone() is None:
+                return None
+            rows = conn.execute(
+                f"SELECT {ARGUMENT_COLUMNS}, seq FROM arguments WHERE {where} ORDER BY {order} LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+            next_cursor = None
+            if len(rows) > limit:
+                last = rows[limit - 1]
+                next_cursor = encode_cursor(last[6]) if sort == "recent" else encode_cursor(last[3], last[6])
+            return {"arguments": [_argument(row) for row in rows[:limit]], "nextCursor": next_cursor}
+        return await self._run(_page)
+
+    async def get_argument_by_id(self, debate_id, argument_id):
+        def _get(conn):
+            row = conn.execute(
+                f"SELECT {ARGUMENT_COLUMNS} FROM arguments WHERE debate_id = ? AND id = ?", (debate_id, argument_id)
+            ).fetchone()
+            return _argument(row) if row else None
+        return await self._run(_get)
+
+    async def _update_debate(self, sql: str, params: tuple) -> bool:
+        """Run a single-row debate UPDATE (which bumps its revision) and bump the collection."""
+        def _update(conn):
+            def _tx():
+                if conn.execute(sql, params).rowcount == 0:
+                    return False
+                conn.execute(BUMP_COLLECTION, ("debates",))
+                return True
+            return self._transaction(conn, _tx)
+        return await self._run(_update)
+
+    async def update_debate_status(self, debate_id, status):
+        return await self._update_debate(
+            "UPDATE debates SET status = ?, revision = revision + 1 WHERE id = ?", (status, debate_id)
+        )
+
+    async def update_debate_summary(self, debate_id, summary, fingerprint=None, argument_count=0):
+        return await self._update_debate(
+            "UPDATE debates SET summary = ?, summary_fingerprint = ?, summary_argument_count = ?, "
+            "revision = revision + 1 WHERE id = ?",
+            (summary, fingerprint, argument_count, debate_id),
+        )
+
+    # ------------------------------------------------------------------
+    # Votes and analytics
+    # ------------------------------------------------------------------
+
+    async def add_vote(self, debate_id, argument_id, user_id):
+        def _vote(conn):
+            def _tx():
+                # Primary key on (argument_id, user_id) makes check-and-set atomic
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO votes (argument_id, user_id, debate_id) "
+                    "SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM arguments WHERE debate_id = ? AND id = ?)",
+                    (argument_id, user_id, debate_id, debate_id, argument_id),
+                ).rowcount
+                if not inserted:
+                    return False
+                conn.execute("UPDATE arguments SET votes = votes + 1 WHERE debate_id = ? AND id = ?", (debate_id, argument_id))
+                conn.execute(
+                    "UPDATE debates SET total_votes = total_votes + 1, revision = revision + 1 WHERE id = ?",
+                    (debate_id,),
+                )
+                conn.execute(BUMP_COLLECTION, ("debates",))
+                return True
+            return self._transaction(conn, _tx)
+        return await self._run(_vote)
+
+    async def has_voted(self, argument_id, user_id):
+        return await self._run(lambda conn: conn.execute(
+            "SELECT 1 FROM votes WHERE argument_id = ? AND user_id = ?", (argument_id, user_id)
+        ).fetchone() is not None)
+
+    async def get_debate_stats(self):
+        def _stats(conn):
+            total_users = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+            total_debates = conn.execute("SELECT COUNT(*) FROM debates").fetchone()[0]
+            row = conn.execute(
+                f"SELECT {DEBATE_COLUMNS} FROM debates WHERE total_votes > 0 ORDER BY total_votes DESC, seq LIMIT 1"
+            ).fetchone()
+            active = conn.execute(
+                "SELECT id FROM users WHERE argument_count > 0 ORDER BY argument_count DESC, rowid LIMIT 1"
+            ).fetchone()
+            return {
+                "total_users": total_users,
+                "total_debates": total_debates,
+                "most_voted_debate": self._load_debate(conn, row) if row else None,
+                "most_active_user_id": active[0] if active else None,
+            }
+        return await self._run(_stats)
+
+    async def get_leaderboards(self, limit=10):
+        def _leaderboards(conn):
+            debates = conn.execute(
+                "SELECT id, topic, total_votes FROM debates WHERE total_votes > 0 ORDER BY total_votes DESC, seq LIMIT ?",
+                (limit,),
+            ).fetchall()
+            users = conn.execute(
+                "SELECT id, name, argument_count FROM users WHERE argument_count > 0 ORDER BY argument_count DESC, rowid LIMIT ?",
+                (limit,),
+            ).fetchall()
+            return {
+                "most_voted_debates": [{"id": r[0], "topic": r[1], "votes": r[2]} for r in debates],
+                "most_active_users": [{"id": r[0], "name": r[1], "arguments": r[2]} for r in users],
+            }
+        return await self._run(_leaderboards)
+
+
+    # ------------------------------------------------------------------
+    # Revisions
+    # ------------------------------------------------------------------
+
+    async def get_debate_revision(self, debate_id):
+        def _get(conn):
+            row = conn.execute("SELECT revision FROM debates WHERE id = ?", (debate_id,)).fetchone()
+            return row[0] if row else None
+        return await self._run(_get)
+
+    async def get_collection_revision(self, name):
+        def _get(conn):
+            row = conn.execute("SELECT revision FROM revisions WHERE name = ?", (name,)).fetchone()
+            return row[0] if row else 0
+        return await self._run(_get)
@@ -0,0 +1,393 @@
+"""Pluggable storage backends behind one async interface.
+
+Routes and services talk to ``get_storage()`` instead of a specific engine.
+The engine is chosen with STORAGE_BACKEND:
+
+- ``memory``: the per-process in-memory store (``storage_service``), made
+  durable with a snapshot + append-only log when STORAGE_JOURNAL_DIR is set
+- ``mongo``: MongoDB through the shared Motor client (``mongo_storage``)
+- ``sqlite``: an embedded SQLite database in WAL mode (``sqlite_storage``),
+  shared by every uvicorn worker on the host
+
+Every engine keeps a revision per debate and per collection ("debates",
+"topics") that its mutations bump. A revision is only meaningful together
+with the engine's ``revision_epoch``.
+"""
+from typing import Optional, List, Dict, Any
+from app.config import (
+    STORAGE_BACKEND,
+    STORAGE_JOURNAL_DIR,
+    STORAGE_JOURNAL_FSYNC,
+    STORAGE_JOURNAL_FLUSH_MS,
+    STORAGE_JOURNAL_SNAPSHOT_EVERY,
+)
+from pymongo.errors import DuplicateKeyError
+from app.services import storage_service, mongo_storage
+from app.services.storage_journal import StorageJournal
+
+
+class EmailAlreadyRegistered(Exception):
+    """Raised by create_user when another user has the same (case-insensitive) email."""
+
+
+class StorageBackend:
+    """Async storage API implemented by every engine."""
+
+    name = "base"
+    # Changes whenever revisions may have started over (fresh store or process)
+    revision_epoch = "0"
+
+    async def start(self):
+        """Prepare the engine (connections, schema, indexes)."""
+
+    async def close(self):
+        """Release engine resources."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Engine-specific runtime metrics."""
+        return {}
+
+    # Users
+    async def create_user(self, email: str, hashed_password: str, name: Optional[str] = None, role: str = "user") -> Dict[str, Any]:
+        """Store a new user; raises EmailAlreadyRegistered atomically with the insert."""
+        raise NotImplementedError
+
+    async def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def get_all_users(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def update_user_password(self, user_id: str, hashed_password: str) -> bool:
+        raise NotImplementedError
+
+    # Topics
+    async def create_topic(self, title: str, description: Optional[str] = None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def get_topic_by_id(self, topic_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def get_all_topics(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def delete_topic(self, topic_id: str) -> bool:
+        raise NotImplementedError
+
+    # Debates
+    async def create_debate(self, topic: str, created_by: str, status: str = "ready") -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def get_debate_by_id(self, debate_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def delete_debate(self, debate_id: str) -> bool:
+        raise NotImplementedError
+
+    async def get_all_debates(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def list_debates_page(self, limit: int = 10, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Newest-first listing projections; raises ValueError for a malformed cursor."""
+        raise NotImplementedError
+
+    async def add_argument_to_debate(self, debate_id: str, side: str, content: str, created_by: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def get_debate_header(self, debate_id: str) -> Optional[Dict[str, Any]]:
+        """Debate without its arguments list, plus argumentCount."""
+        raise NotImplementedError
+
+    async def list_arguments(self, debate_id: str, limit: int = 20, sort: str = "recent", side: Optional[str] = None, cursor: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Page of arguments ("recent" or "votes" order); raises ValueError for a malformed cursor."""
+        raise NotImplementedError
+
+    async def get_argument_by_id(self, debate_id: str, argument_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def update_debate_status(self, debate_id: str, status: str) -> bool:
+        raise NotImplementedError
+
+    async def update_debate_summary(self, debate_id: str, summary: str, fingerprint: Optional[str] = None, argument_count: int = 0) -> bool:
+        raise NotImplementedError
+
+    # Votes and analytics
+    async def add_vote(self, debate_id: str, argument_id: str, user_id: str) -> bool:
+        raise NotImplementedError
+
+    async def has_voted(self, argument_id: str, user_id: str) -> bool:
+        raise NotImplementedError
+
+    async def get_debate_stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def get_leaderboards(self, limit: int = 10) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    # Revisions
+    async def get_debate_revision(self, debate_id: str) -> Optional[int]:
+        """Revision of a debate, bumped by every change to it; None if it does not exist."""
+        raise NotImplementedError
+
+    async def get_collection_revision(self, name: str) -> int:
+        """Revision of the "debates" or "topics" collection, bumped by every change in it."""
+        raise NotImplementedError
+
+
+class MemoryStorageBackend(StorageBackend):
+    """In-process store; calls run inline on the loop.
+
+    Cold debates are first loaded on a worker thread, so the synchronous
+    call that follows finds them in memory and never blocks on disk.
+    """
+
+    name = "memory"
+
+    def __init__(self, journal_dir: str = STORAGE_JOURNAL_DIR):
+        self.journal_dir = journal_dir
+        self.journal: Optional[StorageJournal] = None
+        self.revision_epoch = storage_service.revision_epoch
+
+    async def start(self):
+        if self.journal_dir:
+            self.journal = StorageJournal(
+                self.journal_dir,
+                fsync=STORAGE_JOURNAL_FSYNC,
+                flush_interval=STORAGE_JOURNAL_FLUSH_MS / 1000,
+                snapshot_every=STORAGE_JOURNAL_SNAPSHOT_EVERY,
+            )
+            storage_service.attach_journal(self.journal)
+            await self.journal.start()
+        await storage_service.debates.start()
+
+    async def close(self):
+        await storage_service.debates.close()
+        if self.journal is not None:
+            await self.journal.stop()
+            storage_service.journal = None
+            self.journal = None
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "debates": storage_service.debates.stats(),
+            "vote_ledger": storage_service.vote_ledger.stats(),
+        }
+        if self.journal is not None:
+            stats["journal"] = self.journal.stats()
+        return stats
+
+    async def _durable(self, result):
+        """Return result once the journal's fsync policy considers it durable."""
+        if self.journal is not None:
+            await self.journal.sync()
+        return result
+
+    async def create_user(self, email, hashed_password, name=None, role="user"):
+        # Check and insert run without yielding to the loop, so they are atomic
+        if storage_service.get_user_by_email(email) is not None:
+            raise EmailAlreadyRegistered(email)
+        return await self._durable(storage_service.create_user(email, hashed_password, name, role))
+
+    async def get_user_by_email(self, email):
+        return storage_service.get_user_by_email(email)
+
+    async def get_user_by_id(self, user_id):
+        return storage_service.get_user_by_id(user_id)
+
+    async def get_all_users(self):
+        return storage_service.get_all_users()
+
+    async def update_user_password(self, user_id, hashed_password):
+        return await self._durable(storage_service.update_user_password(user_id, hashed_password))
+
+    async def create_topic(self, title, description=None):
+        return await self._durable(storage_service.create_topic(title, description))
+
+    async def get_topic_by_id(self, topic_id):
+        return storage_service.get_topic_by_id(topic_id)
+
+    async def get_all_topics(self):
+        return storage_service.get_all_topics()
+
+    async def delete_topic(self, topic_id):
+        return await self._durable(storage_service.delete_topic(topic_id))
+
+    async def create_debate(self, topic, created_by, status="ready"):
+        return await self._durable(storage_service.create_debate(topic, created_by, status))
+
+    async def get_debate_by_id(self, debate_id):
+        return await storage_service.load_debate(debate_id)
+
+    async def delete_debate(self, debate_id):
+        await storage_service.load_debate(debate_id)
+        return await self._durable(storage_service.delete_debate(debate_id))
+
+    async def get_all_debates(self):
+        debates = [await storage_service.load_debate(debate_id, promote=False) for debate_id in list(storage_service.debates.ids())]
+        return [debate for debate in debates if debate is not None]
+
+    async def list_debates_page(self, limit=10, cursor=None):
+        return storage_service.list_debates_page(limit, cursor)
+
+    async def add_argument_to_debate(self, debate_id, side, content, created_by=None):
+        await storage_service.load_debate(debate_id)
+        return await self._durable(storage_service.add_argument_to_debate(debate_id, side, content, created_by))
+
+    async def get_debate_header(self, debate_id):
+        await storage_service.load_debate(debate_id)
+        return storage_service.get_debate_header(debate_id)
+
+    async def list_arguments(self, debate_id, limit=20, sort="recent", side=None, cursor=None):
+        await storage_service.load_debate(debate_id)
+        return storage_service.list_arguments(debate_id, limit, sort, side, cursor)
+
+    async def get_argument_by_id(self, debate_id, argument_id):
+        await storage_service.load_debate(debate_id)
+        return storage_service.get_argument_by_id(debate_id, argument_id)
+
+    async def update_debate_status(self, debate_id, status):
+        await storage_service.load_debate(debate_id)
+        return await self._durable(storage_service.update_debate_status(debate_id, status))
+
+    async def update_debate_summary(self, debate_id, summary, fingerprint=None, argument_count=0):
+        await storage_service.load_debate(debate_id)
+        return await self._durable(storage_service.update_debate_summary(debate_id, summary, fingerprint, argument_count))
+
+    async def add_vote(self, debate_id, argument_id, user_id):
+        await storage_service.load_debate(debate_id)
+        return await self._durable(storage_service.add_vote(debate_id, argument_id, user_id))
+
+    async def has_voted(self, argument_id, user_id):
+        return storage_service.has_voted(argument_id, user_id)
+
+    async def get_debate_stats(self):
+        most_voted_id = storage_service.debate_votes.leader()
+        if most_voted_id:
+            await storage_service.load_debate(most_voted_id)
+        return storage_service.get_debate_stats()
+
+    async def get_leaderboards(self, limit=10):
+        return storage_service.get_leaderboards(limit)
+
+    async def get_debate_revision(self, debate_id):
+        return storage_service.get_debate_revision(debate_id)
+
+    async def get_collection_revision(self, name):
+        return storage_service.get_collection_revision(name)
+
+
+class MongoStorageBackend(StorageBackend):
+    """MongoDB engine on the shared Motor client."""
+
+    name = "mongo"
+
+    async def start(self):
+        await mongo_storage.ensure_indexes()
+        self.revision_epoch = await mongo_storage.get_revision_epoch()
+
+    async def create_user(self, email, hashed_password, name=None, role="user"):
+        try:
+            return await mongo_storage.create_user(email, hashed_password, name, role)
+        except DuplicateKeyError:
+            raise EmailAlreadyRegistered(email)
+
+    async def get_user_by_email(self, email):
+        return await mongo_storage.get_user_by_email(email)
+
+    async def get_user_by_id(self, user_id):
+        return await mongo_storage.get_user_by_id(user_id)
+
+    async def get_all_users(self):
+        return await mongo_storage.get_all_users()
+
+    async def update_user_password(self, user_id, hashed_password):
+        return await mongo_storage.update_user_password(user_id, hashed_password)
+
+    async def create_topic(self, title, description=None):
+        return await mongo_storage.create_topic(title, description)
+
+    async def get_topic_by_id(self, topic_id):
+        return await mongo_storage.get_topic_by_id(topic_id)
+
+    async def get_all_topics(self):
+        return await mongo_storage.get_all_topics()
+
+    async def delete_topic(self, topic_id):
+        return await mongo_storage.delete_topic(topic_id)
+
+    async def create_debate(self, topic, created_by, status="ready"):
+        return await mongo_storage.create_debate(topic, created_by, status)
+
+    async def get_debate_by_id(self, debate_id):
+        return await mongo_storage.get_debate_by_id(debate_id)
+
+    async def delete_debate(self, debate_id):
+        return await mongo_storage.delete_debate(debate_id)
+
+    async def get_all_debates(self):
+        return await mongo_storage.get_all_debates()
+
+    async def list_debates_page(self, limit=10, cursor=None):
+        return await mongo_storage.list_debates_page(limit, cursor)
+
+    async def add_argument_to_debate(self, debate_id, side, content, created_by=None):
+        return await mongo_storage.add_argument_to_debate(debate_id, side, content, created_by)
+
+    async def get_debate_header(self, debate_id):
+        return await mongo_storage.get_debate_header(debate_id)
+
+    async def list_arguments(self, debate_id, limit=20, sort="recent", side=None, cursor=None):
+        return await mongo_storage.list_arguments(debate_id, limit, sort, side, cursor)
+
+    async def get_argument_by_id(self, debate_id, argument_id):
+        return await mongo_storage.get_argument_by_id(debate_id, argument_id)
+
+    async def update_debate_status(self, debate_id, status):
+        return await mongo_storage.update_debate_status(debate_id, status)
+
+    async def update_debate_summary(self, debate_id, summary, fingerprint=None, argument_count=0):
+        return await mongo_storage.update_debate_summary(debate_id, summary, fingerprint, argument_count)
+
+    async def add_vote(self, debate_id, argument_id, user_id):
+        return await mongo_storage.add_vote(debate_id, argument_id, user_id)
+
+    async def has_voted(self, argument_id, user_id):
+        return await mongo_storage.has_voted(argument_id, user_id)
+
+    async def get_debate_stats(self):
+        return await mongo_storage.get_debate_stats()
+
+    async def get_leaderboards(self, limit=10):
+        return await mongo_storage.get_leaderboards(limit)
+
+    async def get_debate_revision(self, debate_id):
+        return await mongo_storage.get_debate_revision(debate_id)
+
+    async def get_collection_revision(self, name):
+        return await mongo_storage.get_collection_revision(name)
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def create_storage(backend: str) -> StorageBackend:
+    """Build a storage engine by name."""
+    if backend == "memory":
+        return MemoryStorageBackend()
+    if backend == "mongo":
+        return MongoStorageBackend()
+    if backend == "sqlite":
+        from app.services.sqlite_storage import SQLiteStorageBackend
+        return SQLiteStorageBackend()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+
+def get_storage() -> StorageBackend:
+    """Return the configured storage engine (created on first use)."""
+    global _storage
+    if _storage is None:
+        _storage = create_storage(STORAGE_BACKEND)
+    return _storage
@@ -0,0 +1,292 @@
+"""Snapshot + append-only log persistence for the in-memory store.
+
+Every storage mutation is appended to a JSON-lines log. Appends are buffered
+and group-committed by a background task: one write (and, depending on the
+fsync policy, one fsync) covers every mutation since the previous commit.
+
+fsync policies:
+
+- ``always``: callers of ``sync()`` wait until their mutation is fsynced;
+  concurrent writers share one fsync per group commit
+- ``interval``: each group commit is fsynced; a crash loses at most the
+  last flush interval
+- ``never``: each group commit is written, the OS decides when to fsync
+
+The log is split into numbered segments. Every ``snapshot_every`` entries
+(and on shutdown) the journal starts a new segment and writes a compacted
+snapshot of the store, tagged with that segment number, in a worker thread;
+older segments are then deleted. Startup loads the snapshot and replays only
+the segments written after it.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("always", "interval", "never")
+SNAPSHOT_FILE = "snapshot.jsonl"
+
+
+class StorageJournal:
+    """Group-committed mutation log with periodic compacted snapshots."""
+
+    def __init__(self, directory: str, fsync: str = "interval", flush_interval: float = 0.05, snapshot_every: int = 100_000):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown journal fsync policy: {fsync}")
+        self.directory = directory
+        self.fsync = fsync
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self.capture: Optional[Callable[[], Callable[[], Iterable[Dict[str, Any]]]]] = None
+
+        self._segment = 0
+        self._file = None
+        self._pending: List[str] = []
+        self._appended = 0  # sequence number of the last appended entry
+        self._durable = 0  # sequence number covered by the last group commit
+        self._waiters: List[Tuple[int, asyncio.Future]] = []
+        self._since_snapshot = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._snapshot_task: Optional[asyncio.Task] = None
+        # One I/O thread keeps segment writes in order
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal")
+
+        self.commits = 0
+        self.snapshots = 0
+        self.last_snapshot_seconds = 0.0
+        self.recovery: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Startup recovery
+    # ------------------------------------------------------------------
+
+    def recover(self, load: Callable[[Dict[str, Any]], None], apply: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        """Load the snapshot with load(record), then replay the log tail with apply(entry)."""
+        start = time.perf_counter()
+        os.makedirs(self.directory, exist_ok=True)
+        first_segment, snapshot_records = 0, 0
+
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                first_segment = json.loads(f.readline())["segment"]
+                for line in f:
+                    load(json.loads(line))
+                    snapshot_records += 1
+
+        replayed = 0
+        segments = [n for n in self._segments() if n >= first_segment]
+        for number in segments:
+            with open(self._segment_path(number), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash: everything after it is lost
+                        logger.warning(f"Ignoring truncated journal entry in segment {number}")
+                        break
+                    apply(entry)
+                    replayed += 1
+
+        self._segment = max(segments, default=first_segment - 1) + 1
+        self._since_snapshot = replayed
+        self.recovery = {
+            "snapshot_records": snapshot_records,
+            "replayed_entries": replayed,
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        logger.info(
+            f"Storage journal recovered {snapshot_records} snapshot records and "
+            f"{replayed} log entries in {self.recovery['seconds']}s"
+        )
+        return self.recovery
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        self._file = await self._in_io(self._open_segment, self._segment)
+        self._wake = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Commit buffered entries, snapshot if the log grew, and close."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self._commit()
+        if self._snapshot_task is not None:
+            await asyncio.gather(self._snapshot_task, return_exceptions=True)
+        if self._since_snapshot and self.capture is not None:
+            await self.snapshot()
+        await self._in_io(self._file.close)
+        self._io.shutdown()
+
+    # ------------------------------------------------------------------
+    # Logging
+    # ------------------------------------------------------------------
+
+    def append(self, entry: Dict[str, Any]):
+        """Buffer a mutation for the next group commit."""
+        self._pending.append(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._appended += 1
+        self._since_snapshot += 1
+        if self.fsync == "always" and self._wake is not None:
+            self._wake.set()
+
+    async def sync(self):
+        """Wait until every entry appended so far is durable (``always`` policy only)."""
+        if self.fsync != "always" or self._durable >= self._appended or self._wake is None:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((self._appended, future))
+        self._wake.set()
+        await future
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self._commit()
+            except Exception as e:
+                logger.error(f"Storage journal commit failed: {e}")
+                continue
+            if self._since_snapshot >= self.snapshot_every and self._snapshot_task is None and self.capture is not None:
+                self._snapshot_task = asyncio.create_task(self.snapshot())
+                self._snapshot_task.add_done_callback(self._snapshot_done)
+
+    async def _commit(self):
+        """Write (and maybe fsync) everything buffered as one group commit."""
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+        sequence = self._appended
+        await self._in_io(self._write_current, lines)
+        self.commits += 1
+        self._mark_durable(sequence)
+
+    def _mark_durable(self, sequence: int):
+        self._durable = max(self._durable, sequence)
+        still_waiting = []
+        for target, future in self._waiters:
+            if target <= self._durable:
+                if not future.done():
+                    future.set_result(None)
+            else:
+                still_waiting.append((target, future))
+        self._waiters = still_waiting
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    async def snapshot(self):
+        """Rotate to a new segment and write a compacted snapshot of the store."""
+        start = time.perf_counter()
+        # Capture and take the buffered entries without yielding so the snapshot
+        # matches the segment boundary. Rotation runs on the I/O thread, ahead of
+        # any later commit, so entries appended meanwhile land in the new segment.
+        produce = self.capture()
+        lines, self._pending = self._pending, []
+        sequence = self._appended
+        self._segment += 1
+        segment = self._segment
+        self._since_snapshot = 0
+
+        await self._in_io(self._rotate, lines, segment)
+        self._mark_durable(sequence)
+
+        await asyncio.get_running_loop().run_in_executor(None, self._write_snapshot, segment, produce)
+        await self._in_io(self._remove_segments_before, segment)
+        self.snapshots += 1
+        self.last_snapshot_seconds = round(time.perf_counter() - start, 3)
+        logger.info(f"Storage snapshot written at segment {segment} in {self.last_snapshot_seconds}s")
+
+    def _snapshot_done(self, task: asyncio.Task):
+        self._snapshot_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Storage snapshot failed: {task.exception()}")
+
+    def _write_snapshot(self, segment: int, produce: Callable[[], Iterable[Dict[str, Any]]]):
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"segment": segment, "createdAt": datetime.utcnow().isoformat()}) + "\n")
+            for record in produce():
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # Segment files
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"journal-{number:08d}.log")
+
+    def _segments(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self.directory):
+            if name.startswith("journal-") and name.endswith(".log"):
+                numbers.append(int(name[len("journal-"):-len(".log")]))
+        return sorted(numbers)
+
+    def _open_segment(self, number: int):
+        return open(self._segment_path(number), "a", encoding="utf-8")
+
+    def _rotate(self, lines: List[str], number: int):
+        """Finish the current segment with lines and continue in a new one (I/O thread)."""
+        new_file = self._open_segment(number)
+        old_file, self._file = self._file, new_file
+        try:
+            self._write(old_file, lines, self.fsync != "never")
+        finally:
+            old_file.close()
+
+    def _write_current(self, lines: List[str]):
+        """Append lines to the current segment (I/O thread)."""
+        self._write(self._file, lines, self.fsync != "never")
+
+    def _remove_segments_before(self, number: int):
+        for old in self._segments():
+            if old < number:
+                os.remove(self._segment_path(old))
+
+    @staticmethod
+    def _write(f, lines: List[str], fsync: bool):
+        f.write("".join(lines))
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+
+    async def _in_io(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._io, fn, *args)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fsync": self.fsync,
+            "segment": self._segment,
+            "pending": len(self._pending),
+            "commits": self.commits,
+            "entries_since_snapshot": self._since_snapshot,
+            "snapshots": self.snapshots,
+            "last_snapshot_seconds": self.last_snapshot_seconds,
+            "recovery": self.recovery,
+        }
@@ -0,0 +1,72 @@
+"""Incremental parser for streamed debate JSON.
+
+Gemini streams ``{"for": [...], "against": [...]}`` in arbitrary text chunks.
+The parser tracks string/array state across chunks and reports each argument
+as soon as its closing quote arrives, without waiting for the full document.
+"""
+import json
+from typing import Dict, List, Optional, Tuple
+
+ARGUMENT_KEYS = ("for", "against")
+
+
+class StreamingArgumentParser:
+    """Emit ``(key, argument)`` pairs from partial debate JSON as they complete."""
+
+    def __init__(self):
+        self.arguments: Dict[str, List[str]] = {key: [] for key in ARGUMENT_KEYS}
+        self._in_string = False
+        self._escape = False
+        self._chars: List[str] = []
+        self._depth = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._array_key: Optional[str] = None
+        self._array_depth = 0
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        """Consume a chunk and return arguments completed within it."""
+        completed = []
+        for ch in text:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    self._chars.append(ch)
+                elif ch == "\\":
+                    self._escape = True
+                    self._chars.append(ch)
+                elif ch == '"':
+                    self._in_string = False
+                    value = self._decode("".join(self._chars))
+                    if self._array_key and self._depth == self._array_depth:
+                        self.arguments[self._array_key].append(value)
+                        completed.append((self._array_key, value))
+                    else:
+                        self._last_string = value
+                else:
+                    self._chars.append(ch)
+            elif ch == '"':
+                self._in_string = True
+                self._chars = []
+            elif ch == ":":
+                self._key = self._last_string
+            elif ch in "[{":
+                self._depth += 1
+                if ch == "[" and self._array_key is None and self._key in ARGUMENT_KEYS:
+                    self._array_key = self._key
+                    self._array_depth = self._depth
+            elif ch in "]}":
+                if self._array_key and self._depth == self._array_depth:
+                    self._array_key = None
+                self._depth -= 1
+                self._key = None
+            elif ch == "," and not self._array_key:
+                self._key = None
+        return completed
+
+    @staticmethod
+    def _decode(raw: str) -> str:
+        try:
+            return json.loads(f'"{raw}"')
+        except ValueError:
+            return raw
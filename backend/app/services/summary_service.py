@@ -0,0 +1,199 @@
+"""Debate summaries cached by argument-set fingerprint and updated incrementally.
+
+A summary is stored with a fingerprint of the arguments it covered. Asking
+again with no new arguments returns the stored summary without calling
+Gemini; when only a few arguments were added, the previous summary is
+updated from the delta instead of re-reading the whole debate.
+
+Debates too large for one prompt are summarized map-reduce style: arguments
+are chunked by side under a token budget, chunks are summarized in parallel,
+and partial summaries are merged in rounds until one final pass fits.
+"""
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.config import SUMMARY_MAX_DELTA_ARGUMENTS, SUMMARY_CHUNK_TOKENS, SUMMARY_MAP_CONCURRENCY
+from app.services.gemini_service import (
+    generate_summary,
+    stream_summary,
+    summarize_chunk,
+    merge_summaries,
+    is_fallback_summary,
+    summary_flight,
+)
+from app.services.storage_backend import get_storage
+
+
+SIDE_LABELS = {
+    "FOR": "debate arguments supporting the topic",
+    "AGAINST": "debate arguments opposing the topic",
+    "USER": "user-submitted debate arguments",
+}
+
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def fingerprint_arguments(arguments: List[Dict[str, Any]], prefix: int = 0) -> Tuple[str, str]:
+    """
+    Fingerprint an argument list in one pass.
+    
+    Returns (fingerprint of the first ``prefix`` arguments, fingerprint of all).
+    Arguments are append-only, so a matching prefix means the earlier
+    summary covered exactly those arguments.
+    """
+    digest = hashlib.sha256()
+    prefix_fingerprint = digest.hexdigest()
+    for index, argument in enumerate(arguments):
+        digest.update(f"{argument['id']}:{argument['content']}\n".encode("utf-8"))
+        if index + 1 == prefix:
+            prefix_fingerprint = digest.hexdigest()
+    return prefix_fingerprint, digest.hexdigest()
+
+
+def is_summary_current(header: Dict[str, Any]) -> bool:
+    """Whether the stored summary covers every argument (summarize_debate would not call Gemini).
+
+    Takes a debate header (see ``get_debate_header``): arguments are
+    append-only, so a summary that covered as many arguments as there are
+    now covers all of them.
+    """
+    if not header.get("summaryFingerprint") or is_fallback_summary(header.get("summary")):
+        return False
+    return header.get("summaryArgumentCount") == header["argumentCount"]
+
+
+async def summarize_debate(
+    debate: Dict[str, Any],
+    on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Dict[str, str]:
+    """
+    Return an up-to-date summary for a debate and store it.
+    
+    Returns {"summary": ..., "mode": "cached" | "incremental" | "full" | "map_reduce"}.
+    """
+    # Snapshot: arguments may be appended while Gemini is working
+    arguments = debate["arguments"][: len(debate["arguments"])]
+    previous = debate.get("summary")
+    covered = debate.get("summaryArgumentCount") or 0
+    stored_fingerprint = debate.get("summaryFingerprint")
+
+    prefix_fingerprint, fingerprint = fingerprint_arguments(arguments, covered)
+    usable_previous = stored_fingerprint and not is_fallback_summary(previous)
+
+    if usable_previous and stored_fingerprint == fingerprint:
+        return {"summary": previous, "mode": "cached"}
+
+    new_count = len(arguments) - covered
+    if usable_previous and covered and stored_fingerprint == prefix_fingerprint and new_count <= SUMMARY_MAX_DELTA_ARGUMENTS:
+        texts = [arg["content"] for arg in arguments[covered:]]
+        summary = await _summarize(texts, on_text, previous)
+        mode = "incremental"
+    elif sum(estimate_tokens(arg["content"]) for arg in arguments) > SUMMARY_CHUNK_TOKENS:
+        summary = await summary_flight.do(
+            f"map_reduce:{fingerprint}",
+            lambda: map_reduce_summary(arguments, on_text, on_progress),
+        )
+        mode = "map_reduce"
+    else:
+        texts = [arg["content"] for arg in arguments]
+        summary = await _summarize(texts, on_text)
+        mode = "full"
+
+    if is_fallback_summary(summary):
+        await get_storage().update_debate_summary(debate["id"], summary)
+    else:
+        await get_storage().update_debate_summary(debate["id"], summary, fingerprint, len(arguments))
+    return {"summary": summary, "mode": mode}
+
+
+async def _summarize(
+    texts: List[str],
+    on_text: Optional[Callable[[str], Awaitable[None]]],
+    previous_summary: Optional[str] = None,
+) -> str:
+    if on_text:
+        return await stream_summary(texts, on_text, previous_summary)
+    return await generate_summary(texts, previous_summary)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def chunk_texts(texts: List[str], budget: int) -> List[List[str]]:
+    """Greedily pack texts into chunks whose estimated size stays within budget."""
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for text in texts:
+        # A single oversized text is truncated so every chunk fits one prompt
+        text = text[: budget * 4]
+        tokens = estimate_tokens(text)
+        if current and used + tokens > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(text)
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def map_reduce_summary(
+    arguments: List[Dict[str, Any]],
+    on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> str:
+    """
+    Summarize a large debate hierarchically.
+    
+    Map: chunk each side's arguments under SUMMARY_CHUNK_TOKENS and summarize
+    the chunks in parallel (at most SUMMARY_MAP_CONCURRENCY at once). Reduce:
+    merge partial summaries in rounds until they fit one final merge prompt.
+    """
+    semaphore = asyncio.Semaphore(max(1, SUMMARY_MAP_CONCURRENCY))
+
+    async def report(stage: str, round_number: int, completed: int, total: int):
+        if on_progress:
+            await on_progress({"stage": stage, "round": round_number, "completed": completed, "total": total})
+
+    async def run_round(stage: str, round_number: int, jobs: List[Tuple[str, List[str], str]]) -> List[str]:
+        completed = 0
+        await report(stage, round_number, 0, len(jobs))
+
+        async def run_job(prefix: str, texts: List[str], label: str) -> Optional[str]:
+            nonlocal completed
+            async with semaphore:
+                summary = await summarize_chunk(texts, label)
+            completed += 1
+            await report(stage, round_number, completed, len(jobs))
+            return f"{prefix}{summary}" if summary else None
+
+        results = await asyncio.gather(*[run_job(prefix, texts, label) for prefix, texts, label in jobs])
+        return [result for result in results if result]
+
+    # Map round: per side, per token-budgeted chunk
+    jobs = []
+    for side, label in SIDE_LABELS.items():
+        texts = [arg["content"] for arg in arguments if arg.get("side") == side]
+        for chunk in chunk_texts(texts, SUMMARY_CHUNK_TOKENS):
+            jobs.append((f"[{side}] ", chunk, label))
+    partials = await run_round("map", 1, jobs)
+
+    # Reduce rounds: each round shrinks the partials by roughly the chunk fan-in
+    round_number = 1
+    while len(partials) > 1 and sum(estimate_tokens(p) for p in partials) > SUMMARY_CHUNK_TOKENS:
+        round_number += 1
+        chunks = chunk_texts(partials, SUMMARY_CHUNK_TOKENS)
+        if len(chunks) == len(partials):
+            # Partials are individually too large to combine further
+            break
+        jobs = [("", chunk, "partial summaries of one debate") for chunk in chunks]
+        partials = await run_round("reduce", round_number, jobs)
+
+    await report("merge", round_number + 1, 0, 1)
+    summary = await merge_summaries(partials, on_text)
+    await report("merge", round_number + 1, 1, 1)
+    return summary
@@ -0,0 +1,124 @@
+"""Compact vote ledger with O(1) duplicate detection per (argument, user).
+
+User ids are interned to small integers. Each argument's voters start as a
+set of those integers and switch to a bitmap once the bitmap is the smaller
+representation, so popular arguments with tens of thousands of voters cost a
+few kilobytes instead of lists of UUID strings.
+"""
+import threading
+from typing import Any, Dict, Union
+
+# Switch an argument's voters from a set to a bitmap past this many voters ...
+BITMAP_MIN_VOTERS = 64
+# ... once the bitmap is no bigger than the set (~32 bytes per set member)
+SET_BYTES_PER_VOTER = 32
+
+Voters = Union[set, bytearray]
+
+
+class VoteLedger:
+    """Record one vote per user per argument with atomic check-and-set."""
+
+    def __init__(self):
+        # Held by callers that must pair check-and-set with a counter update
+        self.lock = threading.RLock()
+        self._user_index: Dict[str, int] = {}
+        self._voters: Dict[str, Voters] = {}
+
+    def add(self, argument_id: str, user_id: str) -> bool:
+        """Record a vote. Returns False if the user already voted on the argument."""
+        with self.lock:
+            uid = self._intern(user_id)
+            voters = self._voters.get(argument_id)
+            if voters is None:
+                voters = self._voters[argument_id] = set()
+
+            if isinstance(voters, bytearray):
+                byte, bit = divmod(uid, 8)
+                if byte >= len(voters):
+                    voters.extend(bytes(byte - len(voters) + 1))
+                elif voters[byte] >> bit & 1:
+                    return False
+                voters[byte] |= 1 << bit
+                return True
+
+            if uid in voters:
+                return False
+            voters.add(uid)
+            if len(voters) >= BITMAP_MIN_VOTERS and len(voters) * SET_BYTES_PER_VOTER >= len(self._user_index) // 8:
+                self._voters[argument_id] = self._to_bitmap(voters)
+            return True
+
+    def has_voted(self, argument_id: str, user_id: str) -> bool:
+        """Check if user has already voted on an argument."""
+        uid = self._user_index.get(user_id)
+        voters = self._voters.get(argument_id)
+        if uid is None or voters is None:
+            return False
+        if isinstance(voters, bytearray):
+            byte, bit = divmod(uid, 8)
+            return byte < len(voters) and bool(voters[byte] >> bit & 1)
+        return uid in voters
+
+    def discard_argument(self, argument_id: str):
+        """Forget all votes for an argument (e.g. when its debate is deleted)."""
+        with self.lock:
+            self._voters.pop(argument_id, None)
+
+    def count(self, argument_id: str) -> int:
+        """Number of users who voted on an argument."""
+        voters = self._voters.get(argument_id)
+        if voters is None:
+            return 0
+        if isinstance(voters, bytearray):
+            return bin(int.from_bytes(voters, "little")).count("1")
+        return len(voters)
+
+    def export(self) -> Dict[str, Any]:
+        """Copy of the ledger as JSON-friendly data (bitmaps as hex)."""
+        with self.lock:
+            return {
+                "users": list(self._user_index),
+                "voters": {
+                    argument_id: voters.hex() if isinstance(voters, bytearray) else list(voters)
+                    for argument_id, voters in self._voters.items()
+                },
+            }
+
+    def restore(self, state: Dict[str, Any]):
+        """Replace the ledger contents with data produced by export()."""
+        with self.lock:
+            self._user_index = {user_id: uid for uid, user_id in enumerate(state["users"])}
+            self._voters = {
+                argument_id: bytearray.fromhex(voters) if isinstance(voters, str) else set(voters)
+                for argument_id, voters in state["voters"].items()
+            }
+
+    def clear(self):
+        with self.lock:
+            self._user_index.clear()
+            self._voters.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Ledger size and approximate voter storage footprint."""
+        bitmaps = [v for v in self._voters.values() if isinstance(v, bytearray)]
+        sets = [v for v in self._voters.values() if not isinstance(v, bytearray)]
+        return {
+            "arguments": len(self._voters),
+            "interned_users": len(self._user_index),
+            "bitmap_arguments": len(bitmaps),
+            "approx_voter_bytes": sum(len(b) for b in bitmaps) + sum(len(s) for s in sets) * SET_BYTES_PER_VOTER,
+        }
+
+    def _intern(self, user_id: str) -> int:
+        uid = self._user_index.get(user_id)
+        if uid is None:
+            uid = self._user_index[user_id] = len(self._user_index)
+        return uid
+
+    @staticmethod
+    def _to_bitmap(voters: set) -> bytearray:
+        bitmap = bytearray(max(voters) // 8 + 1)
+        for uid in voters:
+            bitmap[uid // 8] |= 1 << (uid % 8)
+        return bitmap
@@ -1,25 +1,61 @@
 """Authentication utilities: JWT tokens and bcrypt password hashing."""
 import jwt
-import bcrypt
+import logging
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.config import JWT_SECRET, JWT_ALGORITHM, JWT_EXPIRATION_HOURS
-from app.services.storage_service import get_user_by_id
+from app.services.storage_backend import get_storage
+from app.services.password_hasher import password_hasher, PasswordHasherBusy
+from app.services.principal_cache import principal_cache
+
+logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    salt = bcrypt.gensalt(rounds=12)
-    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password using bcrypt on the hashing pool (503 when saturated)."""
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash on the hashing pool (503 when saturated)."""
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+
+
+async def upgrade_password_hash(user: Dict, plain_password: str):
+    """
+    Rehash a verified password when it was hashed with a different cost.
+    
+    Best effort: skipped when the hashing pool is busy and retried on the
+    user's next login.
+    """
+    if not password_hasher.needs_rehash(user["hashed_password"]):
+        return
+    try:
+        hashed = await password_hasher.hash(plain_password)
+    except PasswordHasherBusy:
+        return
+    if await get_storage().update_user_password(user["id"], hashed):
+        principal_cache.invalidate_user(user["id"])
+        password_hasher.rehashed += 1
+        logger.info(f"Rehashed password for user {user['id']} with cost {password_hasher.rounds}")
 
 
 def create_token(payload: Dict, expires_hours: int = JWT_EXPIRATION_HOURS) -> str:
@@ -43,8 +79,17 @@ def verify_token(token: str) -> Optional[Dict]:
 
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Dependency to extract and verify the current user from JWT token."""
+    """
+    Dependency to extract and verify the current user from JWT token.
+    
+    Tokens verified recently are resolved from ``principal_cache`` without
+    decoding the token or loading the user again.
+    """
     token = credentials.credentials
+    user = principal_cache.get(token)
+    if user is not None:
+        return user
+    
     payload = verify_token(token)
     
     if not payload:
@@ -62,13 +107,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         )
     
     # Fetch user from storage
-    user = get_user_by_id(user_id)
+    user = await get_storage().get_user_by_id(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
     
+    principal_cache.put(token, user, payload.get("exp"))
     return user
 
 
@@ -0,0 +1,37 @@
+"""Strong ETags and conditional GETs for revisioned resources."""
+from typing import Dict, Optional
+from fastapi import Response
+from app.config import HTTP_CACHE_MAX_AGE_SECONDS
+
+
+def make_etag(epoch: str, revision: int) -> str:
+    """Strong validator for a storage revision."""
+    return f'"{epoch}.{revision}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names this ETag (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    """ETag and Cache-Control for a public, revalidated response."""
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={HTTP_CACHE_MAX_AGE_SECONDS}, must-revalidate",
+    }
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 answer to a matching conditional GET."""
+    return Response(status_code=304, headers=cache_headers(etag))
@@ -0,0 +1,35 @@
+"""Opaque cursors for keyset pagination."""
+import base64
+import json
+from typing import Any, List
+
+# Key types of argument-page cursors per sort order: (seq,) or (votes, seq)
+ARGUMENT_CURSOR_TYPES = {"recent": (int,), "votes": (int, int)}
+
+
+def encode_cursor(*values: Any) -> str:
+    """Pack the sort key of the last returned item into an opaque string."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, *types: type) -> List[Any]:
+    """
+    Unpack a cursor made by encode_cursor whose values have the given types,
+    e.g. ``decode_cursor(cursor, int, int)``.
+
+    Raises ValueError if it is malformed, so a hand-made cursor can never
+    reach a comparison or a query filter with unexpected values.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Invalid cursor")
+    for value, expected in zip(values, types):
+        # bool is an int subclass but never a valid key
+        if type(value) is not expected:
+            raise ValueError("Invalid cursor")
+    return values
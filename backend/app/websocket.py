@@ -1,63 +1,512 @@
-"""WebSocket connection manager for real-time debate updates."""
-from typing import Set, Dict, List
-from fastapi import WebSocket
+"""WebSocket connection manager for real-time debate updates.
+
+Each connection gets a bounded outbound queue drained by its own writer
+task, so ``broadcast`` only serializes the message once and enqueues it; a
+slow client never delays the rest of the room. When a client's queue is
+full the slow-consumer policy applies:
+
+- ``disconnect``: the client is closed (code 1013, try again later) and
+  can reconnect
+- ``drop_oldest``: the oldest queued frame is discarded so the client keeps
+  receiving the newest updates, with gaps
+
+A send that does not complete within the send timeout always disconnects.
+
+Rooms with at least WS_BATCH_MIN_CONNECTIONS viewers can coalesce updates
+(WS_BATCH_TICK_MS > 0): a room sends at most one frame per tick, and
+broadcasts arriving in between are merged into a single ``batch`` frame
+carrying the final vote count per changed argument, new arguments, the
+latest presence count and any other events in order.
+WS_ROOM_MAX_BYTES_PER_SECOND additionally caps the bytes each viewer of a
+batching room receives, holding frames back (merging further) once the
+budget is spent.
+
+Every broadcast is also published to the broadcast bus (``broadcast_bus``)
+so clients connected to other workers or nodes receive it; this worker
+subscribes to a room's channel only while it has clients there. Workers
+announce their per-room connection counts on the bus, so
+``get_active_users`` reports the cluster-wide total.
+"""
+import asyncio
 import json
 import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import WebSocket
+from app.config import (
+    WS_SEND_QUEUE_SIZE,
+    WS_SEND_TIMEOUT_SECONDS,
+    WS_SLOW_CLIENT_POLICY,
+    WS_BATCH_TICK_MS,
+    WS_BATCH_MIN_CONNECTIONS,
+    WS_ROOM_MAX_BYTES_PER_SECOND,
+    WS_PRESENCE_INTERVAL_SECONDS,
+)
+from app.services.broadcast_bus import BroadcastBus, create_bus
 
 logger = logging.getLogger(__name__)
 
+SLOW_CLIENT_POLICIES = ("disconnect", "drop_oldest")
+# Close code sent to clients that cannot keep up (RFC 6455 "try again later")
+SLOW_CLIENT_CLOSE_CODE = 1013
+# Rooms listed individually in stats(), busiest first
+STATS_MAX_ROOMS = 50
+
+Frame = Tuple[str, float]  # serialized message, enqueue time
+# Presence messages whose latest active_users count supersedes earlier ones
+PRESENCE_TYPES = ("user_joined", "user_left")
+# Presence announcements older than this many intervals are from dead workers
+PRESENCE_EXPIRY_INTERVALS = 3
+
+# listener(room, message) called for every message received from other workers
+Listener = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class _Client:
+    """One connection: its socket, outbound queue and writer task."""
+
+    __slots__ = ("websocket", "debate_id", "queue", "writer", "closed")
+
+    def __init__(self, websocket: WebSocket, debate_id: str, queue_size: int):
+        self.websocket = websocket
+        self.debate_id = debate_id
+        self.queue: "asyncio.Queue[Frame]" = asyncio.Queue(maxsize=queue_size)
+        self.writer: Optional[asyncio.Task] = None
+        self.closed = False
+
+
+class _RoomStats:
+    """Fan-out counters for one debate room."""
+
+    __slots__ = (
+        "broadcasts", "coalesced", "bytes", "total_fanout", "max_fanout",
+        "deliveries", "total_delivery", "max_delivery", "dropped_messages", "dropped_clients",
+    )
+
+    def __init__(self):
+        self.broadcasts = 0  # frames fanned out to the room
+        self.coalesced = 0  # messages merged into batch frames
+        self.bytes = 0  # outbound bytes (frame size x recipients)
+        self.total_fanout = 0.0  # time spent enqueueing a broadcast for every client
+        self.max_fanout = 0.0
+        self.deliveries = 0
+        self.total_delivery = 0.0  # broadcast -> frame written to the socket
+        self.max_delivery = 0.0
+        self.dropped_messages = 0
+        self.dropped_clients = 0
+
+    def merge(self, other: "_RoomStats"):
+        for field in self.__slots__:
+            if field.startswith("max_"):
+                setattr(self, field, max(getattr(self, field), getattr(other, field)))
+            else:
+                setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "broadcasts": self.broadcasts,
+            "coalesced": self.coalesced,
+            "bytes": self.bytes,
+            "avg_fanout_ms": round(self.total_fanout / self.broadcasts * 1000, 3) if self.broadcasts else 0.0,
+            "max_fanout_ms": round(self.max_fanout * 1000, 3),
+            "avg_delivery_ms": round(self.total_delivery / self.deliveries * 1000, 2) if self.deliveries else 0.0,
+            "max_delivery_ms": round(self.max_delivery * 1000, 2),
+            "dropped_messages": self.dropped_messages,
+            "dropped_clients": self.dropped_clients,
+        }
+
+
+class _RoomBatch:
+    """Updates pending for a room's next tick, plus its frame pacing state."""
+
+    __slots__ = (
+        "epoch", "from_version", "version", "votes", "arguments", "active_users", "events",
+        "pending", "last_flush", "tokens", "refilled_at", "task",
+    )
+
+    def __init__(self, byte_budget: int):
+        self.reset()
+        self.last_flush = 0.0
+        self.tokens = float(byte_budget)
+        self.refilled_at = time.monotonic()
+        self.task: Optional[asyncio.Task] = None
+
+    def reset(self):
+        self.epoch: Optional[str] = None
+        self.from_version: Optional[int] = None
+        self.version: Optional[int] = None
+        self.votes: Dict[str, int] = {}
+        self.arguments: List[Dict[str, Any]] = []
+        self.active_users: Optional[int] = None
+        self.events: List[Dict[str, Any]] = []
+        self.pending = 0
+
+    def add(self, message: Dict[str, Any]):
+        """Merge a message into the pending batch."""
+        self.pending += 1
+        if "version" in message:
+            if message.get("epoch") != self.epoch:
+                self.epoch = message.get("epoch")
+                self.from_version = message["version"]
+            self.version = message["version"]
+
+        kind = message.get("type")
+        if kind == "vote":
+            self.votes[message["argumentId"]] = message["votes"]
+        elif kind == "argument_added":
+            self.arguments.append(message["argument"])
+        elif kind in PRESENCE_TYPES:
+            self.active_users = message.get("active_users")
+        else:
+            self.events.append(message)
+
+    def frame(self, debate_id: str) -> Dict[str, Any]:
+        frame: Dict[str, Any] = {"type": "batch", "debateId": debate_id}
+        if self.version is not None:
+            frame.update(epoch=self.epoch, fromVersion=self.from_version, version=self.version)
+        if self.arguments:
+            frame["arguments"] = self.arguments
+        if self.votes:
+            frame["votes"] = self.votes
+        if self.active_users is not None:
+            frame["active_users"] = self.active_users
+        if self.events:
+            frame["events"] = self.events
+        return frame
+
 
 class ConnectionManager:
     """Manage WebSocket connections for debate rooms."""
-    
-    def __init__(self):
-        # debate_id -> set of connected WebSocket clients
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
-    
+
+    def __init__(
+        self,
+        queue_size: int = WS_SEND_QUEUE_SIZE,
+        send_timeout: float = WS_SEND_TIMEOUT_SECONDS,
+        slow_client_policy: str = WS_SLOW_CLIENT_POLICY,
+        batch_tick_ms: int = WS_BATCH_TICK_MS,
+        batch_min_connections: int = WS_BATCH_MIN_CONNECTIONS,
+        room_max_bytes_per_second: int = WS_ROOM_MAX_BYTES_PER_SECOND,
+        bus: Optional[BroadcastBus] = None,
+        presence_interval: float = WS_PRESENCE_INTERVAL_SECONDS,
+    ):
+        if slow_client_policy not in SLOW_CLIENT_POLICIES:
+            raise ValueError(f"Unknown slow client policy: {slow_client_policy}")
+        self.queue_size = max(1, queue_size)
+        self.send_timeout = send_timeout
+        self.slow_client_policy = slow_client_policy
+        self.batch_tick = max(0, batch_tick_ms) / 1000
+        self.batch_min_connections = max(1, batch_min_connections)
+        self.room_max_bytes_per_second = max(0, room_max_bytes_per_second)
+
+        # debate_id -> connected clients, keyed by their WebSocket
+        self.active_connections: Dict[str, Dict[WebSocket, _Client]] = {}
+        self._room_stats: Dict[str, _RoomStats] = {}
+        self._batches: Dict[str, _RoomBatch] = {}
+        # Counters of rooms that have emptied, so totals survive room teardown
+        self._closed_rooms = _RoomStats()
+
+        self.bus = bus or create_bus()
+        self.worker_id = uuid.uuid4().hex[:12]
+        self.presence_interval = presence_interval
+        # debate_id -> other worker -> (connections, monotonic time announced)
+        self._remote_presence: Dict[str, Dict[str, Tuple[int, float]]] = {}
+        self._listeners: List[Listener] = []
+        self._heartbeat: Optional[asyncio.Task] = None
+        self.bus_errors = 0
+
+    async def start(self):
+        """Connect to the broadcast bus and start announcing presence."""
+        await self.bus.start(self._on_bus_message)
+        self._heartbeat = asyncio.create_task(self._presence_loop())
+        logger.info(f"WebSocket manager {self.worker_id} using {self.bus.name} broadcast bus")
+
+    async def close(self):
+        """Stop announcing presence and disconnect from the bus."""
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+        await self.bus.close()
+
+    def add_listener(self, listener: Listener):
+        """Call ``listener`` for every room message published by another worker."""
+        self._listeners.append(listener)
+
     async def connect(self, debate_id: str, websocket: WebSocket):
         """Accept a new WebSocket connection for a debate."""
         await websocket.accept()
-        
-        if debate_id not in self.active_connections:
-            self.active_connections[debate_id] = set()
-        
-        self.active_connections[debate_id].add(websocket)
+
+        client = _Client(websocket, debate_id, self.queue_size)
+        client.writer = asyncio.create_task(self._write_loop(client))
+        self.active_connections.setdefault(debate_id, {})[websocket] = client
+        self._room_stats.setdefault(debate_id, _RoomStats())
         logger.info(f"Client connected to debate {debate_id}. Active: {len(self.active_connections[debate_id])}")
-    
+
+        if len(self.active_connections[debate_id]) == 1:
+            # First local client: start receiving the room and ask the others who is there
+            await self._bus_call(self.bus.subscribe(debate_id))
+            await self._publish(debate_id, {"kind": "presence_query"})
+        await self._announce(debate_id)
+
     async def disconnect(self, debate_id: str, websocket: WebSocket):
         """Remove a WebSocket connection."""
-        if debate_id in self.active_connections:
-            self.active_connections[debate_id].discard(websocket)
-            
-            if not self.active_connections[debate_id]:
-                del self.active_connections[debate_id]
-            
-            logger.info(f"Client disconnected from debate {debate_id}")
-    
+        client = self.active_connections.get(debate_id, {}).get(websocket)
+        if client is None:
+            return
+        self._remove(client)
+        logger.info(f"Client disconnected from debate {debate_id}")
+
     async def broadcast(self, debate_id: str, message: dict):
-        """Broadcast a message to all clients in a debate room."""
-        if debate_id not in self.active_connections:
+        """Send a message to every client in a debate room, on every worker."""
+        self._deliver(debate_id, message)
+        await self._publish(debate_id, {"kind": "message", "message": message})
+
+    def _deliver(self, debate_id: str, message: dict):
+        """Queue a message for this worker's clients in a room (or its next batch)."""
+        clients = self.active_connections.get(debate_id)
+        if not clients:
             return
-        
-        # Convert message to JSON
-        message_str = json.dumps(message)
-        
-        # Send to all connected clients
-        disconnected = []
-        for connection in self.active_connections[debate_id]:
+
+        batch = self._batches.get(debate_id)
+        # Keep batching while anything is pending so later messages cannot overtake it
+        if (batch is not None and batch.pending) or (self.batch_tick and len(clients) >= self.batch_min_connections):
+            self._coalesce(debate_id, message)
+            return
+
+        self._fan_out(debate_id, json.dumps(message))
+
+    def _fan_out(self, debate_id: str, message_str: str):
+        """Queue one serialized frame for every client in a room."""
+        clients = self.active_connections.get(debate_id)
+        if not clients:
+            return
+
+        start = time.monotonic()
+        # Serialized once, shared by every client's queue
+        frame = (message_str, start)
+        stats = self._room_stats[debate_id]
+        stats.bytes += len(message_str) * len(clients)
+        slow = [client for client in clients.values() if not self._enqueue(client, frame)]
+        for client in slow:
+            self._drop(client, "send queue full")
+
+        elapsed = time.monotonic() - start
+        stats.broadcasts += 1
+        stats.total_fanout += elapsed
+        stats.max_fanout = max(stats.max_fanout, elapsed)
+
+    def _coalesce(self, debate_id: str, message: dict):
+        batch = self._batches.get(debate_id)
+        if batch is None:
+            batch = self._batches[debate_id] = _RoomBatch(self.room_max_bytes_per_second)
+        batch.add(message)
+        self._room_stats[debate_id].coalesced += 1
+        if batch.task is None:
+            batch.task = asyncio.create_task(self._flush_loop(debate_id, batch))
+
+    async def _flush_loop(self, debate_id: str, batch: _RoomBatch):
+        """Send a room's pending batch at most once per tick and within its byte budget."""
+        rate = self.room_max_bytes_per_second
+        try:
+            while batch.pending:
+                now = time.monotonic()
+                wait = batch.last_flush + self.batch_tick - now
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    continue
+
+                payload = json.dumps(batch.frame(debate_id))
+                size = len(payload)
+                if rate:
+                    batch.tokens = min(rate, batch.tokens + (now - batch.refilled_at) * rate)
+                    batch.refilled_at = now
+                    # A frame larger than the whole budget goes out once the bucket is full
+                    needed = min(size, rate)
+                    if batch.tokens < needed:
+                        await asyncio.sleep((needed - batch.tokens) / rate)
+                        continue
+                    batch.tokens -= size
+
+                batch.reset()
+                batch.last_flush = now
+                self._fan_out(debate_id, payload)
+        finally:
+            batch.task = None
+
+    def send(self, debate_id: str, websocket: WebSocket, message: dict):
+        """Queue a message for one client, behind anything already queued for it."""
+        client = self.active_connections.get(debate_id, {}).get(websocket)
+        if client is None:
+            return
+        if not self._enqueue(client, (json.dumps(message), time.monotonic())):
+            self._drop(client, "send queue full")
+
+    def get_active_users(self, debate_id: str) -> int:
+        """Get number of active users in a debate across all workers."""
+        local = len(self.active_connections.get(debate_id, {}))
+        remote = self._remote_presence.get(debate_id)
+        if not remote:
+            return local
+        cutoff = time.monotonic() - self.presence_interval * PRESENCE_EXPIRY_INTERVALS
+        return local + sum(count for count, announced in remote.values() if announced >= cutoff)
+
+    async def _publish(self, debate_id: str, envelope: Dict[str, Any]):
+        envelope["origin"] = self.worker_id
+        await self._bus_call(self.bus.publish(debate_id, envelope))
+
+    async def _bus_call(self, call: Awaitable[Any], default: Any = None) -> Any:
+        """Run a bus operation; a bus outage must not fail local delivery (default is returned)."""
+        try:
+            return await call
+        except Exception as e:
+            self.bus_errors += 1
+            logger.error(f"WebSocket bus error: {e}")
+            return default
+
+    async def _announce(self, debate_id: str):
+        """Tell the other workers how many clients this worker has in a room."""
+        await self._publish(debate_id, {"kind": "presence", "connections": len(self.active_connections.get(debate_id, {}))})
+
+    async def _on_bus_message(self, debate_id: str, envelope: Dict[str, Any]):
+        """Handle an envelope another worker published to a room this worker serves."""
+        origin = envelope.get("origin")
+        if origin == self.worker_id:
+            return
+        kind = envelope.get("kind")
+        if kind == "message":
+            message = envelope["message"]
+            for listener in self._listeners:
+                await listener(debate_id, message)
+            self._deliver(debate_id, message)
+        elif kind == "presence":
+            remote = self._remote_presence.setdefault(debate_id, {})
+            if envelope["connections"]:
+                remote[origin] = (envelope["connections"], time.monotonic())
+            else:
+                remote.pop(origin, None)
+            if not remote:
+                del self._remote_presence[debate_id]
+        elif kind == "presence_query" and debate_id in self.active_connections:
+            await self._announce(debate_id)
+
+    async def _presence_loop(self):
+        """Re-announce presence periodically so counts of dead workers expire."""
+        while True:
+            await asyncio.sleep(self.presence_interval)
+            for debate_id in list(self.active_connections):
+                await self._announce(debate_id)
+
+    async def _leave_room(self, debate_id: str):
+        # A client may have joined again while this was scheduled
+        if debate_id in self.active_connections:
+            return
+        self._remote_presence.pop(debate_id, None)
+        await self._announce(debate_id)
+        await self._bus_call(self.bus.unsubscribe(debate_id))
+
+    def _enqueue(self, client: _Client, frame: Frame) -> bool:
+        """Queue a frame, applying the slow-client policy; False if the client must be dropped."""
+        try:
+            client.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            pass
+        self._room_stats[client.debate_id].dropped_messages += 1
+        if self.slow_client_policy != "drop_oldest":
+            return False
+        client.queue.get_nowait()
+        client.queue.put_nowait(frame)
+        return True
+
+    async def _write_loop(self, client: _Client):
+        """Send queued frames to one client until it is removed."""
+        while True:
+            message_str, enqueued_at = await client.queue.get()
             try:
-                await connection.send_text(message_str)
+                await asyncio.wait_for(client.websocket.send_text(message_str), self.send_timeout)
+            except asyncio.TimeoutError:
+                self._drop(client, f"send blocked for more than {self.send_timeout}s")
+                return
             except Exception as e:
                 logger.error(f"Error sending message: {e}")
-                disconnected.append(connection)
-        
-        # Remove disconnected clients
-        for conn in disconnected:
-            await self.disconnect(debate_id, conn)
-    
-    def get_active_users(self, debate_id: str) -> int:
-        """Get number of active users in a debate."""
-        return len(self.active_connections.get(debate_id, set()))
+                self._remove(client)
+                return
+
+            stats = self._room_stats.get(client.debate_id)
+            if stats is not None:
+                delivered = time.monotonic() - enqueued_at
+                stats.deliveries += 1
+                stats.total_delivery += delivered
+                stats.max_delivery = max(stats.max_delivery, delivered)
+
+    def _drop(self, client: _Client, reason: str):
+        """Disconnect a client that cannot keep up with its room."""
+        if client.closed:
+            return
+        stats = self._room_stats.get(client.debate_id)
+        if stats is not None:
+            stats.dropped_clients += 1
+        logger.warning(f"Dropping slow client from debate {client.debate_id}: {reason}")
+        self._remove(client)
+        asyncio.create_task(self._close(client.websocket))
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(websocket.close(code=SLOW_CLIENT_CLOSE_CODE), self.send_timeout)
+        except Exception:
+            pass
+
+    def _remove(self, client: _Client):
+        if client.closed:
+            return
+        client.closed = True
+        if client.writer is not None and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+
+        clients = self.active_connections.get(client.debate_id)
+        if clients is None:
+            return
+        clients.pop(client.websocket, None)
+        if not clients:
+            del self.active_connections[client.debate_id]
+            self._retire_room(client.debate_id)
+            asyncio.create_task(self._leave_room(client.debate_id))
+        else:
+            asyncio.create_task(self._announce(client.debate_id))
+
+    def _retire_room(self, debate_id: str):
+        batch = self._batches.pop(debate_id, None)
+        if batch is not None and batch.task is not None and batch.task is not asyncio.current_task():
+            batch.task.cancel()
+        stats = self._room_stats.pop(debate_id, None)
+        if stats is not None:
+            self._closed_rooms.merge(stats)
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection counts and fan-out latency, overall and for the busiest rooms."""
+        totals = _RoomStats()
+        totals.merge(self._closed_rooms)
+        for stats in self._room_stats.values():
+            totals.merge(stats)
+
+        busiest = sorted(self.active_connections, key=lambda room: len(self.active_connections[room]), reverse=True)
+        return {
+            "slow_client_policy": self.slow_client_policy,
+            "worker_id": self.worker_id,
+            "bus": {"backend": self.bus.name, "errors": self.bus_errors, **self.bus.stats()},
+            "send_queue_size": self.queue_size,
+            "batch_tick_ms": round(self.batch_tick * 1000),
+            "batching_rooms": sum(1 for batch in self._batches.values() if batch.pending),
+            "rooms": len(self.active_connections),
+            "connections": sum(len(clients) for clients in self.active_connections.values()),
+            "queued_frames": sum(client.queue.qsize() for clients in self.active_connections.values() for client in clients.values()),
+            **totals.as_dict(),
+            "by_room": {
+                room: {"connections": len(self.active_connections[room]), **self._room_stats[room].as_dict()}
+                for room in busiest[:STATS_MAX_ROOMS]
+            },
+        }
 
 
 # Global connection manager instance
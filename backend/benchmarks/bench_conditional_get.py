@@ -0,0 +1,56 @@
+"""Benchmark: cost of a polling client's GET /debates/{id}, 200 vs 304.
+
+Stores a debate with ARGUMENTS arguments in the in-memory engine and calls
+the route REQUESTS times, once without a validator (a full body, served from
+the response cache after the first request) and once with the ETag from the
+first response in If-None-Match (an empty 304). Reports time per request and
+bytes sent.
+
+Run from the backend directory:
+    python -m benchmarks.bench_conditional_get
+"""
+import asyncio
+import time
+from app.routes.debate_routes import get_debate
+from app.services import storage_service
+
+ARGUMENTS = (10, 500, 5_000)
+REQUESTS = 2_000
+
+
+async def poll(debate_id: str, if_none_match):
+    return await get_debate(debate_id, arguments_limit=None, sort="recent", if_none_match=if_none_match)
+
+
+async def run(arguments: int):
+    debate = storage_service.create_debate("Should AI replace teachers?", "user-1")
+    for i in range(arguments):
+        storage_service.add_argument_to_debate(
+            debate["id"], ("FOR", "AGAINST")[i % 2], f"Argument number {i} with a sentence or two of reasoning behind it."
+        )
+    etag = (await poll(debate["id"], None)).headers["etag"]
+
+    results = {}
+    for label, validator in (("200", None), ("304", etag)):
+        sent = 0
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            response = await poll(debate["id"], validator)
+            sent += len(response.body)
+        results[label] = ((time.perf_counter() - start) / REQUESTS, sent / REQUESTS)
+
+    full, conditional = results["200"], results["304"]
+    print(
+        f"  {arguments:>6} arguments  200 {full[0] * 1e6:>7.1f} us, {full[1] / 1024:>7.1f} KiB/request  "
+        f"304 {conditional[0] * 1e6:>6.1f} us, {conditional[1]:>3.0f} B/request"
+    )
+
+
+async def main():
+    print(f"Polling GET /debates/{{id}} {REQUESTS} times with an unchanged debate:")
+    for arguments in ARGUMENTS:
+        await run(arguments)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+"""Benchmark: tiered debate storage under skewed (Zipf-like) traffic.
+
+Stores DEBATES debates, then reads them with a few hot debates getting most
+of the traffic, for several memory budgets. Reports hit ratio, evictions,
+resident bytes and read latency.
+
+Run from the backend directory:
+    python -m benchmarks.bench_debate_tiers
+"""
+import random
+import tempfile
+import time
+from app.services.debate_tiers import TieredDebateStore
+
+DEBATES = 20_000
+ARGUMENTS_PER_DEBATE = 20
+READS = 50_000
+BUDGETS_MB = [1, 8, 32, 1024]
+
+
+def make_debate(i: int) -> dict:
+    return {
+        "id": f"debate-{i}",
+        "topic": f"Topic {i}",
+        "summary": None,
+        "arguments": [
+            {"id": f"arg-{i}-{j}", "side": "USER", "content": "x" * 200, "votes": 0}
+            for j in range(ARGUMENTS_PER_DEBATE)
+        ],
+    }
+
+
+def main():
+    rng = random.Random(42)
+    weights = [1 / (rank + 1) for rank in range(DEBATES)]
+    reads = rng.choices(range(DEBATES), weights=weights, k=READS)
+
+    print(f"{'budget MB':>10} {'hit ratio':>10} {'evictions':>10} {'resident MB':>12} {'us/read':>8}")
+    for budget in BUDGETS_MB:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = TieredDebateStore(tmp, budget * 1024 * 1024)
+            for i in range(DEBATES):
+                store.add(make_debate(i))
+            store.hits = store.misses = store.evictions = 0
+
+            start = time.perf_counter()
+            for i in reads:
+                store.get(f"debate-{i}")
+            per_read = (time.perf_counter() - start) / READS * 1e6
+
+            stats = store.stats()
+            print(
+                f"{budget:>10} {stats['hit_ratio']:>10.3f} {stats['evictions']:>10} "
+                f"{stats['resident_bytes'] / 1024 / 1024:>12.1f} {per_read:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
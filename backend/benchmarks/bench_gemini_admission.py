@@ -0,0 +1,86 @@
+"""Benchmark: who gets Gemini calls when one script floods POST /debates.
+
+A script fires SCRIPT_REQUESTS debate creations from SCRIPT_ACCOUNTS accounts
+in bursts while NORMAL_USERS
+users create one debate each and an admin asks for ADMIN_SUMMARIES summaries
+over DURATION seconds. Rates are scaled up so the run takes seconds; the
+limiter is the in-memory backend. Reports, with and without admission
+control, how many Gemini calls each group got, how many requests were turned
+away with 429, and how long admitted requests waited.
+
+Run from the backend directory:
+    python -m benchmarks.bench_gemini_admission
+"""
+import asyncio
+import random
+import statistics
+import time
+from app.services.gemini_admission import GeminiAdmission, MemoryLimiterBackend, AdmissionRejected
+
+DURATION = 3.0
+SCRIPT_REQUESTS = 300
+SCRIPT_ACCOUNTS = 30
+NORMAL_USERS = 40
+ADMIN_SUMMARIES = 10
+
+USER_RATE_PER_MINUTE = 120
+USER_BURST = 3
+GLOBAL_RATE_PER_MINUTE = 1_200  # 20 calls/s
+GLOBAL_BURST = 10
+QUEUE_SIZE = 20
+MAX_WAIT = 1.0
+
+
+async def run(label: str, admission):
+    results = {"script": [], "users": [], "admin": []}
+    rejected = {"script": 0, "users": 0, "admin": 0}
+
+    async def request(group: str, user_id: str, priority: str, delay: float):
+        await asyncio.sleep(delay)
+        start = time.perf_counter()
+        if admission is not None:
+            try:
+                await admission.admit(user_id, priority)
+            except AdmissionRejected:
+                rejected[group] += 1
+                return
+        results[group].append(time.perf_counter() - start)
+
+    random.seed(1)
+    tasks = [
+        request("script", f"script-{i % SCRIPT_ACCOUNTS}", "user", (i // SCRIPT_ACCOUNTS) * DURATION / 10)
+        for i in range(SCRIPT_REQUESTS)
+    ]
+    tasks += [request("users", f"user-{i}", "user", random.uniform(0, DURATION)) for i in range(NORMAL_USERS)]
+    tasks += [request("admin", "admin", "admin", random.uniform(0, DURATION)) for _ in range(ADMIN_SUMMARIES)]
+    await asyncio.gather(*tasks)
+
+    print(f"  {label}:")
+    for group, waits in results.items():
+        print(
+            f"    {group:<7} gemini calls {len(waits):>4}  429s {rejected[group]:>4}  "
+            f"wait p50 {statistics.median(waits or [0]) * 1000:>6.1f} ms  max {max(waits or [0]) * 1000:>6.1f} ms"
+        )
+
+
+async def main():
+    print(
+        f"{SCRIPT_REQUESTS} scripted creations from {SCRIPT_ACCOUNTS} accounts, {NORMAL_USERS} users and "
+        f"{ADMIN_SUMMARIES} admin summaries over {DURATION:.0f}s:"
+    )
+    await run("no admission control", None)
+    admission = GeminiAdmission(
+        MemoryLimiterBackend(),
+        USER_RATE_PER_MINUTE,
+        USER_BURST,
+        GLOBAL_RATE_PER_MINUTE,
+        GLOBAL_BURST,
+        QUEUE_SIZE,
+        MAX_WAIT,
+    )
+    await run("admission control", admission)
+    print(f"  stats: {admission.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
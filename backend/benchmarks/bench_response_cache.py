@@ -0,0 +1,77 @@
+"""Benchmark: per-request cost of GET /debates/{id}, uncached vs cached body.
+
+Builds a debate with ARGUMENTS arguments and times what a request costs
+without the response cache (validate against DebateOut, then JSON-encode the
+way FastAPI does) against a response cache hit, for REQUESTS requests.
+
+Run from the backend directory:
+    python -m benchmarks.bench_response_cache
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from app.schemas.debate_schema import DebateOut
+from app.services.response_cache import ResponseCache, debate_group
+
+ARGUMENTS = (10, 500, 5_000)
+REQUESTS = 2_000
+
+
+def make_debate(arguments: int) -> dict:
+    now = datetime.utcnow().isoformat()
+    return {
+        "id": "debate-1",
+        "topic": "Should AI replace teachers?",
+        "createdBy": "user-1",
+        "status": "ready",
+        "summary": "A balanced summary of the debate so far.",
+        "createdAt": now,
+        "arguments": [
+            {
+                "id": f"arg-{i}",
+                "side": ("FOR", "AGAINST", "USER")[i % 3],
+                "content": f"Argument number {i} with a sentence or two of reasoning behind it.",
+                "votes": i % 50,
+                "createdBy": None,
+                "createdAt": now,
+            }
+            for i in range(arguments)
+        ],
+    }
+
+
+async def run(arguments: int):
+    debate = make_debate(arguments)
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        body = json.dumps(jsonable_encoder(DebateOut(**debate)), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    uncached = (time.perf_counter() - start) / REQUESTS
+
+    cache = ResponseCache(max_entries=100, max_bytes=256 * 1024 * 1024, ttl_seconds=3600)
+
+    async def build():
+        return DebateOut(**debate).dict()
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        body = await cache.get_or_build(debate_group(debate["id"]), None, build)
+    cached = (time.perf_counter() - start) / REQUESTS
+
+    print(
+        f"  {arguments:>6} arguments ({len(body) / 1024:>7.1f} KiB)  "
+        f"uncached {uncached * 1e6:>9.1f} us/request  cached {cached * 1e6:>6.2f} us/request  "
+        f"({uncached / cached:>8.0f}x)"
+    )
+
+
+async def main():
+    print(f"GET /debates/{{id}} body cost over {REQUESTS} requests:")
+    for arguments in ARGUMENTS:
+        await run(arguments)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
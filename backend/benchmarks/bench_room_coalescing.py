@@ -0,0 +1,73 @@
+"""Benchmark: frames and bytes per viewer for a hot room, per coalescing tick.
+
+Connects VIEWERS fake sockets to one room and broadcasts VOTES_PER_SECOND
+vote events for DURATION seconds. Reports frames and bytes each viewer
+received per second with coalescing off and at several tick lengths.
+
+Run from the backend directory:
+    python -m benchmarks.bench_room_coalescing
+"""
+import asyncio
+import time
+from app.websocket import ConnectionManager
+
+VIEWERS = 1_000
+VOTES_PER_SECOND = 500
+DURATION = 2.0
+ARGUMENTS = 20
+TICKS_MS = (0, 50, 100, 250)
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.frames += 1
+        self.bytes += len(text)
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+async def run(tick_ms: int):
+    manager = ConnectionManager(queue_size=1024, batch_tick_ms=tick_ms, batch_min_connections=1)
+    sockets = [FakeWebSocket() for _ in range(VIEWERS)]
+    for ws in sockets:
+        await manager.connect("room", ws)
+
+    start = time.perf_counter()
+    version = 0
+    while time.perf_counter() - start < DURATION:
+        version += 1
+        await manager.broadcast(
+            "room",
+            {"type": "vote", "argumentId": f"arg-{version % ARGUMENTS}", "votes": version, "epoch": "e", "version": version},
+        )
+        await asyncio.sleep(1 / VOTES_PER_SECOND)
+    # Let the last tick and the writer queues drain
+    await asyncio.sleep(max(tick_ms, 100) / 1000 * 2)
+    elapsed = time.perf_counter() - start
+
+    viewer = sockets[0]
+    label = f"{tick_ms} ms" if tick_ms else "off"
+    print(
+        f"  tick {label:<7} {version / elapsed:>6.0f} votes/s  "
+        f"{viewer.frames / elapsed:>6.1f} frames/s  {viewer.bytes / elapsed / 1024:>7.1f} KiB/s per viewer"
+    )
+    for ws in sockets:
+        await manager.disconnect("room", ws)
+
+
+async def main():
+    print(f"{VIEWERS} viewers, ~{VOTES_PER_SECOND} votes/s on {ARGUMENTS} arguments for {DURATION}s:")
+    for tick_ms in TICKS_MS:
+        await run(tick_ms)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
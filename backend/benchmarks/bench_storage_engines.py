@@ -0,0 +1,94 @@
+"""Benchmark: MongoDB and SQLite storage engines vs the in-memory store.
+
+Runs the same create/read/vote workload against each engine. SQLite uses a
+fresh database file in a temporary directory. Point it at a
+local mongod with --mongo-uri; without one it falls back to the in-process
+mongomock-motor stand-in when installed (numbers then reflect the stand-in,
+not a real server).
+
+Run from the backend directory:
+    python -m benchmarks.bench_storage_engines --mongo-uri mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from app.services import storage_service as memory
+from app.services import mongo_storage as mongo
+from app.services.sqlite_storage import SQLiteStorageBackend
+
+DEBATES = 200
+ARGUMENTS_PER_DEBATE = 5
+READS = 2_000
+
+
+async def maybe_await(value):
+    return await value if asyncio.iscoroutine(value) else value
+
+
+async def run_workload(engine) -> dict:
+    timings = {}
+
+    start = time.perf_counter()
+    users = [await maybe_await(engine.create_user(f"bench{i}@example.com", "x")) for i in range(DEBATES)]
+    debate_ids, argument_keys = [], []
+    for i, user in enumerate(users):
+        debate = await maybe_await(engine.create_debate(f"Bench topic {i}", user["id"]))
+        debate_ids.append(debate["id"])
+        for j in range(ARGUMENTS_PER_DEBATE):
+            argument = await maybe_await(engine.add_argument_to_debate(debate["id"], "USER", f"Argument {j}", user["id"]))
+            argument_keys.append((debate["id"], argument["id"]))
+    timings["writes/s"] = (DEBATES * (ARGUMENTS_PER_DEBATE + 2)) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(READS):
+        await maybe_await(engine.get_debate_by_id(debate_ids[i % len(debate_ids)]))
+    timings["debate reads/s"] = READS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(READS):
+        debate_id, argument_id = argument_keys[i % len(argument_keys)]
+        await maybe_await(engine.add_vote(debate_id, argument_id, users[(i // len(argument_keys)) % len(users)]["id"]))
+    timings["votes/s"] = READS / (time.perf_counter() - start)
+    return timings
+
+
+async def main(mongo_uri: str):
+    results = {"memory": await run_workload(memory)}
+
+    if mongo_uri:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(mongo_uri)
+        await client.drop_database("ai_debate_bench")
+        mongo.use_database(client["ai_debate_bench"])
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            print("No --mongo-uri and mongomock-motor not installed; skipping MongoDB engine")
+            AsyncMongoMockClient = None
+        if AsyncMongoMockClient:
+            mongo.use_database(AsyncMongoMockClient()["ai_debate_bench"])
+
+    if mongo._db is not None:
+        await mongo.ensure_indexes()
+        results["mongo"] = await run_workload(mongo)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite = SQLiteStorageBackend(os.path.join(tmp, "bench.db"))
+        await sqlite.start()
+        results["sqlite"] = await run_workload(sqlite)
+        await sqlite.close()
+
+    metrics = list(results["memory"])
+    print(f"{'engine':>8} " + " ".join(f"{m:>16}" for m in metrics))
+    for engine, timings in results.items():
+        print(f"{engine:>8} " + " ".join(f"{timings[m]:>16.0f}" for m in metrics))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-uri", default="", help="MongoDB URI of a local mongod")
+    args = parser.parse_args()
+    asyncio.run(main(args.mongo_uri))
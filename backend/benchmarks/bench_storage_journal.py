@@ -0,0 +1,96 @@
+"""Benchmark: in-memory store persistence (group-committed log + snapshots).
+
+Measures write throughput under each fsync policy, then restart time for a
+store with ARGUMENTS arguments, from a snapshot and from the log alone.
+
+Run from the backend directory:
+    python -m benchmarks.bench_storage_journal [--arguments 1000000]
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from app.services import storage_service as storage
+from app.services.storage_journal import StorageJournal
+from benchmarks.bench_storage_lookups import reset
+
+ARGUMENTS_PER_DEBATE = 20
+WRITERS = 50
+WRITES_PER_WRITER = 200
+
+
+async def open_journal(directory: str, fsync: str = "never", snapshot_every: int = 10 ** 9) -> StorageJournal:
+    reset()
+    journal = StorageJournal(directory, fsync=fsync, snapshot_every=snapshot_every)
+    storage.attach_journal(journal)
+    await journal.start()
+    return journal
+
+
+async def close_journal(journal: StorageJournal, snapshot: bool):
+    if not snapshot:
+        journal.capture = None
+    await journal.stop()
+    storage.journal = None
+
+
+async def write_throughput(fsync: str):
+    """Concurrent writers each adding arguments and waiting for durability."""
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = await open_journal(tmp, fsync)
+        debate = storage.create_debate("Throughput", created_by=None)
+
+        async def writer():
+            for i in range(WRITES_PER_WRITER):
+                storage.add_argument_to_debate(debate["id"], "USER", f"Argument {i}")
+                await journal.sync()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(writer() for _ in range(WRITERS)))
+        elapsed = time.perf_counter() - start
+        await close_journal(journal, snapshot=False)
+        commits = journal.commits
+    print(f"  fsync={fsync:<8} {WRITERS * WRITES_PER_WRITER / elapsed:>10.0f} writes/s  ({commits} group commits)")
+
+
+def populate(total_arguments: int):
+    user = storage.create_user("bench@example.com", "x")
+    debate = None
+    for i in range(total_arguments):
+        if i % ARGUMENTS_PER_DEBATE == 0:
+            debate = storage.create_debate(f"Topic {i}", created_by=user["id"])
+        argument = storage.add_argument_to_debate(debate["id"], "USER", f"Argument {i} " + "x" * 80, user["id"])
+        if i % 10 == 0:
+            storage.add_vote(debate["id"], argument["id"], user["id"])
+
+
+async def restart_time(total_arguments: int, snapshot: bool) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = await open_journal(tmp)
+        populate(total_arguments)
+        await close_journal(journal, snapshot)
+
+        start = time.perf_counter()
+        journal = await open_journal(tmp)
+        elapsed = time.perf_counter() - start
+        assert len(storage.arguments_by_id) == total_arguments
+        await close_journal(journal, snapshot=False)
+    reset()
+    return elapsed
+
+
+async def main(total_arguments: int):
+    print("Write throughput (concurrent writers awaiting durability):")
+    for fsync in ("always", "interval", "never"):
+        await write_throughput(fsync)
+
+    print(f"Restart with {total_arguments} arguments:")
+    print(f"  from snapshot  {await restart_time(total_arguments, snapshot=True):>8.2f}s")
+    print(f"  from log only  {await restart_time(total_arguments, snapshot=False):>8.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--arguments", type=int, default=1_000_000, help="Arguments stored before restarting")
+    args = parser.parse_args()
+    asyncio.run(main(args.arguments))
@@ -0,0 +1,60 @@
+"""Micro-benchmark: storage lookups should stay constant-time as data grows.
+
+Run from the backend directory:
+    python -m benchmarks.bench_storage_lookups
+"""
+import random
+import timeit
+from app.services import storage_service as storage
+
+SIZES = [1_000, 10_000, 100_000]
+LOOKUPS = 20_000
+
+
+def reset():
+    storage.users.clear()
+    storage.users_by_email.clear()
+    storage.debates.clear()
+    storage.topics.clear()
+    storage.arguments_by_id.clear()
+    storage.debate_headers.clear()
+    storage.debate_listing.clear()
+    storage.argument_indexes.clear()
+    storage.vote_ledger.clear()
+    storage.debate_votes.clear()
+    storage.user_activity.clear()
+
+
+def populate(size: int):
+    reset()
+    user_ids, emails, debate_ids, argument_keys = [], [], [], []
+    for i in range(size):
+        user = storage.create_user(email=f"user{i}@example.com", hashed_password="x")
+        debate = storage.create_debate(topic=f"Topic {i}", created_by=user["id"])
+        argument = storage.add_argument_to_debate(debate["id"], "FOR", f"Argument {i}")
+        user_ids.append(user["id"])
+        emails.append(user["email"].upper())
+        debate_ids.append(debate["id"])
+        argument_keys.append((debate["id"], argument["id"]))
+    return user_ids, emails, debate_ids, argument_keys
+
+
+def main():
+    print(f"{'size':>8} {'by id':>10} {'by email':>10} {'debate':>10} {'argument':>10}  (ns/lookup)")
+    for size in SIZES:
+        user_ids, emails, debate_ids, argument_keys = populate(size)
+        picks = [random.randrange(size) for _ in range(LOOKUPS)]
+
+        def per_lookup(fn) -> float:
+            return timeit.timeit(fn, number=1) / LOOKUPS * 1e9
+
+        by_id = per_lookup(lambda: [storage.get_user_by_id(user_ids[i]) for i in picks])
+        by_email = per_lookup(lambda: [storage.get_user_by_email(emails[i]) for i in picks])
+        debate = per_lookup(lambda: [storage.get_debate_by_id(debate_ids[i]) for i in picks])
+        argument = per_lookup(lambda: [storage.get_argument_by_id(*argument_keys[i]) for i in picks])
+        print(f"{size:>8} {by_id:>10.0f} {by_email:>10.0f} {debate:>10.0f} {argument:>10.0f}")
+    reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark: WebSocket fan-out to a large room with a few slow clients.
+
+Connects VIEWERS fake sockets to one room, a handful of which take SLOW_SEND
+seconds per frame, then broadcasts MESSAGES messages. Reports how long the
+fast clients take to receive everything and how many slow clients were
+dropped, for each slow-client policy.
+
+Run from the backend directory:
+    python -m benchmarks.bench_websocket_fanout
+"""
+import asyncio
+import time
+from app.websocket import ConnectionManager
+
+VIEWERS = 5_000
+SLOW_VIEWERS = 5
+SLOW_SEND = 0.5
+MESSAGES = 100
+QUEUE_SIZE = 32
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(self.delay)
+        self.received += 1
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+async def run(policy: str):
+    manager = ConnectionManager(queue_size=QUEUE_SIZE, send_timeout=5, slow_client_policy=policy)
+    fast = [FakeWebSocket(0) for _ in range(VIEWERS - SLOW_VIEWERS)]
+    slow = [FakeWebSocket(SLOW_SEND) for _ in range(SLOW_VIEWERS)]
+    for ws in fast + slow:
+        await manager.connect("room", ws)
+
+    start = time.perf_counter()
+    for i in range(MESSAGES):
+        await manager.broadcast("room", {"type": "vote", "argumentId": "a", "votes": i})
+    broadcast_done = time.perf_counter() - start
+    while any(ws.received < MESSAGES for ws in fast):
+        await asyncio.sleep(0.001)
+    delivered = time.perf_counter() - start
+
+    stats = manager.stats()
+    print(
+        f"  {policy:<12} broadcast {broadcast_done * 1000:>7.1f} ms  all fast clients served {delivered * 1000:>7.1f} ms  "
+        f"avg delivery {stats['avg_delivery_ms']:>6.1f} ms  dropped clients {stats['dropped_clients']}  "
+        f"dropped frames {stats['dropped_messages']}"
+    )
+    for ws in fast + slow:
+        await manager.disconnect("room", ws)
+
+
+async def main():
+    print(f"{VIEWERS} viewers ({SLOW_VIEWERS} taking {SLOW_SEND}s per frame), {MESSAGES} broadcasts:")
+    for policy in ("disconnect", "drop_oldest"):
+        await run(policy)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
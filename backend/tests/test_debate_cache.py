@@ -0,0 +1,69 @@
+import asyncio
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from app.services.debate_cache import DebateArgumentCache, normalize_topic
+
+ARGUMENTS = {"for": ["f1"], "against": ["a1"]}
+
+
+def test_equivalent_topics_share_an_entry(tmp_path):
+    cache = DebateArgumentCache(str(tmp_path / "cache.json"), ttl_seconds=60, max_entries=10)
+    cache.put("Should AI replace teachers?", ARGUMENTS)
+    assert normalize_topic("  should ai   replace teachers ") == "should ai replace teachers"
+    assert cache.get("should ai replace teachers") == ARGUMENTS
+
+
+@pytest.fixture
+def slow_cache(tmp_path, monkeypatch):
+    """Cache whose file writes take a while and record overlapping writes."""
+    cache = DebateArgumentCache(str(tmp_path / "cache.json"), ttl_seconds=60, max_entries=10, save_delay=0)
+    write = cache._write
+    active = []
+    lock = threading.Lock()
+
+    def slow_write(items):
+        with lock:
+            active.append(None)
+            cache.max_overlap = max(getattr(cache, "max_overlap", 0), len(active))
+        time.sleep(0.1)
+        write(items)
+        with lock:
+            active.pop()
+
+    monkeypatch.setattr(cache, "_write", slow_write)
+    return cache
+
+
+def _stored(cache):
+    with open(cache.path, encoding="utf-8") as f:
+        return set(json.load(f))
+
+
+def test_put_during_a_write_is_saved_afterwards(slow_cache):
+    async def scenario():
+        slow_cache.put("first", ARGUMENTS)
+        await asyncio.sleep(0.03)  # the first save is now writing
+        slow_cache.put("second", ARGUMENTS)
+        await asyncio.sleep(0.4)
+
+    asyncio.run(scenario())
+    assert _stored(slow_cache) == {"first", "second"}
+    assert slow_cache._saver is None and not slow_cache._dirty
+
+
+def test_close_waits_for_the_write_in_flight(slow_cache):
+    async def scenario():
+        slow_cache.put("first", ARGUMENTS)
+        await asyncio.sleep(0.03)
+        slow_cache.put("second", ARGUMENTS)
+        await slow_cache.close()
+
+    asyncio.run(scenario())
+    assert _stored(slow_cache) == {"first", "second"}
+    assert slow_cache.max_overlap == 1
+    assert not os.path.exists(slow_cache.path + ".tmp")
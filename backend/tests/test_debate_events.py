@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+from app.services.broadcast_bus import MemoryBus
+from app.services.debate_events import DebateEventLog
+from app.websocket import manager
+
+
+class UnavailableBus(MemoryBus):
+    """Bus whose server is down: every call fails."""
+
+    async def subscribe(self, room):
+        raise ConnectionError("bus down")
+
+    async def publish(self, room, envelope):
+        raise ConnectionError("bus down")
+
+    async def next_version(self, room):
+        raise ConnectionError("bus down")
+
+    async def current_version(self, room):
+        raise ConnectionError("bus down")
+
+    async def forget(self, room):
+        raise ConnectionError("bus down")
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.received = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.received.append(json.loads(text))
+
+    async def close(self, code=1000):
+        pass
+
+
+def test_bus_outage_still_delivers_locally_and_asks_for_resync(monkeypatch):
+    monkeypatch.setattr(manager, "bus", UnavailableBus())
+    events = DebateEventLog()
+
+    async def scenario():
+        websocket = FakeWebSocket()
+        await manager.connect("debate-1", websocket)
+        try:
+            event = await events.publish("debate-1", "vote", argumentId="a1", votes=3)
+            await asyncio.sleep(0.05)
+        finally:
+            await manager.disconnect("debate-1", websocket)
+        return event, websocket.received
+
+    event, received = asyncio.run(scenario())
+    assert event == {"type": "resync_required", "debateId": "debate-1", "epoch": None, "version": 0}
+    assert event in received
+    assert events.published == 0
+
+
+def test_bus_outage_does_not_fail_position_since_or_forget(monkeypatch):
+    monkeypatch.setattr(manager, "bus", UnavailableBus())
+    events = DebateEventLog()
+    errors = manager.bus_errors
+
+    async def scenario():
+        position = await events.position("debate-1")
+        missed = await events.since("debate-1", "epoch", 4)
+        await events.forget("debate-1")
+        return position, missed
+
+    position, missed = asyncio.run(scenario())
+    assert position == {"type": "sync", "debateId": "debate-1", "epoch": None, "version": 0}
+    assert [message["type"] for message in missed] == ["resync_required"]
+    assert manager.bus_errors == errors + 3
+
+
+def test_since_replays_missed_events_and_detects_gaps(monkeypatch):
+    monkeypatch.setattr(manager, "bus", MemoryBus())
+    events = DebateEventLog(history=3)
+
+    async def scenario():
+        published = [await events.publish("debate-1", "vote", votes=votes) for votes in range(3)]
+        epoch = published[0]["epoch"]
+        replay = await events.since("debate-1", epoch, 1)
+        current = await events.since("debate-1", epoch, 3)
+        other_epoch = await events.since("debate-1", "stale-epoch", 1)
+        ahead = await events.since("debate-1", epoch, 9)
+
+        # A version allocated by another worker whose event never arrived here
+        await manager.bus.next_version("debate-1")
+        await events.publish("debate-1", "vote", votes=3)
+        gap = await events.since("debate-1", epoch, 3)
+        # Version 1 has been trimmed from the history
+        trimmed = await events.since("debate-1", epoch, 0)
+        return published, replay, current, other_epoch, ahead, gap, trimmed
+
+    published, replay, current, other_epoch, ahead, gap, trimmed = asyncio.run(scenario())
+    assert replay == published[1:]
+    assert current == []
+    for result in (other_epoch, ahead, gap, trimmed):
+        assert [message["type"] for message in result] == ["resync_required"]
+    assert gap[0]["version"] == 5
+    assert events.stats()["replayed"] == 2
@@ -0,0 +1,87 @@
+import asyncio
+import os
+
+from app.services.debate_tiers import COLD_SUFFIX, TieredDebateStore, estimate_bytes
+
+
+def make_debate(debate_id):
+    return {"id": debate_id, "topic": "Topic", "arguments": [{"content": "x" * 100}]}
+
+
+def make_store(tmp_path, debates=2):
+    # Room for exactly this many debates
+    return TieredDebateStore(str(tmp_path / "cold"), estimate_bytes(make_debate("d")) * debates)
+
+
+def test_least_recently_used_debates_are_evicted_and_loaded_back(tmp_path):
+    store = make_store(tmp_path)
+    for debate_id in ("a", "b"):
+        store.add(make_debate(debate_id))
+    store.get("a")  # "b" is now least recently used
+    store.add(make_debate("c"))
+
+    assert [debate_id for debate_id, _ in store.hot_items()] == ["a", "c"]
+    assert os.path.exists(tmp_path / "cold" / ("b" + COLD_SUFFIX))
+    assert list(store.ids()) == ["a", "b", "c"]
+
+    assert store.get("b") == make_debate("b")
+    assert [debate_id for debate_id, _ in store.hot_items()] == ["c", "b"]
+    assert store.stats()["misses"] == 1
+
+
+def test_reading_without_promoting_keeps_the_debate_cold(tmp_path):
+    store = make_store(tmp_path)
+    for debate_id in ("a", "b", "c"):
+        store.add(make_debate(debate_id))
+
+    assert store.get("a", promote=False) == make_debate("a")
+    assert [debate_id for debate_id, _ in store.hot_items()] == ["b", "c"]
+
+
+def test_an_evicted_debate_stays_readable_until_its_file_is_written(tmp_path):
+    async def scenario():
+        store = make_store(tmp_path, debates=1)
+        await store.start()
+        store.add(make_debate("a"))
+        store.add(make_debate("b"))
+        assert store.stats()["pending_writes"] == 1
+        debate = await store.load("a", promote=False)
+        await store.close()
+        return store, debate
+
+    store, debate = asyncio.run(scenario())
+    assert debate == make_debate("a")
+    assert store.stats()["pending_writes"] == 0
+    assert store.read_cold("a") == make_debate("a")
+
+
+def test_pop_of_an_evicted_debate_removes_its_file_after_the_write(tmp_path):
+    async def scenario():
+        store = make_store(tmp_path, debates=1)
+        await store.start()
+        store.add(make_debate("a"))
+        store.add(make_debate("b"))
+        popped = store.pop("a")
+        await store.close()
+        return store, popped
+
+    store, popped = asyncio.run(scenario())
+    assert popped == make_debate("a")
+    assert "a" not in store
+    assert not os.path.exists(tmp_path / "cold" / ("a" + COLD_SUFFIX))
+
+
+def test_a_debate_popped_during_a_load_is_not_resurrected(tmp_path):
+    async def scenario():
+        store = make_store(tmp_path, debates=1)
+        store.add(make_debate("a"))
+        store.add(make_debate("b"))  # "a" written inline before start
+        loading = asyncio.ensure_future(store.load("a"))
+        await asyncio.sleep(0)
+        store.pop("a")
+        return store, await loading
+
+    store, loaded = asyncio.run(scenario())
+    assert loaded is None
+    assert "a" not in store
+    assert [debate_id for debate_id, _ in store.hot_items()] == ["b"]
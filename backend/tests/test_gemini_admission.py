@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from app.services.gemini_admission import AdmissionRejected, GeminiAdmission, MemoryLimiterBackend
+
+
+def make_admission(user_rate=0, user_burst=1, queue_size=3):
+    # One global token every 50 ms, none banked beyond the first
+    return GeminiAdmission(
+        MemoryLimiterBackend(),
+        user_rate_per_minute=user_rate,
+        user_burst=user_burst,
+        global_rate_per_minute=1200,
+        global_burst=1,
+        queue_size=queue_size,
+        max_wait=2,
+    )
+
+
+async def queue_requests(admission, requests, admitted):
+    async def request(user_id, priority):
+        await admission.admit(user_id, priority)
+        admitted.append(user_id)
+
+    tasks = []
+    for user_id, priority in requests:
+        tasks.append(asyncio.ensure_future(request(user_id, priority)))
+        await asyncio.sleep(0)  # arrive in order
+    return tasks
+
+
+def test_admin_requests_are_admitted_before_queued_user_requests():
+    admission = make_admission()
+    admitted = []
+
+    async def scenario():
+        await admission.admit("first")
+        tasks = await queue_requests(admission, [("u1", "user"), ("u2", "user"), ("admin", "admin")], admitted)
+        await asyncio.gather(*tasks)
+        await admission.close()
+
+    asyncio.run(scenario())
+    assert admitted == ["admin", "u1", "u2"]
+    assert admission.stats()["admitted"] == {"admin": 1, "user": 3}
+
+
+def test_a_full_queue_rejects_users_and_displaces_the_newest_user_for_an_admin():
+    admission = make_admission(user_rate=60, queue_size=2)
+    admitted = []
+
+    async def scenario():
+        await admission.admit("first")
+        tasks = await queue_requests(admission, [("u1", "user"), ("u2", "user")], admitted)
+        with pytest.raises(AdmissionRejected) as full:
+            await admission.admit("u3")
+        admin, = await queue_requests(admission, [("admin", "admin")], admitted)
+        results = await asyncio.gather(*tasks, admin, return_exceptions=True)
+        # Neither rejected user was charged for the attempt
+        await admission.admit("u2")
+        await admission.admit("u3")
+        await admission.close()
+        return full.value, results
+
+    full, results = asyncio.run(scenario())
+    assert full.reason == "queue_full"
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], AdmissionRejected) and results[1].reason == "displaced"
+    assert admitted == ["admin", "u1"]
+    assert admission.stats()["rejected"]["displaced"] == 1
+
+
+def test_users_over_their_rate_are_rejected_until_refunded():
+    admission = make_admission(user_rate=1, user_burst=1)
+
+    async def scenario():
+        await admission.admit("alice")
+        with pytest.raises(AdmissionRejected) as limited:
+            await admission.admit("alice")
+        await admission.refund("alice")
+        await admission.admit("alice")
+        await admission.close()
+        return limited.value
+
+    limited = asyncio.run(scenario())
+    assert limited.reason == "user"
+    assert limited.retry_after > 0
+    assert admission.stats()["refunded"] == 1
@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services import gemini_service
+
+ARGUMENTS = {"for": ["f1", "f2"], "against": ["a1", "a2"]}
+
+
+class FakeCache:
+    def __init__(self):
+        self.stored = {}
+
+    def get(self, topic):
+        return None
+
+    def put(self, topic, arguments):
+        self.stored[topic] = arguments
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    """Gemini streaming the ARGUMENTS JSON a few characters at a time."""
+    cache = FakeCache()
+    monkeypatch.setattr(gemini_service, "GOOGLE_API_KEY", "test-key")
+    monkeypatch.setattr(gemini_service, "debate_cache", cache)
+
+    async def stream_text(prompt, on_chunk):
+        text = json.dumps(ARGUMENTS)
+        for start in range(0, len(text), 7):
+            await on_chunk(text[start:start + 7])
+            await asyncio.sleep(0)
+        return text
+
+    monkeypatch.setattr(gemini_service, "_stream_text", stream_text)
+    return cache
+
+
+def test_leader_callback_error_is_raised_to_the_leader_only(gemini):
+    joined = []
+
+    async def failing(key, content):
+        raise RuntimeError("storage down")
+
+    async def collecting(key, content):
+        joined.append((key, content))
+
+    async def scenario():
+        return await asyncio.gather(
+            gemini_service.stream_debate("Topic", failing),
+            gemini_service.stream_debate("topic ", collecting),
+            return_exceptions=True,
+        )
+
+    leader, joiner = asyncio.run(scenario())
+    assert isinstance(leader, RuntimeError)
+    assert joiner == ARGUMENTS
+    assert joined == [("for", "f1"), ("for", "f2"), ("against", "a1"), ("against", "a2")]
+    assert list(gemini.stored.values()) == [ARGUMENTS]
+
+
+def test_streamed_arguments_are_emitted_once(gemini):
+    emitted = []
+
+    async def collecting(key, content):
+        emitted.append((key, content))
+
+    result = asyncio.run(gemini_service.stream_debate("Topic", collecting))
+    assert result == ARGUMENTS
+    assert emitted == [("for", "f1"), ("for", "f2"), ("against", "a1"), ("against", "a2")]
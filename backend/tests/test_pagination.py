@@ -0,0 +1,30 @@
+import pytest
+
+from app.utils.pagination import ARGUMENT_CURSOR_TYPES, decode_cursor, encode_cursor
+
+
+def test_round_trip():
+    cursor = encode_cursor(12, 345)
+    assert decode_cursor(cursor, *ARGUMENT_CURSOR_TYPES["votes"]) == [12, 345]
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    "bm90IGpzb24",  # "not json"
+    encode_cursor(1, 2),  # too many values for a "recent" cursor
+    encode_cursor("1"),
+    encode_cursor(True),
+    encode_cursor(1.5),
+    encode_cursor(None),
+    encode_cursor({"$gt": 0}),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, *ARGUMENT_CURSOR_TYPES["recent"])
+
+
+def test_a_json_object_is_rejected():
+    cursor = "eyJhIjoxfQ"  # {"a":1}
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, int)
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("key", call) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["result"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"in_flight": 0, "calls": 5, "shared": 4}
+
+
+def test_joiners_get_the_exception_and_the_next_call_starts_fresh():
+    flight = SingleFlight("test")
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+        return "retried"
+
+    async def scenario():
+        first = await asyncio.gather(*(flight.do("key", call) for _ in range(3)), return_exceptions=True)
+        return first, await flight.do("key", call)
+
+    first, second = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in first)
+    assert second == "retried"
+    assert len(attempts) == 2
+
+
+def test_a_cancelled_caller_does_not_cancel_the_call_for_joiners():
+    flight = SingleFlight("test")
+
+    async def call():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.do("key", call))
+        await asyncio.sleep(0)
+        joiner = asyncio.ensure_future(flight.do("key", call))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await joiner
+
+    assert asyncio.run(scenario()) == "result"
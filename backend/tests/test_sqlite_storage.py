@@ -0,0 +1,26 @@
+import asyncio
+
+from app.services.sqlite_storage import SQLiteStorageBackend
+
+
+def test_delete_debate_takes_back_argument_counts(tmp_path):
+    async def scenario():
+        storage = SQLiteStorageBackend(str(tmp_path / "debates.db"))
+        await storage.start()
+        try:
+            alice = await storage.create_user("alice@example.com", "hash")
+            bob = await storage.create_user("bob@example.com", "hash")
+            debate = await storage.create_debate("Topic", alice["id"])
+            other = await storage.create_debate("Other topic", alice["id"])
+            for author in (alice, alice, bob, None):
+                await storage.add_argument_to_debate(debate["id"], "USER", "content", author and author["id"])
+            await storage.add_argument_to_debate(other["id"], "USER", "content", bob["id"])
+
+            assert await storage.delete_debate(debate["id"])
+            assert await storage.get_debate_by_id(debate["id"]) is None
+            return await storage.get_leaderboards()
+        finally:
+            await storage.close()
+
+    leaderboards = asyncio.run(scenario())
+    assert [(user["name"], user["arguments"]) for user in leaderboards["most_active_users"]] == [("bob", 1)]
@@ -0,0 +1,78 @@
+import asyncio
+import os
+import threading
+
+from app.services.storage_journal import StorageJournal
+
+
+def _journal(directory, **kwargs):
+    kwargs.setdefault("fsync", "never")
+    kwargs.setdefault("flush_interval", 0.01)
+    kwargs.setdefault("snapshot_every", 10**9)
+    return StorageJournal(str(directory), **kwargs)
+
+
+def _recover(directory):
+    loaded, applied = [], []
+    recovery = _journal(directory).recover(loaded.append, applied.append)
+    return loaded, applied, recovery
+
+
+def test_replay_stops_at_a_torn_tail(tmp_path):
+    async def write():
+        journal = _journal(tmp_path)
+        journal.recover(lambda record: None, lambda entry: None)
+        await journal.start()
+        for n in range(3):
+            journal.append({"op": "vote", "n": n})
+        await journal._commit()
+        await journal._in_io(journal._file.close)
+        journal._io.shutdown()
+
+    asyncio.run(write())
+    with open(os.path.join(tmp_path, "journal-00000000.log"), "a", encoding="utf-8") as f:
+        f.write('{"op":"vote","n":')  # crash in the middle of a write
+
+    _, applied, recovery = _recover(tmp_path)
+    assert [entry["n"] for entry in applied] == [0, 1, 2]
+    assert recovery["replayed_entries"] == 3
+
+
+def test_snapshot_rotates_off_the_event_loop_and_keeps_every_entry(tmp_path, monkeypatch):
+    opened_on = []
+    open_segment = StorageJournal._open_segment
+
+    def recording_open_segment(self, number):
+        opened_on.append(threading.current_thread().name)
+        return open_segment(self, number)
+
+    monkeypatch.setattr(StorageJournal, "_open_segment", recording_open_segment)
+    state = []
+
+    def capture():
+        records = list(state)
+        return lambda: ({"n": n} for n in records)
+
+    async def write():
+        journal = _journal(tmp_path)
+        journal.recover(lambda record: None, lambda entry: None)
+        journal.capture = capture
+        await journal.start()
+        for n in range(5):
+            state.append(n)
+            journal.append({"n": n})
+        snapshot = asyncio.create_task(journal.snapshot())
+        await asyncio.sleep(0)
+        for n in range(5, 8):  # appended while the segment is rotating
+            state.append(n)
+            journal.append({"n": n})
+        await snapshot
+        journal.capture = None  # stop() must not snapshot again
+        await journal.stop()
+
+    asyncio.run(write())
+    assert opened_on and all(name.startswith("journal") for name in opened_on)
+
+    loaded, applied, _ = _recover(tmp_path)
+    assert [record["n"] for record in loaded] == [0, 1, 2, 3, 4]
+    assert [entry["n"] for entry in applied] == [5, 6, 7]
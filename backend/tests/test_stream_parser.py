@@ -0,0 +1,35 @@
+import json
+
+from app.services.stream_parser import StreamingArgumentParser
+
+DOCUMENT = json.dumps({
+    "topic": "ignored",
+    "for": ["It says \"yes\", twice", "Café [brackets] {braces}"],
+    "against": ["Back\\slash: no", "Line\nbreak"],
+})
+
+
+def test_every_chunk_size_yields_the_same_arguments_in_order():
+    expected = [("for", a) for a in json.loads(DOCUMENT)["for"]] + [
+        ("against", a) for a in json.loads(DOCUMENT)["against"]
+    ]
+    for size in range(1, len(DOCUMENT) + 1):
+        parser = StreamingArgumentParser()
+        completed = []
+        for start in range(0, len(DOCUMENT), size):
+            completed.extend(parser.feed(DOCUMENT[start:start + size]))
+        assert completed == expected, size
+        assert parser.arguments == {"for": [a for _, a in expected[:2]], "against": [a for _, a in expected[2:]]}
+
+
+def test_an_argument_is_reported_as_soon_as_its_closing_quote_arrives():
+    parser = StreamingArgumentParser()
+    assert parser.feed('{"for": ["first') == []
+    assert parser.feed('", "sec') == [("for", "first")]
+    assert parser.feed('ond"') == [("for", "second")]
+
+
+def test_strings_outside_the_argument_arrays_are_not_arguments():
+    parser = StreamingArgumentParser()
+    completed = parser.feed('{"meta": {"for": "x"}, "notes": ["for"], "against": []}')
+    assert completed == []
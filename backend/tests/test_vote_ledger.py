@@ -0,0 +1,44 @@
+from app.services.vote_ledger import BITMAP_MIN_VOTERS, VoteLedger
+
+
+def test_a_second_vote_by_the_same_user_is_refused():
+    ledger = VoteLedger()
+    assert ledger.add("arg-1", "alice")
+    assert not ledger.add("arg-1", "alice")
+    assert ledger.add("arg-2", "alice")
+    assert ledger.add("arg-1", "bob")
+    assert ledger.count("arg-1") == 2
+    assert ledger.has_voted("arg-1", "bob")
+    assert not ledger.has_voted("arg-2", "bob")
+
+
+def test_duplicates_are_refused_after_the_switch_to_a_bitmap():
+    ledger = VoteLedger()
+    users = [f"user-{i}" for i in range(BITMAP_MIN_VOTERS * 2)]
+    assert all(ledger.add("popular", user) for user in users)
+    assert ledger.stats()["bitmap_arguments"] == 1
+    assert not any(ledger.add("popular", user) for user in users)
+    assert ledger.add("popular", "newcomer")
+    assert ledger.count("popular") == len(users) + 1
+
+
+def test_export_and_restore_keep_both_representations():
+    ledger = VoteLedger()
+    for i in range(BITMAP_MIN_VOTERS):
+        ledger.add("popular", f"user-{i}")
+    ledger.add("quiet", "user-3")
+
+    restored = VoteLedger()
+    restored.restore(ledger.export())
+    assert not restored.add("popular", "user-10")
+    assert not restored.add("quiet", "user-3")
+    assert restored.add("quiet", "user-4")
+    assert restored.count("popular") == BITMAP_MIN_VOTERS
+
+
+def test_discarded_arguments_accept_votes_again():
+    ledger = VoteLedger()
+    ledger.add("arg-1", "alice")
+    ledger.discard_argument("arg-1")
+    assert not ledger.has_voted("arg-1", "alice")
+    assert ledger.add("arg-1", "alice")
@@ -5,11 +5,12 @@ import api from './axiosConfig'
  */
 export const debateService = {
   /**
-   * Get paginated list of debates
+   * Get a page of debates, newest first. Pass the previous page's
+   * nextCursor to get the following page.
    */
-  async listDebates(page = 1, limit = 10) {
+  async listDebates(cursor = null, limit = 10) {
     const response = await api.get('/debates', {
-      params: { page, limit },
+      params: cursor ? { cursor, limit } : { limit },
     })
     return response.data
   },
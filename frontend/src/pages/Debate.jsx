@@ -20,53 +20,140 @@ export default function Debate() {
   const [votedArguments, setVotedArguments] = useState(new Set())
   const [generatingSummary, setGeneratingSummary] = useState(false)
   const wsRef = useRef(null)
+  const syncRef = useRef({ epoch: null, version: 0 })
+  const reconnectRef = useRef({ timer: null, attempts: 0, closed: false })
   const [messages, setMessages] = useState([])
 
   // Load debate and establish WebSocket on mount
   useEffect(() => {
+    syncRef.current = { epoch: null, version: 0 }
+    reconnectRef.current = { timer: null, attempts: 0, closed: false }
     loadDebate()
     connectWebSocket()
 
     return () => {
+      reconnectRef.current.closed = true
+      clearTimeout(reconnectRef.current.timer)
       if (wsRef.current) {
         wsRef.current.close()
       }
     }
   }, [id])
 
-  const loadDebate = async () => {
+  const loadDebate = async (silent = false) => {
     try {
-      setLoading(true)
+      if (!silent) setLoading(true)
       setError(null)
       const data = await debateService.getDebate(id)
       setDebate(data)
     } catch (err) {
       setError(err.message || 'Failed to load debate')
     } finally {
-      setLoading(false)
+      if (!silent) setLoading(false)
+    }
+  }
+
+  const addArgument = (argument) => {
+    setDebate((prev) => {
+      if (!prev || prev.arguments?.some((arg) => arg.id === argument.id)) return prev
+      return { ...prev, arguments: [...(prev.arguments || []), argument] }
+    })
+  }
+
+  const setVotes = (argumentId, votes) => {
+    setDebate((prev) =>
+      prev && {
+        ...prev,
+        arguments: prev.arguments?.map((arg) => (arg.id === argumentId ? { ...arg, votes } : arg)),
+      }
+    )
+  }
+
+  // Apply a delta event from the debate room instead of refetching the debate
+  const applyEvent = (event) => {
+    const sync = syncRef.current
+    if (event.version !== undefined && event.type !== 'sync' && event.type !== 'resync_required') {
+      // Batch frames cover fromVersion..version; their contents are safe to re-apply
+      const first = event.fromVersion ?? event.version
+      if (event.epoch === sync.epoch && event.version <= sync.version) return
+      // Before the first sync message the debate is still loading, so just adopt the version
+      if (sync.epoch !== null && (event.epoch !== sync.epoch || first > sync.version + 1)) {
+        // Missed events: take the current state once and continue from here
+        syncRef.current = { epoch: event.epoch, version: event.version }
+        loadDebate(true)
+        return
+      }
+    }
+    if (event.version !== undefined) {
+      syncRef.current = { epoch: event.epoch, version: event.version }
+    }
+
+    if (event.type === 'batch') {
+      event.arguments?.forEach(addArgument)
+      Object.entries(event.votes || {}).forEach(([argumentId, votes]) => setVotes(argumentId, votes))
+      event.events?.forEach(applyDelta)
+    } else {
+      applyDelta(event)
+    }
+  }
+
+  const applyDelta = (event) => {
+    switch (event.type) {
+      case 'argument_added':
+        addArgument(event.argument)
+        break
+      case 'vote':
+        setVotes(event.argumentId, event.votes)
+        break
+      case 'summary':
+        setDebate((prev) => prev && { ...prev, summary: event.summary })
+        break
+      case 'debate_status':
+        setDebate((prev) => prev && { ...prev, status: event.status })
+        break
+      case 'debate_deleted':
+        setDebate(null)
+        setError('This debate was deleted')
+        break
+      case 'resync_required':
+        loadDebate(true)
+        break
+      default:
+        if (event.message) setMessages((prev) => [...prev, event])
     }
   }
 
   const connectWebSocket = () => {
     const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws'
     const apiUrl = import.meta.env.VITE_API_URL || 'http://localhost:8000'
-    const wsUrl = `${protocol}://${apiUrl.split('://')[1]}/ws/debate/${id}`
+    const { epoch, version } = syncRef.current
+    // After a reconnect, ask for the events missed since the last one applied
+    const query = epoch ? `?epoch=${epoch}&since=${version}` : ''
+    const wsUrl = `${protocol}://${apiUrl.split('://')[1]}/ws/debate/${id}${query}`
 
     try {
       wsRef.current = new WebSocket(wsUrl)
 
       wsRef.current.onopen = () => {
         console.log('WebSocket connected')
+        reconnectRef.current.attempts = 0
       }
 
       wsRef.current.onmessage = (event) => {
-        const message = JSON.parse(event.data)
-        setMessages((prev) => [...prev, message])
+        applyEvent(JSON.parse(event.data))
       }
 
       wsRef.current.onerror = (error) => {
         console.error('WebSocket error:', error)
       }
+
+      wsRef.current.onclose = () => {
+        const reconnect = reconnectRef.current
+        if (reconnect.closed) return
+        const delay = Math.min(30000, 1000 * 2 ** reconnect.attempts)
+        reconnect.attempts += 1
+        reconnect.timer = setTimeout(connectWebSocket, delay)
+      }
     } catch (err) {
       console.error('Failed to connect WebSocket:', err)
     }
@@ -79,9 +166,9 @@ export default function Debate() {
     try {
       setSubmitting(true)
       setError(null)
-      await debateService.addArgument(id, selectedSide, newArgument)
+      const argument = await debateService.addArgument(id, selectedSide, newArgument)
       setNewArgument('')
-      await loadDebate()
+      addArgument(argument)
     } catch (err) {
       setError(err.response?.data?.detail || 'Failed to add argument')
     } finally {
@@ -102,9 +189,9 @@ export default function Debate() {
 
     try {
       setError(null)
-      await debateService.voteOnArgument(id, argumentId)
+      const result = await debateService.voteOnArgument(id, argumentId)
       setVotedArguments((prev) => new Set(prev).add(argumentId))
-      await loadDebate()
+      setVotes(argumentId, result.votes)
     } catch (err) {
       setError(err.response?.data?.detail || 'Failed to vote')
     }
@@ -115,7 +202,7 @@ export default function Debate() {
       setGeneratingSummary(true)
       setError(null)
       const result = await debateService.generateSummary(id)
-      await loadDebate()
+      setDebate((prev) => prev && { ...prev, summary: result.summary })
     } catch (err) {
       setError(err.response?.data?.detail || 'Failed to generate summary')
     } finally {
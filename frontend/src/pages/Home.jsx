@@ -12,21 +12,23 @@ export default function Home() {
   const [debates, setDebates] = useState([])
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState(null)
-  const [page, setPage] = useState(1)
-  const [totalPages, setTotalPages] = useState(1)
+  // cursors[i] is the cursor that loads page i (null for the first page)
+  const [cursors, setCursors] = useState([null])
+  const [page, setPage] = useState(0)
+  const [nextCursor, setNextCursor] = useState(null)
   const [topic, setTopic] = useState('')
 
   useEffect(() => {
-    loadDebates()
-  }, [page])
+    loadDebates(cursors[page])
+  }, [page, cursors])
 
-  const loadDebates = async () => {
+  const loadDebates = async (cursor) => {
     try {
       setLoading(true)
       setError(null)
-      const data = await debateService.listDebates(page, 10)
+      const data = await debateService.listDebates(cursor, 10)
       setDebates(data.debates || [])
-      setTotalPages(Math.ceil(data.total / 10))
+      setNextCursor(data.nextCursor || null)
     } catch (err) {
       setError(err.message || 'Failed to load debates')
     } finally {
@@ -42,8 +44,9 @@ export default function Home() {
       setError(null)
       await debateService.createDebate(topic)
       setTopic('')
-      setPage(1)
-      await loadDebates()
+      // Back to the first page; a fresh cursor list triggers the reload
+      setCursors([null])
+      setPage(0)
     } catch (err) {
       setError(err.response?.data?.detail || 'Failed to create debate')
     }
@@ -279,11 +282,11 @@ export default function Home() {
               >
                 <h3 style={debateTitleStyle}>{debate.topic}</h3>
                 <p style={debateMetaStyle}>
-                  💬 {debate.arguments?.length || 0} arguments
+                  💬 {debate.argumentCount} arguments · 👍 {debate.totalVotes} votes
                 </p>
-                {debate.summary && (
+                {debate.hasSummary && (
                   <div style={summaryStyle}>
-                    <strong>Summary:</strong> {debate.summary}
+                    <strong>Summary available</strong>
                   </div>
                 )}
                 <Link to={`/debate/${debate.id}`} style={linkStyle}>
@@ -294,27 +297,30 @@ export default function Home() {
           </div>
         )}
 
-        {totalPages > 1 && (
+        {(page > 0 || nextCursor) && (
           <div style={paginationStyle}>
             <button
-              onClick={() => setPage(Math.max(1, page - 1))}
-              disabled={page === 1}
+              onClick={() => setPage(Math.max(0, page - 1))}
+              disabled={page === 0}
               style={{
                 ...paginationBtnStyle,
-                opacity: page === 1 ? 0.5 : 1,
+                opacity: page === 0 ? 0.5 : 1,
               }}
             >
               ← Previous
             </button>
             <span style={{ color: theme.text.secondary }}>
-              Page {page} of {totalPages}
+              Page {page + 1}
             </span>
             <button
-              onClick={() => setPage(Math.min(totalPages, page + 1))}
-              disabled={page === totalPages}
+              onClick={() => {
+                setCursors([...cursors.slice(0, page + 1), nextCursor])
+                setPage(page + 1)
+              }}
+              disabled={!nextCursor}
               style={{
                 ...paginationBtnStyle,
-                opacity: page === totalPages ? 0.5 : 1,
+                opacity: nextCursor ? 1 : 0.5,
               }}
             >
               Next →